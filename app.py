@@ -1,5 +1,4 @@
 import streamlit as st
-import google.generativeai as genai
 import streamlit.components.v1 as components
 
 # --- CONFIGURATION & SETUP ---
@@ -9,106 +8,59 @@ st.set_page_config(
     layout="wide"
 )
 
-import json
+import math
+import re
 
-import requests
-from bs4 import BeautifulSoup
 
-
-import PyPDF2
-import docx
 import io
 
-import base64
-
-# --- HELPER FUNCTIONS ---
-def image_to_base64(uploaded_file):
-    try:
-        bytes_data = uploaded_file.getvalue()
-        base64_str = base64.b64encode(bytes_data).decode()
-        mime_type = uploaded_file.type
-        return f"data:{mime_type};base64,{base64_str}"
-    except Exception as e:
-        return None
-
-def read_file_content(uploaded_file):
-    try:
-        if uploaded_file.type == "application/pdf":
-            pdf_reader = PyPDF2.PdfReader(uploaded_file)
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text()
-            return text
-        elif uploaded_file.type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
-            doc = docx.Document(uploaded_file)
-            text = "\n".join([paragraph.text for paragraph in doc.paragraphs])
-            return text
-        elif uploaded_file.type == "text/plain":
-            return uploaded_file.getvalue().decode("utf-8")
-        else:
-            return "Format file tidak didukung."
-    except Exception as e:
-        return f"Gagal membaca file: {e}"
-
+import zipfile
 
-def scrape_content(url):
-    try:
-        headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'}
-        response = requests.get(url, headers=headers, timeout=10)
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Remove script and style elements
-        for script in soup(["script", "style"]):
-            script.decompose()
-            
-        # Get text
-        text = soup.get_text(separator=' ')
-        
-        # Break into lines and remove leading/trailing space on each
-        lines = (line.strip() for line in text.splitlines())
-        # Break multi-headlines into a line each
-        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-        # Drop blank lines
-        text = '\n'.join(chunk for chunk in chunks if chunk)
-        
-        return text[:5000] # Limit characters
-    except Exception as e:
-        return f"Gagal scraping: {e}"
-
-def parse_price(price_str):
-    try:
-        price_str = price_str.lower().replace(" ", "").replace("rp", "").replace(".", "").replace(",", "")
-        multiplier = 1
-        if "ribu" in price_str or "rb" in price_str:
-            multiplier = 1000
-            price_str = price_str.replace("ribu", "").replace("rb", "")
-        elif "juta" in price_str or "jt" in price_str:
-            multiplier = 1000000
-            price_str = price_str.replace("juta", "").replace("jt", "")
-            
-        import re
-        # Extract digits
-        digits = re.sub(r'\D', '', price_str)
-        if not digits: return 0
-        return int(digits) * multiplier
-    except:
-        return 0
-
-def calculate_discount(original_price_str, selling_price_str):
-    try:
-        original = parse_price(original_price_str)
-        selling = parse_price(selling_price_str)
-        
-        if original > selling and original > 0:
-            discount = int(((original - selling) / original) * 100)
-            return f"HEMAT {discount}% HARI INI"
-        else:
-            return "HEMAT HARI INI"
-    except Exception:
-        return "PENAWARAN SPESIAL"
+from generator import key_pool, scheduler, response_cache, prompt_cache_key, generate_text
+from disk_cache import content_hash
+from generation_store import GenerationStore, PAGE_SIZE as HISTORY_PAGE_SIZE
+from jobs import JobQueue, ACTIVE_STATUSES
+from landing_job import run_landing_job, run_section_job, STREAM_COPY_FIELDS
+from response_parser import decode_json_response
+from sections import SECTION_LABELS, find_sections
+from tracing import start_trace, end_trace, stage, start_metrics_server
+import time
 
 import os
 
+# --- CACHED HELPERS ---
+# Streamlit menjalankan ulang seluruh script di setiap klik widget. Yang hasilnya sama
+# antar rerun (daftar key, riwayat URL) dihitung sekali; modul berat (scraper, parser
+# PDF/DOCX, batch) baru di-import di jalur yang memakainya.
+@st.cache_data(show_spinner=False)
+def split_keys(raw_keys):
+    return [k.strip() for k in raw_keys.split('\n') if k.strip()]
+
+@st.cache_resource(show_spinner=False)
+def get_competitor_store():
+    from competitor_store import CompetitorStore
+    return CompetitorStore()
+
+@st.cache_resource(show_spinner=False)
+def get_generation_store():
+    return GenerationStore()
+
+@st.cache_resource(show_spinner=False)
+def get_job_queue():
+    # Satu worker pool untuk semua sesi; job tetap jalan walau sesi yang mengirimnya rerun
+    return JobQueue()
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def optimized_page(html):
+    # Optimasi (purge Tailwind, minify) cukup sekali per versi HTML, bukan tiap rerun
+    from html_optimizer import optimize_html
+    return optimize_html(html)
+
+@st.cache_resource(show_spinner=False)
+def metrics_endpoint():
+    # Endpoint /metrics (format Prometheus) hanya jalan kalau env METRICS_PORT di-set
+    return start_metrics_server()
+
 # --- SIDEBAR ---
 with st.sidebar:
     st.header("Konfigurasi")
@@ -120,7 +72,7 @@ with st.sidebar:
             current_keys_str = st.secrets["GOOGLE_API_KEY"]
             
     # Split existing keys for pre-filling
-    current_keys_list = [k.strip() for k in current_keys_str.split('\n') if k.strip()]
+    current_keys_list = split_keys(current_keys_str)
 
     st.info("Masukkan hingga 10 API Key. Sistem akan otomatis ganti ke key berikutnya jika limit habis.")
     
@@ -135,7 +87,7 @@ with st.sidebar:
         )
         
         if api_keys_input.strip():
-            new_api_keys = [k.strip() for k in api_keys_input.split('\n') if k.strip()]
+            new_api_keys = split_keys(api_keys_input)
     
     if st.button("💾 Simpan API Keys (Sesi Ini)"):
         if new_api_keys:
@@ -153,6 +105,45 @@ product_type = st.sidebar.radio(
     ("Ebook / Produk Digital", "Produk Fisik / Barang")
 )
 
+generation_mode = st.sidebar.radio(
+    "Mode Generate:",
+    ("🎨 Full AI (AI Tulis Seluruh HTML)", "⚡ Hemat (AI Tulis Copy, HTML dari Template)"),
+    help="Mode Hemat: AI hanya menulis teks tiap section, HTML dirakit dari template lokal. Jauh lebih cepat & hemat kuota, desain lebih seragam."
+)
+use_templates = generation_mode.startswith("⚡")
+
+use_streaming = st.sidebar.checkbox(
+    "⚡ Mode Streaming (Preview Langsung Muncul)",
+    value=True,
+    help="Copywriting & preview halaman tampil sedikit demi sedikit selagi AI masih menulis."
+)
+
+show_timing = st.sidebar.checkbox(
+    "⏱️ Tampilkan Timing Tiap Tahap",
+    value=False,
+    help="Lihat berapa lama scraping, baca file, panggilan AI, parsing, dan render di generate terakhir."
+)
+
+optimize_output = st.sidebar.checkbox(
+    "🪶 Optimasi HTML (Tanpa Tailwind CDN)",
+    value=True,
+    help="Preview, Source Code, dan Download memakai HTML yang sudah diringkas: CSS Tailwind hanya untuk class yang dipakai, ditulis langsung di halaman."
+)
+
+optimize_images_enabled = st.sidebar.checkbox(
+    "🖼️ Optimasi Gambar (WebP/AVIF Responsif)",
+    value=True,
+    help="Gambar hero & produk dikecilkan ke beberapa ukuran WebP/AVIF dengan srcset. Versi responsif ada di Download ZIP (HTML + folder gambar yang di-upload bersama halaman); Download HTML & Source Code tetap memakai link gambar asli."
+)
+
+force_regenerate = st.sidebar.checkbox(
+    "🔄 Paksa Generate Ulang (Abaikan Cache)",
+    value=False,
+    help="Hasil generate dengan input yang sama disimpan di cache. Centang ini untuk minta hasil baru dari AI."
+)
+
+metrics_endpoint()
+
 # --- API KEY SETUP ---
 # Use the keys collected from the inputs (if any) or load from secrets or session state
 if 'saved_api_keys' not in st.session_state:
@@ -166,37 +157,66 @@ elif st.session_state.saved_api_keys:
     api_keys = st.session_state.saved_api_keys
 elif "GOOGLE_API_KEY" in st.secrets:
     raw_keys = st.secrets["GOOGLE_API_KEY"]
-    api_keys = [k.strip() for k in raw_keys.split('\n') if k.strip()]
+    api_keys = split_keys(raw_keys)
     st.session_state.saved_api_keys = api_keys
 else:
     api_keys = []
 
-# --- HELPER: ROTATION GENERATOR ---
-def generate_content_with_rotation(prompt, keys):
-    last_error = None
-    for i, key in enumerate(keys):
-        try:
-            genai.configure(api_key=key)
-            # Try Flash model first (2.0), fallback to latest alias
-            try:
-                model = genai.GenerativeModel('gemini-2.0-flash')
-                response = model.generate_content(prompt)
-                return response
-            except Exception:
-                model = genai.GenerativeModel('gemini-flash-latest')
-                response = model.generate_content(prompt)
-                return response
-        except Exception as e:
-            last_error = e
-            print(f"Key {i+1} failed: {e}")
-            continue # Try next key
-    
-    # If all failed
-    raise last_error
+# --- HELPER: JOB PROGRESS ---
+@st.fragment(run_every=1.0)
+def job_progress_panel(job_id):
+    info = job_queue.status(job_id)
+    if info is None or info["status"] not in ACTIVE_STATUSES:
+        # Job selesai: rerun seluruh halaman supaya hasilnya ditempel & ditampilkan
+        st.rerun()
+    partial = job_queue.partial(job_id)
+    if info["status"] == "queued":
+        text = f"Menunggu giliran... ({job_queue.position(job_id)} job di depan)"
+    else:
+        text = info["message"] + (f" ({partial['received'] / 1000:.0f} KB)" if partial.get("received") else "")
+        if partial.get("quota_wait"):
+            text += f" — menunggu giliran kuota API, perkiraan ±{math.ceil(partial['quota_wait'])} detik"
+    st.progress(min(info["progress"], 1.0), text=f"⏳ {info['label']}: {text}")
+    for field, label in STREAM_COPY_FIELDS:
+        if field in partial.get("copy", {}):
+            st.markdown(f"**{label}:** {partial['copy'][field]}")
+    if partial.get("html"):
+        from image_pipeline import inline_images
+        st.caption("⏳ Preview sementara (AI masih menulis halaman)...")
+        components.html(inline_images(partial["html"]), height=600, scrolling=True)
+    if partial.get("log"):
+        st.text("\n".join(partial["log"]))
+    st.caption("Boleh pindah tab atau refresh, generate tetap jalan di server.")
+    if st.button("✖️ Batalkan Generate", key=f"cancel_job_{job_id}"):
+        job_queue.cancel(job_id)
+
+def show_generation_error(error_msg):
+    if "403" in error_msg and "leaked" in error_msg:
+        st.error("⛔ **API Key Bermasalah!** Google mendeteksi API Key Anda bocor/tidak aman. Silakan buat API Key baru di Google AI Studio dan masukkan di sidebar.")
+    elif "429" in error_msg:
+        # Tampilkan kapan kuota tersedia lagi (dari antrian & cooldown key), bukan sekadar "habis"
+        wait = scheduler.estimate_wait(api_keys) if api_keys else math.inf
+        if math.isinf(wait):
+            st.error("⏳ **Kuota Habis!** Tidak ada API Key yang bisa dipakai. Tambahkan API Key cadangan di sidebar.")
+        elif wait < 1:
+            st.warning("⏳ Kuota API sempat penuh, sekarang sudah tersedia lagi. Silakan generate ulang.")
+        else:
+            st.warning(f"⏳ **Kuota API sedang penuh.** Perkiraan tersedia lagi dalam ±{math.ceil(wait)} detik. Generate ulang setelah itu, atau tambahkan API Key cadangan di sidebar.")
+    else:
+        st.error(f"Gagal generate: {error_msg}")
+    st.info("💡 **Tip**: Pastikan koneksi internet lancar dan API Key valid.")
 
 if api_keys:
-    # Configure with first key just for init (though rotation handles it)
-    genai.configure(api_key=api_keys[0])
+    pool_status = key_pool.status(api_keys)
+    st.sidebar.caption(f"🔑 Status Key: {pool_status['healthy']} siap, {pool_status['cooldown']} cooldown, {pool_status['banned']} diblokir")
+    # Jatah key dipakai bersama semua sesi (terutama key dari secrets.toml)
+    quota_status = scheduler.status(api_keys)
+    if quota_status["waiting"]:
+        st.sidebar.caption(f"🚦 Antrian Kuota API: {quota_status['waiting']} request menunggu, perkiraan ±{math.ceil(quota_status['wait'])} detik")
+job_queue = get_job_queue()
+queue_stats = job_queue.stats()
+if queue_stats["running"] or queue_stats["queued"]:
+    st.sidebar.caption(f"🧵 Antrian Generate: {queue_stats['running']} berjalan, {queue_stats['queued']} menunggu")
 
 # --- MAIN CONTENT ---
 st.title("🚀 Landing Page Generator AI")
@@ -206,8 +226,17 @@ st.markdown("Buat landing page profesional dalam hitungan detik menggunakan Goog
 if "target_audience" not in st.session_state: st.session_state.target_audience = ""
 if "cta_text" not in st.session_state: st.session_state.cta_text = ""
 if "product_desc" not in st.session_state: st.session_state.product_desc = ""
-if "generated_html" not in st.session_state: st.session_state.generated_html = None
-if "copy_sections" not in st.session_state: st.session_state.copy_sections = {}
+# Hasil generate disimpan di disk, session state cukup pegang id-nya. Id juga ditaruh
+# di URL (?gen=...) supaya hasilnya tetap ada setelah browser di-refresh.
+generation_store = get_generation_store()
+if "generation_id" not in st.session_state:
+    restored_id = st.query_params.get("gen")
+    st.session_state.generation_id = int(restored_id) if restored_id and restored_id.isdigit() else None
+if "job_id" not in st.session_state:
+    st.session_state.job_id = st.query_params.get("job")
+if "batch_job_id" not in st.session_state:
+    st.session_state.batch_job_id = st.query_params.get("batch")
+attached_generation_id = None
 
 # --- INPUT SECTION ---
 product_name = st.text_input("Nama Produk (Wajib)", placeholder="Contoh: Ebook Jago Python / Sepatu Anti Air")
@@ -220,6 +249,7 @@ with col_price2:
 
 # Ebook Upload
 uploaded_ebook = st.file_uploader("📂 Upload Ebook/Materi Produk (PDF, DOCX, TXT) - Opsional", type=["pdf", "docx", "txt"], help="AI akan membaca isi file ini untuk membuat konten landing page yang lebih akurat dan 'berisi'.")
+summarize_ebook = st.checkbox("🧠 Ringkas Seluruh Isi Ebook (Lebih Akurat untuk Ebook Tebal)", value=True, help="Seluruh isi ebook diringkas dulu jadi poin-poin kunci, bukan cuma 15.000 karakter pertama. Ringkasan disimpan, upload ulang file yang sama tidak perlu diringkas lagi.")
 
 if st.button("✨ Isi Otomatis (Magic Fill)"):
     if not product_name:
@@ -227,7 +257,11 @@ if st.button("✨ Isi Otomatis (Magic Fill)"):
     elif not api_keys:
         st.error("API Key belum ada! Cek sidebar.")
     else:
-        with st.spinner("Sedang menerawang ide marketing..."):
+        quota_wait = scheduler.estimate_wait(api_keys)
+        spinner_text = "Sedang menerawang ide marketing..."
+        if 1 <= quota_wait < math.inf:
+            spinner_text = f"Menunggu giliran kuota API (perkiraan ±{math.ceil(quota_wait)} detik)..."
+        with st.spinner(spinner_text):
             try:
                 prompt = f"""
                 Berikan ide marketing untuk produk: "{product_name}".
@@ -239,22 +273,23 @@ if st.button("✨ Isi Otomatis (Magic Fill)"):
                 }}
                 """
                 
-                response = generate_content_with_rotation(prompt, api_keys)
-                
-                text = response.text.replace("```json", "").replace("```", "")
-                data = json.loads(text)
+                response_text = generate_text(prompt, api_keys, force=force_regenerate)
                 
-                # Handle case where AI returns a list instead of dict
-                if isinstance(data, list):
-                    data = data[0]
+                # Parser yang sama dengan generate landing page: toleran code fence, list, JSON rusak
+                data, parse_error, _ = decode_json_response(response_text)
+                fields = {name: str(data.get(name) or "").strip() for name in ("target_audience", "cta_text", "product_desc")}
+                if not any(fields.values()):
+                    # Jangan simpan jawaban rusak di cache, biar klik berikutnya minta ulang
+                    response_cache.delete(prompt_cache_key(prompt))
+                    raise ValueError(f"Jawaban AI tidak bisa dibaca ({parse_error or 'field kosong'}). Silakan coba lagi.")
                 
-                st.session_state.target_audience = data.get("target_audience", "")
-                st.session_state.cta_text = data.get("cta_text", "")
-                st.session_state.product_desc = data.get("product_desc", "")
+                st.session_state.target_audience = fields["target_audience"]
+                st.session_state.cta_text = fields["cta_text"]
+                st.session_state.product_desc = fields["product_desc"]
                 st.success("Berhasil diisi! Silakan review di bawah.")
                 st.rerun()
             except Exception as e:
-                st.error(f"Gagal generate: {e}")
+                show_generation_error(str(e))
 
 # --- COPY HELPER (MOVED OUTSIDE FORM) ---
 if st.session_state.target_audience or st.session_state.cta_text or st.session_state.product_desc:
@@ -273,11 +308,17 @@ if st.session_state.target_audience or st.session_state.cta_text or st.session_s
         st.code(st.session_state.product_desc, language=None)
         st.text_area("Copy Manual (Deskripsi)", value=st.session_state.product_desc, height=150, key="copy_desc")
 
+# Di luar form supaya daftar riwayat di dalam form langsung tersaring saat mengetik
+competitor_store = get_competitor_store()
+history_query = st.text_input("🔍 Cari Riwayat Link Kompetitor", placeholder="Ketik awal URL / nama domain, contoh: toko.com", help=f"{competitor_store.count()} link tersimpan. Yang terakhir dipakai tampil paling atas.")
+
 with st.form("input_form"):
     # Image Fields (INSIDE FORM)
     st.markdown("### 🖼️ Pengaturan Gambar")
     hero_image = st.text_input("Link Gambar Hero (Muncul di bawah Headline Utama) - Opsional", placeholder="https://example.com/hero.jpg", help="Gambar ini muncul di Hero section, tepat di bawah headline provokatif")
+    hero_upload = st.file_uploader("...atau Upload Gambar Hero", type=["jpg", "jpeg", "png", "webp"], key="hero_upload")
     product_image = st.text_input("Link Gambar Utama (Muncul di bawah heading 'Solusi') - Opsional", placeholder="https://example.com/gambar-utama.jpg", help="Gambar ini muncul tepat SETELAH heading 'Solusi: [Nama Produk]' SEBELUM penjelasan")
+    product_upload = st.file_uploader("...atau Upload Gambar Utama", type=["jpg", "jpeg", "png", "webp"], key="product_upload")
     
     # Bonus Section (INSIDE FORM)
     st.markdown("### 🎁 Bonus (Opsional)")
@@ -309,21 +350,12 @@ with st.form("input_form"):
     )
     
     # --- COMPETITOR URL HISTORY ---
-    history_file = "competitor_history.json"
-    try:
-        with open(history_file, "r") as f:
-            url_history = json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        url_history = []
-
-    # Dropdown for history
-    history_options = ["➕ Input URL Baru"] + url_history
-    selected_history = st.selectbox("Pilih Link Kompetitor (Riwayat)", history_options)
-    
-    if selected_history == "➕ Input URL Baru":
-        competitor_url = st.text_input("Link Kompetitor Baru (Opsional)", placeholder="Masukkan URL landing page kompetitor...")
-    else:
-        competitor_url = st.text_input("Link Kompetitor (Opsional - Fitur ATM)", placeholder="Masukkan URL landing page kompetitor untuk ditiru polanya...")
+    url_history = competitor_store.search(history_query)
+
+    # Dropdown for history (boleh pilih beberapa kompetitor sekaligus)
+    selected_history = st.multiselect("Pilih Link Kompetitor (Riwayat)", url_history)
+    competitor_url = st.text_input("Link Kompetitor Baru (Opsional - Fitur ATM)", placeholder="Masukkan URL landing page kompetitor... (pisahkan dengan koma untuk lebih dari satu)")
+    competitor_urls = list(dict.fromkeys(selected_history + [u.strip() for u in re.split(r"[,\s]+", competitor_url) if u.strip()]))
         
     # Conversion Boosters Toggle
     use_boosters = st.checkbox("🔥 Aktifkan Fitur 'Booster Penjualan' (FAQ, Garansi, Trust Badges)", value=True)
@@ -342,450 +374,96 @@ if submitted:
     if not product_name:
         st.error("Mohon isi Nama Produk!")
     else:
-        # Save URL to history if new
-        if competitor_url and competitor_url not in url_history:
-            url_history.append(competitor_url)
-            with open(history_file, "w") as f:
-                json.dump(url_history, f)
+        # Simpan ke riwayat (URL baru ditambah, URL lama hit count-nya naik)
+        competitor_store.add(competitor_urls)
         if not api_keys:
             st.error("⚠️ API Key belum dimasukkan! Silakan masukkan di Sidebar sebelah kiri atau setting di secrets.toml")
             st.stop()
             
-        # Loading State
-        with st.spinner("Sedang meracik copywriting & kodingan... (Mungkin butuh 10-20 detik)"):
-            try:
-                # --- PROMPT ENGINEERING ---
-                # Handle optional fields
-                desc_prompt = product_desc if product_desc else "TIDAK ADA. Karanglah deskripsi yang sangat menarik, persuasif, dan menjual berdasarkan Nama Produk. Buat seolah-olah ini produk best-seller."
-                target_prompt = target_audience if target_audience else "TIDAK ADA. Analisa dan tentukan target audience yang paling relevan dan potensial untuk produk ini."
-                cta_prompt = cta_text if cta_text else "TIDAK ADA. Buat CTA yang mendesak dan mengundang klik (misal: Beli Sekarang, Ambil Diskon 50%, dll)."
-                
-                # Calculate Discount Label
-                discount_label = "HEMAT 90% HARI INI" # Default
-                if harga_coret and harga_jual:
-                    discount_label = calculate_discount(harga_coret, harga_jual)
-                
-                competitor_data = ""
-                if competitor_url:
-                    scraped_text = scrape_content(competitor_url)
-                    competitor_data = f"""
-                    DATA KOMPETITOR (ATM - AMATI TIRU MODIFIKASI):
-                    Berikut adalah konten dari landing page kompetitor:
-                    ---
-                    {scraped_text}
-                    ---
-                    TUGAS ATM (FOKUS COPYWRITING SAJA):
-                    1. **AMBIL KONSEP COPYWRITINGNYA**: Pelajari flow, hook, angle, dan cara mereka menjual (Storytelling? Hard selling? Fear mongering?).
-                    2. **TIRU STRUKTUR PERSUASINYA**: Jika mereka mulai dengan masalah -> solusi -> testimoni, ikuti alur tersebut.
-                    3. **JANGAN TIRU DESAINNYA**: Buat desain yang JAUH LEBIH BAGUS, LEBIH PREMIUM, dan LEBIH MODERN dari kompetitor. Jangan terpaku pada tampilan visual mereka yang mungkin jadul.
-                    4. **MODIFIKASI ISI**: Tulis ulang dengan gaya bahasa kita yang lebih "nendang".
-                    """
-
-                ebook_content = ""
-                if uploaded_ebook:
-                    file_text = read_file_content(uploaded_ebook)
-                    # Limit content to prevent token overflow (approx 10k chars)
-                    ebook_content = f"""
-                    SUMBER MATERI / ISI EBOOK (WAJIB DIGUNAKAN SEBAGAI REFERENSI UTAMA):
-                    Berikut adalah ringkasan/isi dari produk yang dijual:
-                    ---
-                    {file_text[:15000]} 
-                    ---
-                    INSTRUKSI KHUSUS:
-                    1. Gunakan materi di atas untuk menulis Body Copy, Benefit, dan Storytelling yang SANGAT RELEVAN.
-                    2. Jangan mengarang bebas jika info sudah ada di materi ini.
-                    3. Ambil "Emas" (poin penting) dari materi ini untuk dijadikan Hook.
-                    """
-
-                booster_instruction = ""
-                if use_boosters:
-                    booster_instruction = """
-                    FITUR BOOSTER PENJUALAN (WAJIB ADA):
-                    1. **FAQ SECTION**: Buat section FAQ (Tanya Jawab) yang menjawab 3-5 keraguan utama pembeli (Objection Handling). Gunakan tag <details> dan <summary> untuk accordion.
-                    2. **TRUST BADGES**: Tambahkan elemen visual "Garansi 30 Hari Uang Kembali", "Pembayaran Aman", dll.
-                    """
-
-                # Prepare Image Instructions
-                image_instruction = ""
-                
-                # URL Images Logic
-                if hero_image:
-                    image_instruction += f"\nHERO IMAGE (Di bawah headline utama): {hero_image}\n"
-                if product_image:
-                    image_instruction += f"\nSOLUTION IMAGE (Di bawah heading 'Solusi'): {product_image}\n"
-                
-                if not hero_image and not product_image:
-                    image_instruction += "\nTIDAK ADA GAMBAR. Gunakan Placeholder dari unsplash/placehold.co.\n"
-
-                image_instruction += f"\nGAYA BAHASA: {tone} (Wajib ikuti tone ini di seluruh teks!)\n"
-                
-                # Prepare Bonus Instructions
-                bonus_instruction = ""
-                bonus_list = []
-                if bonus_1: bonus_list.append(bonus_1)
-                if bonus_2: bonus_list.append(bonus_2)
-                if bonus_3: bonus_list.append(bonus_3)
-                
-                if bonus_list:
-                    bonus_text = "\n".join([f"  - {b}" for b in bonus_list])
-                    bonus_instruction = f"""
-                    BONUS YANG HARUS DITAMPILKAN (WAJIB):
-                    Tambahkan section "BONUS EKSKLUSIF" atau "DAPATKAN BONUS INI" dengan bonus berikut:
-{bonus_text}
-                    
-                    Desain bonus section dengan card yang menarik, gunakan ikon/emoji untuk setiap bonus item.
-                    Letakkan section bonus SEBELUM pricing section untuk meningkatkan perceived value.
-                    """
-
-                base_prompt = f"""
-                Bertindaklah sebagai Expert Web Developer & UI/UX Designer kelas dunia yang biasa menangani klien "High-Ticket".
-                Tugasmu adalah membuat SATU FILE HTML LENGKAP (Single File) untuk Landing Page produk dengan standar desain PREMIUM.
-                
-                DATA PRODUK:
-                - Nama: {product_name}
-
-                
-                {competitor_data}
-                
-                {ebook_content}
-                
-                INSTRUKSI DESAIN (PENTING):
-                1. **PENGGUNAAN GAMBAR (WAJIB)**:
-                   {image_instruction}
-                   - Buat layout `zig-zag` (Gambar Kiri - Teks Kanan, lalu sebaliknya) agar dinamis.
-                INSTRUKSI DESAIN (MINIMALIS, FRESH, MUDAH DIBACA):
-                
-                **PRIORITAS: CLEAN, SIMPLE, READABLE**
-                Desain minimalis modern yang nyaman dibaca di HP:
-                
-                1. **TYPOGRAPHY (CLEAN & READABLE)**:
-                   - Headline (H1): text-2xl font-semibold (24px) - Clean & Bold
-                   - Subheading (H2): text-xl font-medium (20px)
-                   - Body text (P): text-base leading-relaxed (16px)
-                   - Font: Inter, system-ui, atau sans-serif modern
-                   - Color: text-gray-900 untuk heading, text-gray-700 untuk body
-                
-                2. **SPACING & PADDING** (🔒 LOCKED - JANGAN DIUBAH!):
-                   - Container: max-w-7xl mx-auto (PADDING 2PX KIRI-KANAN - FINAL!)
-                   - Section padding: py-6 (PADDING 2PX KIRI-KANAN - LOCKED!)
-                   - Paragraph spacing: mb-3
-                   - Jarak antar section: my-4 (COMPACT!)
-                   - 🔒 CRITICAL: Padding horizontal TETAP 2px!
-                
-                3. **COLORS (FRESH & MINIMALIST - FULL WHITE)**:
-                   - Background: bg-white (SEMUA SECTION - NO ALTERNATING!)
-                   - JANGAN gunakan bg-gray-50 atau warna lain
-                   - Semua section full white background
-                   - Accent color: Blue atau Teal (bg-blue-600, bg-teal-500)
-                   - Text: text-gray-900 (headings), text-gray-700 (body)
-                   - Border: border-gray-200 (subtle dividers jika perlu)
-                
-                4. **LAYOUT (SIMPLE & CLEAN - WHITE CANVAS)**:
-                   - Full white background di semua section
-                   - NO alternating backgrounds (semua putih!)
-                   - Vertical stack (flex-col) di mobile
-                   - Cards: bg-white border border-gray-200 rounded-xl (opsional)
-                   - Gunakan border atau spacing untuk pemisah section, bukan warna background
-                   - Clean spacing antar elemen
-                
-                5. **VISUAL ELEMENTS (MINIMAL)**:
-                   - NO gradient backgrounds
-                   - NO emoji di text
-                   - Simple border-l-4 untuk accent (optional)
-                   - Cards: shadow-sm hover:shadow-md (subtle elevation)
-                   - Images: rounded-lg shadow-md (simple, clean)
-                   - Focused on whitespace and breathing room
-                
-                
-                7. **OVERALL AESTHETIC**:
-                   - Clean white space
-                   - Subtle shadows (sm, md only)
-                   - Clear visual hierarchy
-                   - Easy to scan and read
-                   - Modern but not flashy
-                   - Professional and trustworthy
-                
-                ⚠️ **CRITICAL - NO CTA BUTTONS**:
-                - DILARANG membuat tombol CTA/button "Beli Sekarang", "Dapatkan Sekarang", dll
-                - JANGAN buat tag <button> atau <a> yang berfungsi sebagai CTA
-                - User akan menambahkan form order sendiri dari penyedia web eksternal
-                - Landing page ini HANYA informatif + pricing, TANPA action button
-                
-                {image_instruction}
-                
-                {bonus_instruction}
-                
-                **CSS WAJIB (CRITICAL - PASTE KE <HEAD>)**:
-                
-                Tambahkan CSS ini di <head> untuk memastikan teks tidak pecah:
-                
-                <style>
-                  * {{
-                    word-wrap: break-word;
-                    overflow-wrap: break-word;
-                    -webkit-hyphens: auto;
-                    hyphens: auto;
-                  }}
-                  
-                  body {{
-                    font-size: 16px;
-                    line-height: 1.6;
-                  }}
-                  
-                  h1, h2, h3 {{
-                    word-break: keep-all;
-                    overflow-wrap: normal;
-                  }}
-                  
-                  @media (max-width: 768px) {{
-                    h1 {{
-                      font-size: 1.5rem !important; /* 24px */
-                      line-height: 1.3 !important;
-                    }}
-                    
-                    h2 {{
-                      font-size: 1.25rem !important; /* 20px */
-                      line-height: 1.4 !important;
-                    }}
-                    
-                    p {{
-                      font-size: 1rem !important; /* 16px */
-                      line-height: 1.625 !important;
-                      margin-bottom: 1rem !important;
-                    }}
-                    
-                    /* JARAK MINIMAL KIRI/KANAN - 2px */
-                    body {{
-                      padding-left: 2px !important;
-                      padding-right: 2px !important;
-                      margin: 0 !important;
-                    }}
-                    
-                    .container, section, div {{
-                      padding-left: 2px !important;
-                      padding-right: 2px !important;
-                    }}
-                  }}
-                </style>
-                
-                TEKNIS:
-                - Gunakan Tailwind CSS via CDN
-                - Mobile responsive 100%
-                - Pastikan tag <html>, <head>, <body> lengkap
-                - JANGAN gunakan JavaScript
-                """
-
-                if product_type == "Ebook / Produk Digital":
-                    # Build image references
-                    hero_img_html = f'<img src="{hero_image}" class="w-full max-w-lg mx-auto rounded-2xl shadow-xl my-8" alt="Hero">' if hero_image else '<img src="https://placehold.co/600x400/e2e8f0/475569?text=Hero+Image" class="w-full max-w-lg mx-auto rounded-2xl shadow-xl my-8" alt="Hero">'
-                    product_img_html = f'<img src="{product_image}" class="w-full max-w-md mx-auto rounded-2xl shadow-lg my-6" alt="Product">' if product_image else '<img src="https://placehold.co/500x400/e2e8f0/475569?text=Product+Image" class="w-full max-w-md mx-auto rounded-2xl shadow-lg my-6" alt="Product">'
-                    
-                    scenario_prompt = f"""
-                    SKENARIO: EBOOK / DIGITAL PRODUCT (Storytelling Mode)
-                    Struktur Halaman:
-                    1. **Headline Provokatif + Hero Image**: 
-                       - Tulis headline yang fokus pada pain point/frustasi target audience. Font besar & bold.
-                       - WAJIB gunakan HTML gambar ini PERSIS seperti ini (JANGAN GANTI):
-                         {hero_img_html}
-                    2. **Story Section**: 2-3 paragraf pendek. Ceritakan masalah yang relate dengan user. Sesuaikan dengan gaya bahasa yang dipilih: {tone}
-                     7. **FAQ (Tanya Jawab)**:
-                        - WAJIB: Bungkus section FAQ dengan comment HTML ini:
-                          `<!-- FAQ_START -->`
-                          (Kode Section FAQ disini)
-                          `<!-- FAQ_END -->`
-                        - WAJIB: Gunakan tag HTML `<details>` dan `<summary>` untuk membuat Accordion.
-                        - Style `<details>` agar terlihat rapi (border bottom, padding).
-                        - Style `<summary>` agar cursor pointer dan bold.
-                        - JANGAN biarkan jawaban terbuka semua. Gunakan native HTML accordion.
-                    3. **Solution + Image**: 
-                       - Tulis heading "Solusi: [Nama Produk]"
-                       - WAJIB gunakan HTML gambar ini PERSIS seperti ini (JANGAN GANTI):
-                         {product_img_html}
-                       - Tulis 2-3 paragraf penjelasan produk sebagai solusi yang JELAS dan TERSTRUKTUR
-                    4. **What You Get**: List bullet points materi/isi produk yang SPESIFIK dan JELAS.
-                    5. **Kenapa Ini Penting**: Section yang menjelaskan WHY user harus peduli/action sekarang. Fokus pada konsekuensi TIDAK belajar ini (kehilangan peluang, tetap stuck, dll). 2-3 paragraf pendek yang memotivasi.
-                     6. **Pricing & Guarantee (PREMIUM DESIGN - CARD LAYOUT)**: 
-                        WAJIB buat section pricing dengan desain **CARD PREMIUM** agar terlihat mahal & profesional:
-                        
-                        Gunakan struktur HTML ini (sesuaikan text):
-                        <div class="w-[90%] max-w-md mx-auto bg-white rounded-3xl shadow-2xl overflow-hidden border-2 border-blue-100 relative mt-8">
-                            <!-- Header Card -->
-                            <div class="bg-gradient-to-r from-blue-600 to-indigo-700 py-4 px-6 text-center">
-                                <span class="text-white font-bold tracking-wider text-sm uppercase">✨ Penawaran Spesial Terbatas</span>
-                            </div>
-                            
-                            <!-- Body Card -->
-                            <div class="p-8 text-center">
-                                <!-- Harga Coret -->
-                                <p class="text-gray-400 text-lg mb-1">Harga Normal</p>
-                                <p class="text-2xl text-gray-400 line-through font-medium mb-4">{harga_coret if harga_coret else "Rp 1.150.000"}</p>
-                                
-                                <!-- Harga Jual -->
-                                <div class="mb-6">
-                                    <span class="bg-red-100 text-red-700 px-3 py-1 rounded-full text-sm font-bold mb-2 inline-block">{discount_label}</span>
-                                    <p class="text-5xl font-extrabold text-gray-900 mt-2 tracking-tight">{harga_jual if harga_jual else "Rp 99.000"}</p>
-                                </div>
-                                
-                                <!-- Value Comparison -->
-                                <p class="text-gray-600 text-sm mb-6 italic border-t border-gray-100 pt-4">
-                                    "Cuma seharga 2 gelas kopi, tapi ilmunya bisa dipakai seumur hidup untuk karirmu!"
-                                </p>
-                                
-                                <!-- Garansi Badge -->
-                                <div class="flex items-center justify-center gap-2 text-green-600 font-semibold bg-green-50 py-3 rounded-xl">
-                                    <svg xmlns="http://www.w3.org/2000/svg" class="h-5 w-5" viewBox="0 0 20 20" fill="currentColor"><path fill-rule="evenodd" d="M10 18a8 8 0 100-16 8 8 0 000 16zm3.707-9.293a1 1 0 00-1.414-1.414L9 10.586 7.707 9.293a1 1 0 00-1.414 1.414l2 2a1 1 0 001.414 0l4-4z" clip-rule="evenodd"/></svg>
-                                    <span>Garansi 30 Hari Uang Kembali</span>
-                                </div>
-                            </div>
-                        </div>
-                    
-                    
-                    PENTING - KUALITAS TEKS (MOBILE-FRIENDLY):
-                    - Teks harus RAPI, TERSTRUKTUR, dan MUDAH DIBACA di HP
-                    - WAJIB: Setiap kalimat (setelah titik) HARUS jadi PARAGRAPH TERPISAH
-                    - Format: <p>Kalimat pertama.</p><p>Kalimat kedua.</p><p>Kalimat ketiga.</p>
-                    - JANGAN gabung banyak kalimat dalam 1 tag <p>
-                    - Setiap <p> hanya boleh 1 kalimat saja
-                    - DILARANG menggunakan tanda petik satu (')
-                    - Headline tidak boleh terlalu panjang (max 10 kata)
-                    - Gunakan bahasa yang langsung to the point
-                    """
-                else: # Produk Fisik
-                    # Build image references
-                    hero_img_html = f'<img src="{hero_image}" class="w-full max-w-lg mx-auto rounded-2xl shadow-xl my-8" alt="Hero">' if hero_image else '<img src="https://placehold.co/600x400/e2e8f0/475569?text=Product+Image" class="w-full max-w-lg mx-auto rounded-2xl shadow-xl my-8" alt="Hero">'
-                    product_img_html = f'<img src="{product_image}" class="w-full max-w-md mx-auto rounded-2xl shadow-lg my-6" alt="Product">' if product_image else '<img src="https://placehold.co/500x400/e2e8f0/475569?text=Product+Detail" class="w-full max-w-md mx-auto rounded-2xl shadow-lg my-6" alt="Product">'
-                    
-                    scenario_prompt = f"""
-                    SKENARIO: PRODUK FISIK (Visual & Urgency Mode)
-                    Struktur Halaman:
-                    1. **Hero Section**: 
-                       - Background bersih, Headline kuat & singkat
-                       - WAJIB gunakan HTML gambar ini PERSIS seperti ini (JANGAN GANTI):
-                         {hero_img_html}
-                    2. **Agitation**: Sub-headline yang menekan masalah (misal: "Sering merasa minder karena...?"). Sesuaikan dengan gaya bahasa: {tone}
-                    3. **Product Solution**: 
-                       - WAJIB gunakan HTML gambar ini PERSIS seperti ini (JANGAN GANTI):
-                         {product_img_html}
-                       - Penjelasan singkat cara pakai & solusi praktis yang JELAS dan TERSTRUKTUR
-                    4. **Benefit Grid**: Layout Grid 2x2 atau 4 kolom. Ikon (bisa pakai emoji atau SVG inline) + Poin keunggulan yang SPESIFIK.
-                    5. **Social Proof**: Placeholder untuk 3 testimoni user (Foto bulat + Nama + Teks pendek).
-                     6. **Scarcity Offer & Pricing**: 
-                        - "Promo Terbatas", "Beli 2 Gratis 1", atau Countdown Timer (tampilan visual saja).
-                        - WAJIB TAMPILKAN HARGA:
-                          * Harga Coret: {harga_coret if harga_coret else "Harga Tinggi"}
-                          * Harga Jual: {harga_jual if harga_jual else "Harga Promo"}
-                    
-                    PENTING - KUALITAS TEKS:
-                    - Teks harus RAPI, TERSTRUKTUR, dan MUDAH DIBACA
-                    - WAJIB: Setiap kalimat (setelah titik) HARUS jadi PARAGRAPH TERPISAH
-                    - Format: <p>Kalimat pertama.</p><p>Kalimat kedua.</p><p>Kalimat ketiga.</p>
-                    - JANGAN gabung banyak kalimat dalam 1 tag <p>
-                    - Setiap <p> hanya boleh 1 kalimat saja
-                    - Hindari teks yang terlalu panjang atau bertele-tele
-                    - DILARANG menggunakan tanda petik satu (')
-                    - Headline tidak boleh terlalu panjang (max 10 kata)
-                    - Gunakan paragraf pendek dengan tag <p>
-                    """
-
-                json_instruction = """
-                INSTRUKSI OUTPUT (CRITICAL - MUST BE VALID JSON):
-                
-                WAJIB: Output kamu HARUS JSON VALID. Format EXACT:
-                
-                {
-                  "copywriting": {
-                    "headline": "...",
-                    "subheadline": "...",
-                    "body_copy": "...",
-                    "benefits": ["...", "..."],
-                    "cta": "...",
-                    "guarantee": "..."
-                  },
-                  "html_code": "<!DOCTYPE html><html>...FULL HTML...</html>"
-                }
-                
-                RULES KETAT:
-                - Output HANYA JSON, no text outside JSON
-                - html_code harus complete HTML (DOCTYPE to </html>)
-                - NO markdown fence (```json or ```)
-                - Escape quotes properly in JSON strings
-                """
-
-                final_prompt = base_prompt + "\n" + scenario_prompt + "\n" + json_instruction
-
-                # Generate with Rotation
-                response = generate_content_with_rotation(final_prompt, api_keys)
-                
-                # Parse JSON Response
-                text_response = response.text.replace("```json", "").replace("```", "")
-                try:
-                    data = json.loads(text_response)
-                    # Handle if AI returns list
-                    if isinstance(data, list): data = data[0]
-                    
-                    generated_html = data.get("html_code", "")
-                    copy_sections = data.get("copywriting", {})
-                except json.JSONDecodeError as e:
-                    # Fallback: Try to extract HTML from malformed response
-                    st.warning("⚠️ JSON parsing failed, trying to extract HTML...")
-                    import re
-                    
-                    # Try to find HTML in response
-                    html_match = re.search(r'"html_code"\s*:\s*"((?:[^"\\]|\\.)*)"', text_response, re.DOTALL)
-                    if html_match:
-                        # Unescape the HTML
-                        generated_html = html_match.group(1).encode().decode('unicode_escape')
-                        generated_html = generated_html.replace('\\n', '\n').replace('\\t', '\t')
-                    elif '<!DOCTYPE html>' in text_response or '<html>' in text_response:
-                        # Direct HTML extraction
-                        html_match2 = re.search(r'<!DOCTYPE html>.*?</html>', text_response, re.DOTALL | re.IGNORECASE)
-                        if html_match2:
-                            generated_html = html_match2.group(0)
-                        else:
-                            generated_html = f"<html><body><h1>Error</h1><p>Could not extract HTML</p><pre>{str(e)}</pre></body></html>"
-                    else:
-                        generated_html = f"<html><body><h1>JSON Parse Error</h1><pre>{text_response[:1000]}</pre></body></html>"
-                    
-                    copy_sections = {}
-                    st.error("Gagal parse JSON properly. Silakan coba lagi atau check API response.")
-
-
-                # Save to session state
-                st.session_state.generated_html = generated_html
-                st.session_state.copy_sections = copy_sections
-
-                # Success message
+        # Generate jalan di worker pool (jobs.py): rerun / refresh tidak membatalkan job,
+        # sesi ini cukup memegang id job-nya lalu mengambil hasilnya saat selesai
+        active_job = job_queue.status(st.session_state.job_id) if st.session_state.job_id else None
+        if active_job and active_job["status"] in ACTIVE_STATUSES:
+            st.warning("⏳ Generate sebelumnya masih berjalan. Tunggu selesai atau batalkan dulu.")
+        else:
+            request = {
+                "product_name": product_name, "product_type": product_type, "tone": tone,
+                "harga_coret": harga_coret, "harga_jual": harga_jual,
+                "hero_image": hero_image, "product_image": product_image,
+                # Isi upload dibaca sekarang; objek UploadedFile milik sesi, job jalan di thread lain
+                "hero_upload": {"data": hero_upload.getvalue(), "type": hero_upload.type} if hero_upload else None,
+                "product_upload": {"data": product_upload.getvalue(), "type": product_upload.type} if product_upload else None,
+                "bonuses": [b for b in (bonus_1, bonus_2, bonus_3) if b], "use_boosters": use_boosters,
+                "competitor_urls": competitor_urls,
+                "ebook": {"name": uploaded_ebook.name, "type": uploaded_ebook.type, "data": uploaded_ebook.getvalue()} if uploaded_ebook else None,
+                "summarize_ebook": summarize_ebook,
+                "use_templates": use_templates, "use_streaming": use_streaming,
+                "optimize_images": optimize_images_enabled, "force": force_regenerate,
+            }
+            st.session_state.job_id = job_queue.submit(
+                "landing_page", run_landing_job, request, api_keys, generation_store, competitor_store,
+                label=product_name,
+            )
+            st.query_params["job"] = st.session_state.job_id
+
+# --- JOB STATUS ---
+# Selama job jalan, panel progres di-polling sendiri (fragment) tanpa rerun seluruh halaman.
+# Begitu selesai, hasilnya ditempel ke sesi: generation_id, trace, dan peringatan dari job.
+job_info = job_queue.status(st.session_state.job_id) if st.session_state.job_id else None
+if job_info and job_info["status"] in ACTIVE_STATUSES:
+    job_progress_panel(job_info["id"])
+elif job_info:
+    st.session_state.job_id = None
+    st.query_params.pop("job", None)
+    if job_info["status"] == "done":
+        job_result = job_info["result"]
+        for message in job_result["warnings"]:
+            st.warning(message)
+        if job_result["generation_id"]:
+            st.session_state.generation_id = job_result["generation_id"]
+            st.query_params["gen"] = str(job_result["generation_id"])
+            st.session_state.last_trace = job_result["trace"]
+            attached_generation_id = job_result["generation_id"]
+            # Trace kecil untuk tahap render di rerun ini, nanti digabung ke trace job
+            start_trace("landing_page_render")
+            if job_result.get("section"):
+                st.success(f"Section {SECTION_LABELS[job_result['section']]} berhasil ditulis ulang ✏️")
+            elif job_result["parse_ok"]:
                 st.success("Landing Page Berhasil Dibuat! 🎉")
-            except Exception as e:
-                error_msg = str(e)
-                if "403" in error_msg and "leaked" in error_msg:
-                    st.error("⛔ **API Key Bermasalah!** Google mendeteksi API Key Anda bocor/tidak aman. Silakan buat API Key baru di Google AI Studio dan masukkan di sidebar.")
-                elif "429" in error_msg:
-                    st.error("⏳ **Kuota Habis!** API Key Anda terkena limit (Rate Limit). Coba tunggu beberapa saat atau tambahkan API Key cadangan di sidebar.")
-                else:
-                    st.error(f"Gagal generate: {e}")
-                st.info("💡 **Tip**: Pastikan koneksi internet lancar dan API Key valid.")
-
-                
-            except Exception as e:
-                error_msg = str(e)
-                if "403" in error_msg and "leaked" in error_msg:
-                    st.error("⛔ **API Key Bermasalahantygravity/landing-page-app/.venv/bin/python -m pip install -r requirements.txt* Google mendeteksi API Key Anda bocor/tidak aman. Silakan buat API Key baru di Google AI Studio dan masukkan di sidebar.")
-                elif "429" in error_msg:
-                    st.error("⏳ **Kuota Habisantygravity/landing-page-app/.venv/bin/python -m pip install -r requirements.txt* API Key Anda terkena limit (Rate Limit). Coba tunggu beberapa saat atau tambahkan API Key cadangan di sidebar.")
-                else:
-                    st.error(f"Gagal generate: {e}")
-                st.info("💡 **Tip**: Pastikan koneksi internet lancar dan API Key valid.")
-
-# --- DISPLAY PREVIEW (FROM SESSION STATE) ---
-if st.session_state.generated_html:
+    elif job_info["status"] == "error":
+        show_generation_error(job_info["error"])
+    else:
+        st.info("Generate dibatalkan.")
+
+# --- DISPLAY PREVIEW (FROM GENERATION STORE) ---
+current_generation = generation_store.load(st.session_state.generation_id) if st.session_state.generation_id else None
+if current_generation:
+    # Baru dibutuhkan setelah ada hasil generate yang ditampilkan
+    from image_pipeline import IMAGE_BASE_URL, inline_images, image_files, image_folder, package_zip, standalone_html
+
+    current_html = current_generation["html"]
+    current_copy = current_generation["copy_sections"]
+    st.caption(f"📄 #{current_generation['id']} · {current_generation['product_name']} · "
+               f"{time.strftime('%d %b %Y %H:%M', time.localtime(current_generation['created_at']))}")
+    # Yang ditampilkan & di-download: versi teroptimasi. Regenerate section tetap dari HTML asli.
+    output_html = current_html
+    if optimize_output:
+        with stage("optimize", bytes=len(current_html.encode("utf-8"))):
+            output_html, weight = optimized_page(current_html)
+        cdn_note = ("Tailwind CDN diganti CSS inline" if weight["cdn_removed"] else
+                    f"Tailwind CDN dipertahankan ({len(weight['unknown_classes'])} class tidak dikenali)"
+                    if weight["unknown_classes"] else "")
+        st.caption(f"🪶 Bobot halaman: {weight['before_transfer'] / 1000:.1f} KB → {weight['after_transfer'] / 1000:.1f} KB "
+                   f"(HTML {weight['before_bytes'] / 1000:.1f} → {weight['after_bytes'] / 1000:.1f} KB, "
+                   f"{weight['style_blocks']} blok style digabung)" + (f" · {cdn_note}" if cdn_note else ""))
     # Create tabs for preview and code
     tab1, tab2, tab3 = st.tabs(["🖥️ Desktop Preview", "📱 Mobile Preview", "💻 Source Code"])
     
     # Display HTML
     with tab1:
         st.caption("Preview Desktop (Full Width)")
-        components.html(st.session_state.generated_html, height=800, scrolling=True)
+        with stage("render", bytes=len(output_html.encode("utf-8"))):
+            components.html(inline_images(output_html), height=800, scrolling=True)
 
     with tab2:
         st.caption("Preview Mobile - Pilih Model HP untuk Melihat Tampilan")
@@ -827,11 +505,14 @@ if st.session_state.generated_html:
                 """, unsafe_allow_html=True
             )
             st.caption(f"Ukuran layar: {phone_width}px")
-            components.html(st.session_state.generated_html, height=700, width=phone_width, scrolling=True)
+            components.html(inline_images(output_html), height=700, width=phone_width, scrolling=True)
             st.markdown("</div>", unsafe_allow_html=True)
     
+    # HTML yang di-copy / di-download tanpa folder gambar: <img> kembali ke link asli gambarnya
+    standalone_output = standalone_html(output_html)
+
     with tab3:
-        full_html = st.session_state.generated_html
+        full_html = standalone_output
         
         # Split HTML based on FAQ markers
         if "<!-- FAQ_START -->" in full_html:
@@ -864,34 +545,182 @@ if st.session_state.generated_html:
     # Download Button
     st.download_button(
         label="⬇️ Download HTML File",
-        data=st.session_state.generated_html,
+        data=standalone_output,
         file_name="landing_page.html",
         mime="text/html"
     )
+    if image_files(output_html):
+        st.download_button(
+            label="🖼️ Download HTML + Gambar (ZIP)",
+            data=package_zip(output_html),
+            file_name="landing_page.zip",
+            mime="application/zip",
+            help=f"Versi dengan gambar WebP/AVIF ukuran responsif. Upload index.html bersama folder {image_folder()}/ (gambar dirujuk lewat \"{IMAGE_BASE_URL}/...\")."
+        )
+
+    # Regenerate satu section saja: yang dikirim ke AI cuma HTML section itu
+    page_sections = [name for name, _ in find_sections(current_html)]
+    if page_sections:
+        with st.expander("✏️ Ubah Satu Section Saja (Lebih Cepat & Hemat)", expanded=False):
+            section_name = st.selectbox("Section", page_sections, format_func=lambda name: SECTION_LABELS[name])
+            section_instruction = st.text_input("Apa yang mau diubah?", placeholder="Contoh: tambah 2 pertanyaan soal pengiriman, buat lebih singkat", key="section_instruction")
+            if st.button("🔁 Generate Ulang Section Ini"):
+                if not api_keys:
+                    st.error("API Key belum ada! Cek sidebar.")
+                elif job_info and job_info["status"] in ACTIVE_STATUSES:
+                    st.warning("⏳ Generate sebelumnya masih berjalan. Tunggu selesai atau batalkan dulu.")
+                else:
+                    # Sama seperti generate landing page: jalan sebagai job, hasilnya versi baru di riwayat
+                    st.session_state.job_id = job_queue.submit(
+                        "section", run_section_job, current_generation["id"], section_name, section_instruction,
+                        api_keys, generation_store, force=force_regenerate,
+                        label=f"{current_generation['product_name']} · {SECTION_LABELS[section_name]}",
+                    )
+                    st.query_params["job"] = st.session_state.job_id
+                    st.rerun()
     
     # Copywriting Sections
-    if st.session_state.copy_sections:
+    if current_copy:
         st.divider()
         st.subheader("📝 Draft Copywriting (Siap Copy)")
         st.info("Jika Anda hanya butuh teksnya saja untuk dipasang di platform lain (WordPress, Elementor, dll).")
         
         with st.expander("Lihat Draft Copywriting", expanded=True):
             st.text("Headline:")
-            st.code(st.session_state.copy_sections.get("headline", ""), language=None)
+            st.code(current_copy.get("headline", ""), language=None)
             
             st.text("Subheadline:")
-            st.code(st.session_state.copy_sections.get("subheadline", ""), language=None)
+            st.code(current_copy.get("subheadline", ""), language=None)
             
             st.text("Body Copy / Story:")
-            st.code(st.session_state.copy_sections.get("body_copy", ""), language=None)
+            st.code(current_copy.get("body_copy", ""), language=None)
             
             st.text("Poin-Poin Benefit:")
-            benefits_text = "\n".join([f"- {b}" for b in st.session_state.copy_sections.get("benefits", [])])
+            benefits_text = "\n".join([f"- {b}" for b in current_copy.get("benefits", [])])
             st.code(benefits_text, language=None)
             
             st.text("CTA Copy:")
-            st.code(st.session_state.copy_sections.get("cta", ""), language=None)
+            st.code(current_copy.get("cta", ""), language=None)
             
             st.text("Garansi:")
-            st.code(st.session_state.copy_sections.get("guarantee", ""), language=None)
+            st.code(current_copy.get("guarantee", ""), language=None)
+
+# --- TIMING PANEL ---
+# Tahap render hasil job dicatat di rerun yang menempelkannya, lalu digabung ke trace job
+finished_trace = end_trace()
+if finished_trace and attached_generation_id and st.session_state.get("last_trace"):
+    last_trace = st.session_state.last_trace
+    last_trace["stages"] = last_trace["stages"] + finished_trace["stages"]
+    last_trace["total"] = last_trace["total"] + finished_trace["total"]
+    generation_store.attach_trace(attached_generation_id, last_trace)
+
+if show_timing and st.session_state.get("last_trace"):
+    last_trace = st.session_state.last_trace
+    with st.sidebar.expander(f"⏱️ Timing Generate Terakhir ({last_trace['total']:.1f} detik)", expanded=True):
+        for entry in last_trace["stages"]:
+            details = []
+            if "bytes" in entry:
+                details.append(f"{entry['bytes'] / 1024:.1f} KB")
+            if "cache_hit" in entry:
+                details.append("cache hit" if entry["cache_hit"] else "cache miss")
+            if "model" in entry:
+                details.append(f"{entry['model']} · key {entry['key'][:6]}")
+            if "prompt_token_count" in entry:
+                details.append(f"{entry['prompt_token_count']} → {entry.get('candidates_token_count', 0)} token")
+            if "cached_content_token_count" in entry:
+                details.append(f"{entry['cached_content_token_count']} token dari cache")
+            if "error" in entry:
+                details.append(f"error: {entry['error']}")
+            suffix = f" — {', '.join(details)}" if details else ""
+            st.caption(f"**{entry['stage']}**: {entry['duration']:.2f} s{suffix}")
+
+
+# --- GENERATION HISTORY ---
+st.divider()
+history_total = generation_store.count()
+with st.expander(f"📚 Riwayat Generate ({history_total} hasil)", expanded=False):
+    if not history_total:
+        st.caption("Belum ada hasil generate yang tersimpan.")
+    else:
+        page_count = -(-history_total // HISTORY_PAGE_SIZE)
+        history_page = st.number_input("Halaman", min_value=1, max_value=page_count, value=1, step=1, help=f"{page_count} halaman, terbaru di halaman 1")
+        for row in generation_store.page(history_page - 1):
+            col_info, col_open = st.columns([5, 1])
+            status = "✅" if row["parse_ok"] else "⚠️"
+            mode_label = "Hemat" if row["mode"] == "template" else "Full AI"
+            created = time.strftime("%d %b %Y %H:%M", time.localtime(row["created_at"]))
+            col_info.markdown(f"{status} **#{row['id']}** {row['product_name']} · {mode_label} · {created} · {row['html_size'] / 1024:.0f} KB")
+            if col_open.button("Buka", key=f"open_generation_{row['id']}"):
+                st.session_state.generation_id = row["id"]
+                st.query_params["gen"] = str(row["id"])
+                st.rerun()
 
+        st.markdown("**🔍 Bandingkan Dua Versi**")
+        col_old, col_new = st.columns(2)
+        with col_old:
+            diff_old = st.number_input("Versi lama (#id)", min_value=1, step=1, value=max(1, (st.session_state.generation_id or 2) - 1))
+        with col_new:
+            diff_new = st.number_input("Versi baru (#id)", min_value=1, step=1, value=st.session_state.generation_id or 1)
+        if st.button("Tampilkan Perbedaan HTML"):
+            diff_text = generation_store.diff(int(diff_old), int(diff_new))
+            st.code(diff_text or "Tidak ada perbedaan (atau id tidak ditemukan).", language="diff")
+        stats = generation_store.stats()
+        st.caption(f"Tersimpan {stats['bytes'] / 1024:.0f} KB → {stats['stored_bytes'] / 1024:.0f} KB di disk setelah kompresi & deduplikasi.")
+
+# --- BATCH GENERATE ---
+st.divider()
+with st.expander("📦 Batch Generate (Banyak Produk dari CSV / JSONL)", expanded=False):
+    st.caption("Kolom: product_name, harga_coret, harga_jual, tone, bonuses (pisahkan dengan |), hero_image, product_image, competitor_url, product_type. "
+               "Upload ulang file yang sama untuk melanjutkan batch yang terputus.")
+    batch_file = st.file_uploader("Upload Daftar Produk", type=["csv", "jsonl"], key="batch_file")
+    # Slider butuh min < max; dengan satu key (atau belum ada key) batch jalan satu per satu
+    if len(api_keys) > 1:
+        batch_workers = st.slider("Jumlah Generate Paralel", min_value=1, max_value=len(api_keys), value=min(4, len(api_keys)))
+    else:
+        batch_workers = 1
+
+    # Batch jalan sebagai job terpisah dari generate landing page: keduanya boleh berjalan bersamaan
+    batch_info = job_queue.status(st.session_state.batch_job_id) if st.session_state.batch_job_id else None
+    batch_running = bool(batch_info and batch_info["status"] in ACTIVE_STATUSES)
+    if st.button("🚀 Jalankan Batch", disabled=batch_file is None or batch_running):
+        if not api_keys:
+            st.error("API Key belum ada! Cek sidebar.")
+        else:
+            from batch_generate import parse_rows, run_batch_job
+
+            batch_bytes = batch_file.getvalue()
+            batch_rows = parse_rows(batch_bytes.decode("utf-8-sig"), "jsonl" if batch_file.name.lower().endswith(".jsonl") else "csv")
+            # Folder output ditentukan dari isi file, jadi file yang sama = lanjut dari manifest lama
+            batch_dir = os.path.join("batch_output", content_hash(batch_bytes)[:12])
+            st.session_state.batch_result = None
+            st.session_state.batch_job_id = job_queue.submit(
+                "batch", run_batch_job, batch_rows, batch_dir, api_keys,
+                workers=batch_workers, force=force_regenerate, use_templates=use_templates,
+                label=f"Batch {batch_file.name}",
+            )
+            st.query_params["batch"] = st.session_state.batch_job_id
+            batch_info = job_queue.status(st.session_state.batch_job_id)
+            batch_running = True
+
+    if batch_running:
+        job_progress_panel(batch_info["id"])
+    elif batch_info:
+        st.session_state.batch_job_id = None
+        st.query_params.pop("batch", None)
+        if batch_info["status"] == "done":
+            st.session_state.batch_result = batch_info["result"]
+        elif batch_info["status"] == "error":
+            st.error(f"Batch gagal: {batch_info['error']}")
+        else:
+            st.info("Batch dibatalkan. Upload ulang file yang sama untuk melanjutkan sisanya.")
+
+    batch_result = st.session_state.get("batch_result")
+    if batch_result and os.path.isdir(batch_result["out_dir"]):
+        st.success(f"Batch selesai: {batch_result['ok']} berhasil, {batch_result['failed']} gagal, {batch_result['skipped']} sudah ada sebelumnya.")
+        zip_buffer = io.BytesIO()
+        with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+            for root, _, names in os.walk(batch_result["out_dir"]):
+                for name in names:
+                    path = os.path.join(root, name)
+                    zf.write(path, arcname=os.path.relpath(path, batch_result["out_dir"]))
+        st.download_button("⬇️ Download Semua HTML (ZIP)", data=zip_buffer.getvalue(), file_name="landing_pages.zip", mime="application/zip")
@@ -0,0 +1,286 @@
+import argparse
+import csv
+import io
+import json
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from disk_cache import content_hash
+from generator import (
+    key_pool, generate_text, parse_landing_response, build_landing_prompt,
+    build_content_prompt, render_content_response, LANDING_SYSTEM_INSTRUCTION,
+)
+from html_optimizer import optimize_html
+from image_pipeline import prepare_image, variant_url, optimize_images, export_images, packaged_html
+from scheduler import scheduling, PRIORITY_BATCH
+from scraper import scrape_many, format_competitor_texts
+
+# --- BATCH GENERATE ---
+# Generate banyak landing page sekaligus dari CSV / JSONL.
+# Setiap produk jadi satu file HTML + satu baris di manifest.jsonl, sehingga
+# kalau proses terhenti di tengah jalan, run berikutnya melanjutkan sisanya.
+#
+# Contoh:
+#   python batch_generate.py produk.csv --out hasil_batch --workers 4
+
+MANIFEST_FILE = "manifest.jsonl"
+DEFAULT_TONE = "Curhat & Personal (Deep Talk)"
+DEFAULT_PRODUCT_TYPE = "Ebook / Produk Digital"
+
+# Nama kolom alternatif yang diterima di CSV / JSONL
+COLUMN_ALIASES = {
+    "name": "product_name",
+    "nama": "product_name",
+    "nama_produk": "product_name",
+    "competitor": "competitor_url",
+    "competitor_url": "competitor_url",
+    "link_kompetitor": "competitor_url",
+    "jenis": "product_type",
+    "kategori": "product_type",
+}
+
+
+def parse_rows(text, fmt):
+    if fmt == "jsonl":
+        return [json.loads(line) for line in text.splitlines() if line.strip()]
+    return list(csv.DictReader(io.StringIO(text)))
+
+
+def load_rows(path):
+    with open(path, "r", encoding="utf-8-sig") as f:
+        text = f.read()
+    return parse_rows(text, "jsonl" if path.lower().endswith((".jsonl", ".json")) else "csv")
+
+
+def normalize_row(row):
+    product = {}
+    for column, value in row.items():
+        if column is None:
+            continue
+        column = column.strip().lower()
+        product[COLUMN_ALIASES.get(column, column)] = value.strip() if isinstance(value, str) else value
+
+    # Bonus bisa berupa list (JSONL), "a | b | c" (CSV), atau kolom bonus_1..bonus_3
+    bonuses = product.get("bonuses") or []
+    if isinstance(bonuses, str):
+        bonuses = [b.strip() for b in re.split(r"[|;]", bonuses)]
+    bonuses = list(bonuses) + [product.get(f"bonus_{i}", "") for i in (1, 2, 3)]
+    product["bonuses"] = [b for b in bonuses if b][:3]
+
+    product.setdefault("product_type", DEFAULT_PRODUCT_TYPE)
+    if product.get("product_type") not in ("Ebook / Produk Digital", "Produk Fisik / Barang"):
+        product["product_type"] = "Produk Fisik / Barang" if "fisik" in str(product["product_type"]).lower() else DEFAULT_PRODUCT_TYPE
+    product["tone"] = product.get("tone") or DEFAULT_TONE
+    use_boosters = product.get("use_boosters", True)
+    if isinstance(use_boosters, str):
+        use_boosters = use_boosters.strip().lower() not in ("0", "false", "no", "tidak")
+    product["use_boosters"] = use_boosters
+    return product
+
+
+def slugify(text):
+    slug = re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")
+    return slug[:60] or "produk"
+
+
+def row_id(product):
+    # ID stabil dari isi baris: baris yang sama -> file & entry manifest yang sama
+    return content_hash(json.dumps(product, sort_keys=True, ensure_ascii=False))[:12]
+
+
+def load_manifest(out_dir):
+    done = {}
+    path = os.path.join(out_dir, MANIFEST_FILE)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # Baris terakhir bisa terpotong kalau proses dimatikan paksa
+                    continue
+                done[entry["id"]] = entry
+    except FileNotFoundError:
+        pass
+    return done
+
+
+def generate_one(product, out_dir, keys, force=False, use_templates=False):
+    started = time.time()
+    pid = row_id(product)
+    file_name = f"{slugify(product['product_name'])}-{pid}.html"
+    competitor_urls = [u.strip() for u in re.split(r"[|,\s]+", product.get("competitor_url") or "") if u.strip()]
+    competitor_text = format_competitor_texts(scrape_many(competitor_urls))
+
+    # Gambar produk yang sama di banyak baris cukup diunduh & diolah sekali (cache per hash)
+    page_images = {}
+    product = dict(product)
+    for slot, field in (("hero", "hero_image"), ("product", "product_image")):
+        link = product.get(field, "")
+        meta = prepare_image(link)
+        # Tanpa Pillow tidak ada varian, link aslinya dipakai apa adanya
+        if meta and meta["variants"]:
+            product[field] = variant_url(meta["src"])
+            page_images[product[field]] = (meta, slot, link)
+        elif link:
+            page_images[link] = (None, slot, link)
+
+    if use_templates:
+        prompt = build_content_prompt(
+            product["product_name"], product["product_type"], product["tone"],
+            harga_coret=product.get("harga_coret", ""), harga_jual=product.get("harga_jual", ""),
+            bonuses=product["bonuses"], use_boosters=product["use_boosters"],
+            competitor_text=competitor_text,
+        )
+        response_text = generate_text(prompt, keys, force=force)
+        generated_html, copy_sections, parse_error = render_content_response(response_text, product)
+    else:
+        prompt = build_landing_prompt(
+            product["product_name"], product["product_type"], product["tone"],
+            harga_coret=product.get("harga_coret", ""), harga_jual=product.get("harga_jual", ""),
+            hero_image=product.get("hero_image", ""), product_image=product.get("product_image", ""),
+            bonuses=product["bonuses"], use_boosters=product["use_boosters"],
+            competitor_text=competitor_text,
+        )
+        response_text = generate_text(prompt, keys, force=force, system_instruction=LANDING_SYSTEM_INSTRUCTION)
+        generated_html, copy_sections, parse_error = parse_landing_response(response_text)
+
+    generated_html, weight = optimize_html(optimize_images(generated_html, page_images))
+    # File varian ikut disalin ke folder output, jadi <picture> dipakai apa adanya
+    generated_html = packaged_html(generated_html)
+    with open(os.path.join(out_dir, file_name), "w", encoding="utf-8") as f:
+        f.write(generated_html)
+    export_images(generated_html, out_dir)
+
+    return {
+        "id": pid,
+        "product_name": product["product_name"],
+        "status": "ok" if parse_error is None else "parse_error",
+        "mode": "template" if use_templates else "full",
+        "file": file_name,
+        "page_bytes": {"before": weight["before_transfer"], "after": weight["after_transfer"]},
+        "copywriting": copy_sections,
+        "seconds": round(time.time() - started, 2),
+        "error": str(parse_error) if parse_error else None,
+    }
+
+
+def generate_one_queued(*args):
+    # Worker batch antri kuota API di belakang request interaktif dari UI
+    with scheduling(priority=PRIORITY_BATCH):
+        return generate_one(*args)
+
+
+def run_batch(rows, out_dir, keys, workers=None, force=False, on_result=None, use_templates=False):
+    """Jalankan batch; on_result(entry, selesai, total) dipanggil di thread pemanggil."""
+    os.makedirs(out_dir, exist_ok=True)
+    products = [normalize_row(row) for row in rows]
+    products = [p for p in products if p.get("product_name")]
+
+    done = load_manifest(out_dir)
+    pending = []
+    for product in products:
+        entry = done.get(row_id(product))
+        mode = "template" if use_templates else "full"
+        if entry and entry["status"] == "ok" and entry.get("mode", "full") == mode \
+                and os.path.exists(os.path.join(out_dir, entry["file"])) and not force:
+            continue
+        pending.append(product)
+
+    # Worker lebih banyak dari key yang sehat hanya akan antri di key yang sama
+    usable_keys = max(1, key_pool.status(keys)["healthy"])
+    workers = min(workers or usable_keys, usable_keys, max(1, len(pending)))
+
+    results = []
+    total = len(pending)
+    manifest_path = os.path.join(out_dir, MANIFEST_FILE)
+    with ThreadPoolExecutor(max_workers=workers) as executor, open(manifest_path, "a", encoding="utf-8") as manifest:
+        futures = {executor.submit(generate_one_queued, product, out_dir, keys, force, use_templates): product for product in pending}
+        try:
+            for finished, future in enumerate(as_completed(futures), start=1):
+                product = futures[future]
+                try:
+                    entry = future.result()
+                except Exception as e:
+                    entry = {
+                        "id": row_id(product),
+                        "product_name": product["product_name"],
+                        "status": "error",
+                        "file": None,
+                        "error": str(e),
+                    }
+                entry["finished_at"] = time.time()
+                manifest.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                manifest.flush()
+                results.append(entry)
+                if on_result:
+                    on_result(entry, finished, total)
+        except BaseException:
+            # Dihentikan dari on_result (mis. job dibatalkan): produk yang belum mulai tidak dijalankan.
+            # Yang sudah selesai sudah tercatat di manifest, run berikutnya melanjutkan sisanya.
+            for future in futures:
+                future.cancel()
+            raise
+
+    return {"skipped": len(products) - total, "results": results}
+
+
+def run_batch_job(job, rows, out_dir, keys, workers=None, force=False, use_templates=False):
+    """Fungsi job (jobs.JobQueue) untuk batch dari UI. Return ringkasan hasil (bisa di-JSON-kan)."""
+    log = []
+
+    def on_result(entry, finished, total):
+        mark = "✅" if entry["status"] == "ok" else "❌"
+        log.append(f"{mark} {entry['product_name']}")
+        job.progress(finished / total, f"{finished}/{total} selesai")
+        job.partial(log=log[-10:])
+        job.check_cancelled()
+
+    job.progress(0.0, "Menyiapkan batch...")
+    summary = run_batch(rows, out_dir, keys, workers=workers, force=force, on_result=on_result, use_templates=use_templates)
+    ok_count = sum(1 for r in summary["results"] if r["status"] == "ok")
+    return {"out_dir": out_dir, "ok": ok_count, "failed": len(summary["results"]) - ok_count,
+            "skipped": summary["skipped"]}
+
+
+def load_api_keys():
+    # Urutan: env GOOGLE_API_KEY -> .streamlit/secrets.toml (sama seperti app.py)
+    raw_keys = os.environ.get("GOOGLE_API_KEY", "")
+    if not raw_keys:
+        try:
+            import tomllib
+            with open(".streamlit/secrets.toml", "rb") as f:
+                raw_keys = tomllib.load(f).get("GOOGLE_API_KEY", "")
+        except (FileNotFoundError, ImportError, ValueError):
+            raw_keys = ""
+    return [k.strip() for k in re.split(r"[\n,]", raw_keys) if k.strip() and k.strip() != "PASTE_YOUR_API_KEY_HERE"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate banyak landing page dari file CSV / JSONL.")
+    parser.add_argument("input", help="File CSV atau JSONL berisi daftar produk")
+    parser.add_argument("--out", default="batch_output", help="Folder output HTML + manifest.jsonl")
+    parser.add_argument("--workers", type=int, default=None, help="Jumlah generate paralel (default: jumlah key yang sehat)")
+    parser.add_argument("--force", action="store_true", help="Generate ulang semua baris, abaikan manifest & cache")
+    parser.add_argument("--template", action="store_true", help="Mode Hemat: AI tulis copy saja, HTML dirakit dari template lokal")
+    args = parser.parse_args()
+
+    keys = load_api_keys()
+    if not keys:
+        print("❌ API Key tidak ditemukan. Set env GOOGLE_API_KEY atau isi .streamlit/secrets.toml")
+        return 1
+
+    def report(entry, finished, total):
+        mark = "✅" if entry["status"] == "ok" else "❌"
+        print(f"[{finished}/{total}] {mark} {entry['product_name']} -> {entry.get('file') or entry.get('error')}")
+
+    summary = run_batch(load_rows(args.input), args.out, keys, workers=args.workers, force=args.force, on_result=report, use_templates=args.template)
+    failed = [r for r in summary["results"] if r["status"] != "ok"]
+    print(f"Selesai. {len(summary['results']) - len(failed)} berhasil, {len(failed)} gagal, {summary['skipped']} dilewati (sudah ada).")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,365 @@
+import argparse
+import importlib
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Sebelum modul repo mana pun di-import (nilai ini dibaca saat import): log trace tidak ditulis,
+# dan mock server tidak punya kuota, jadi jatah RPM/TPM scheduler jangan ikut memperlambat angka
+os.environ["TRACE_LOG"] = ""
+os.environ["KEY_RPM"] = "0"
+os.environ["KEY_TPM"] = "0"
+
+from mock_gemini import MockConfig, start_mock_server, landing_response_text
+from router import percentile
+
+# --- BENCHMARK ---
+# Ukur pipeline generate secara offline & bisa diulang: Gemini diganti mock lokal
+# (mock_gemini.py), halaman kompetitor & file PDF/DOCX dibuat dari fixture yang sama
+# setiap kali (seed tetap). Hasil tiap benchmark: throughput, p50/p95/p99 dalam ms.
+#
+#   python benchmark.py --out hasil.json
+#   python benchmark.py --baseline hasil.json      # bandingkan dengan run sebelumnya
+#
+# Semua state (key_pool_state.json, cache/) ditulis ke folder sementara, bukan ke folder app.
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+BENCHMARKS = ("scrape", "read_file", "parse", "optimize", "rotation", "stream")
+
+# Key fiktif untuk mock: 0-2 normal, 3 lambat, 4 selalu 429, 5 leaked (403)
+BENCH_KEYS = [f"bench-key-{i}" for i in range(6)]
+SLOW_KEYS = BENCH_KEYS[3:4]
+RATE_LIMITED_KEYS = BENCH_KEYS[4:5]
+LEAKED_KEYS = BENCH_KEYS[5:6]
+
+WORDS = ("produk", "hasil", "cepat", "mudah", "belajar", "bisnis", "online", "strategi", "pelanggan",
+         "jualan", "omzet", "naik", "tanpa", "ribet", "panduan", "lengkap", "praktis", "terbukti")
+
+
+# --- FIXTURES ---
+def sentences(rng, count, words=12):
+    return [" ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "." for _ in range(count)]
+
+
+def competitor_page(index, sections=40):
+    # Mirip landing page asli: CSS & JS inline besar, navigasi, banyak section
+    rng = random.Random(index)
+    style = "<style>" + "".join(f".c{i}{{margin:{i}px;padding:{i}px}}" for i in range(800)) + "</style>"
+    script = "<script>" + "var x=1;" * 3000 + "</script>"
+    body = []
+    for i in range(sections):
+        body.append(f"<section><h2>Bagian {i}</h2>"
+                    + "".join(f"<p>{s}</p>" for s in sentences(rng, 6)) + "</section>")
+    return (f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>Kompetitor {index}</title>{style}{script}</head>"
+            f"<body><nav><a href='#'>Home</a><a href='#'>Order</a></nav>{''.join(body)}</body></html>")
+
+
+def pdf_escape(text):
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_pdf(pages):
+    """PDF minimal (Helvetica, teks ASCII) dari list halaman berisi list baris."""
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids [%s] /Count %d >>" % (" ".join(f"{4 + 2 * i} 0 R" for i in range(len(pages))), len(pages)),
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for i, lines in enumerate(pages):
+        ops = ["BT", "/F1 10 Tf", "13 TL", "40 800 Td"] + [f"({pdf_escape(line)}) Tj T*" for line in lines] + ["ET"]
+        stream = "\n".join(ops)
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * i} 0 R >>")
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(f"{number} 0 obj\n{obj}\nendobj\n".encode("latin-1"))
+    xref = out.tell()
+    out.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("ascii"))
+    for offset in offsets:
+        out.write(f"{offset:010d} 00000 n \n".encode("ascii"))
+    out.write(f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("ascii"))
+    return out.getvalue()
+
+
+def ebook_pdf(page_count=80):
+    rng = random.Random(42)
+    return make_pdf([sentences(rng, 55, words=9) for _ in range(page_count)])
+
+
+def ebook_docx(paragraphs=1500):
+    try:
+        import docx
+    except ImportError:
+        return None
+    rng = random.Random(43)
+    document = docx.Document()
+    for i in range(paragraphs):
+        if i % 50 == 0:
+            document.add_heading(f"Bab {i // 50 + 1}", level=1)
+        document.add_paragraph(" ".join(sentences(rng, 3)))
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def sample_responses():
+    valid = landing_response_text("x" * 5000)
+    data = json.loads(valid)
+    # Kesalahan khas LLM: newline mentah & kutip atribut HTML yang tidak di-escape
+    broken_html = data["html_code"].replace("<section class='py-6'>", '<section class="py-6">\n')
+    broken = valid.replace(json.dumps(data["html_code"]), '"' + broken_html + '"')
+    return {
+        "valid": valid,
+        "fenced": "```json\n" + valid + "\n```",
+        "broken": broken,
+        "truncated": valid[:int(len(valid) * 0.7)],
+    }
+
+
+class Upload:
+    # Pengganti UploadedFile Streamlit untuk read_file_content
+    def __init__(self, data, mime_type):
+        self.data = data
+        self.type = mime_type
+        self.size = len(data)
+
+    def getvalue(self):
+        return self.data
+
+
+# --- MEASUREMENT ---
+def run_timed(fn, iterations, workers=1):
+    """Jalankan fn(i) sebanyak `iterations` kali. Return (durasi per panggilan, wall time, jumlah error)."""
+    durations = []
+    errors = 0
+
+    def one(i):
+        start = time.perf_counter()
+        try:
+            fn(i)
+            return time.perf_counter() - start, None
+        except Exception as e:
+            return time.perf_counter() - start, e
+
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for duration, error in executor.map(one, range(iterations)):
+            if error is None:
+                durations.append(duration)
+            else:
+                errors += 1
+    return durations, time.perf_counter() - wall_start, errors
+
+
+def summarize(durations, wall, errors):
+    ms = [d * 1000 for d in durations]
+    return {
+        "n": len(durations),
+        "errors": errors,
+        "throughput": round(len(durations) / wall, 2) if wall else 0.0,
+        "p50": round(percentile(ms, 50) or 0, 2),
+        "p95": round(percentile(ms, 95) or 0, 2),
+        "p99": round(percentile(ms, 99) or 0, 2),
+    }
+
+
+# --- BENCHMARKS ---
+def require(module):
+    # Paket opsional yang baru di-import jauh di dalam pipeline: cek di depan, supaya benchmark-nya
+    # dilewati (ImportError) alih-alih tiap iterasi tercatat error
+    importlib.import_module(module)
+
+
+def scrape_or_fail(url, use_cache=True):
+    from scraper import scrape_content
+    text = scrape_content(url, use_cache=use_cache)
+    if text.startswith("Gagal scraping"):
+        raise RuntimeError(text)
+    return text
+
+
+def bench_scrape(config, base_url, iterations):
+    require("requests")
+    from scraper import scrape_content
+    pages = 8
+    for i in range(pages):
+        config.pages[f"/pages/competitor-{i}.html"] = competitor_page(i)
+    urls = [f"{base_url}/pages/competitor-{i}.html" for i in range(pages)]
+
+    results = {}
+    results["scrape_cold"] = summarize(*run_timed(lambda i: scrape_or_fail(urls[i % pages], use_cache=False), iterations))
+    for url in urls:
+        scrape_content(url)
+    results["scrape_cached"] = summarize(*run_timed(lambda i: scrape_or_fail(urls[i % pages]), iterations))
+    return results
+
+
+def bench_read_file(iterations):
+    from documents import parse_document, read_file_content, MIME_PDF, MIME_DOCX, EBOOK_CHAR_BUDGET
+    results = {}
+    files = {"pdf": (ebook_pdf(), MIME_PDF), "docx": (ebook_docx(), MIME_DOCX)}
+    for label, (data, mime_type) in files.items():
+        if data is None:
+            print(f"  (lewati read_file_{label}: python-docx tidak terpasang)")
+            continue
+        try:
+            parse_document(data, mime_type, EBOOK_CHAR_BUDGET)
+        except ImportError as e:
+            print(f"  (lewati read_file_{label}: {e})")
+            continue
+        results[f"read_file_{label}_cold"] = summarize(*run_timed(
+            lambda i: parse_document(data, mime_type, EBOOK_CHAR_BUDGET), iterations))
+        upload = Upload(data, mime_type)
+        results[f"read_file_{label}_cached"] = summarize(*run_timed(
+            lambda i: read_file_content(upload), iterations))
+    return results
+
+
+def bench_parse(iterations):
+    from response_parser import decode_landing_response
+    results = {}
+    for label, text in sample_responses().items():
+        results[f"parse_{label}"] = summarize(*run_timed(lambda i: decode_landing_response(text), iterations))
+    return results
+
+
+def bench_optimize(iterations):
+    from html_optimizer import optimize_html
+    html = json.loads(sample_responses()["valid"])["html_code"]
+    return {"optimize_html": summarize(*run_timed(lambda i: optimize_html(html), iterations))}
+
+
+def bench_rotation(iterations, workers):
+    require("google.generativeai")
+    from generator import generate_content_with_rotation
+    prompt = "Buat landing page untuk produk benchmark. " * 200
+    return {"rotation": summarize(*run_timed(
+        lambda i: generate_content_with_rotation(prompt, BENCH_KEYS).text, iterations, workers))}
+
+
+def bench_stream(iterations, workers):
+    require("google.generativeai")
+    from generator import stream_content_with_rotation
+    prompt = "Buat landing page untuk produk benchmark. " * 200
+    first_chunk = []
+
+    def stream_once(i):
+        start = time.perf_counter()
+        for n, _ in enumerate(stream_content_with_rotation(prompt, BENCH_KEYS)):
+            if n == 0:
+                first_chunk.append(time.perf_counter() - start)
+
+    results = {"stream": summarize(*run_timed(stream_once, iterations, workers))}
+    results["stream_first_chunk"] = summarize(first_chunk, sum(first_chunk) or 1, 0)
+    return results
+
+
+# --- REPORT ---
+def print_report(results, baseline=None):
+    header = f"{'benchmark':<26}{'n':>5}{'err':>5}{'ops/s':>10}{'p50 ms':>11}{'p95 ms':>11}{'p99 ms':>11}"
+    print(header)
+    print("-" * len(header))
+    for name, row in results.items():
+        print(f"{name:<26}{row['n']:>5}{row['errors']:>5}{row['throughput']:>10}{row['p50']:>11}{row['p95']:>11}{row['p99']:>11}")
+        base = (baseline or {}).get(name)
+        if base:
+            deltas = []
+            for field in ("throughput", "p50", "p95", "p99"):
+                if base[field]:
+                    deltas.append(f"{field} {(row[field] - base[field]) / base[field] * 100:+.1f}%")
+            print(f"{'  vs baseline':<26}{', '.join(deltas)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark offline pipeline landing page (Gemini di-mock).")
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--workers", type=int, default=4, help="Request paralel untuk benchmark rotation/stream")
+    parser.add_argument("--latency", type=float, default=0.3, help="Latency mock Gemini (detik)")
+    parser.add_argument("--only", action="append", choices=BENCHMARKS, help="Jalankan benchmark tertentu saja")
+    parser.add_argument("--out", help="Simpan hasil ke file JSON (untuk baseline berikutnya)")
+    parser.add_argument("--baseline", help="File JSON hasil run sebelumnya untuk dibandingkan")
+    parser.add_argument("--save-fixtures", help="Tulis fixture (HTML kompetitor, PDF, DOCX) ke folder ini")
+    args = parser.parse_args()
+
+    config = MockConfig(latency=args.latency, jitter=args.latency / 4, slow_keys=SLOW_KEYS,
+                        rate_limited_keys=RATE_LIMITED_KEYS, leaked_keys=LEAKED_KEYS)
+    server, base_url = start_mock_server(config)
+
+    # Client Gemini membaca endpoint ini saat dibuat (key_pool.client_kwargs)
+    os.environ["GEMINI_API_ENDPOINT"] = base_url
+    sys.path.insert(0, REPO_DIR)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+    out_path = os.path.abspath(args.out) if args.out else None
+    fixtures_dir = os.path.abspath(args.save_fixtures) if args.save_fixtures else None
+
+    selected = args.only or BENCHMARKS
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="lp-bench-") as workdir:
+        os.chdir(workdir)
+        if fixtures_dir:
+            os.makedirs(fixtures_dir, exist_ok=True)
+            with open(os.path.join(fixtures_dir, "competitor-0.html"), "w", encoding="utf-8") as f:
+                f.write(competitor_page(0))
+            with open(os.path.join(fixtures_dir, "ebook.pdf"), "wb") as f:
+                f.write(ebook_pdf())
+            docx_bytes = ebook_docx()
+            if docx_bytes:
+                with open(os.path.join(fixtures_dir, "ebook.docx"), "wb") as f:
+                    f.write(docx_bytes)
+
+        for name in selected:
+            print(f"▶ {name} ...")
+            try:
+                if name == "scrape":
+                    results.update(bench_scrape(config, base_url, args.iterations))
+                elif name == "read_file":
+                    results.update(bench_read_file(args.iterations))
+                elif name == "parse":
+                    results.update(bench_parse(args.iterations * 10))
+                elif name == "optimize":
+                    results.update(bench_optimize(args.iterations * 10))
+                elif name == "rotation":
+                    results.update(bench_rotation(args.iterations, args.workers))
+                elif name == "stream":
+                    results.update(bench_stream(args.iterations, args.workers))
+            except ImportError as e:
+                print(f"  (lewati {name}: {e})")
+        os.chdir(REPO_DIR)
+    server.shutdown()
+
+    print()
+    print_report(results, baseline)
+    calls = {}
+    for (key, status), count in config.calls.items():
+        calls[f"{key}:{status}"] = count
+    if calls:
+        print("\nRequest ke mock per key:status ->", json.dumps(calls, sort_keys=True))
+
+    if out_path:
+        with open(out_path, "w", encoding="utf-8") as f:
+            json.dump({"created": time.time(), "args": vars(args), "results": results, "mock_calls": calls}, f, indent=2)
+        print(f"Hasil disimpan ke {out_path}")
+
+    # Exit code bukan 0 kalau ada panggilan yang gagal, supaya bisa dipakai sebagai cek di CI
+    failed = sorted(name for name, result in results.items() if result["errors"])
+    if failed:
+        print(f"❌ Ada error di: {', '.join(failed)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,133 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+# --- COMPETITOR STORE ---
+# Riwayat link kompetitor di SQLite, menggantikan competitor_history.json yang dibaca &
+# ditulis ulang utuh tiap rerun (dua sesi bersamaan bisa saling menimpa). Tiap URL satu
+# baris dengan metadata: kapan terakhir dipakai / di-scrape, berapa kali dipakai, dan
+# ukuran teks hasil scrape. URL & host diindeks supaya pencarian awalan tetap cepat
+# walau riwayatnya ribuan.
+
+HISTORY_DB = "competitor_history.db"
+LEGACY_HISTORY_FILE = "competitor_history.json"
+SEARCH_LIMIT = 200
+
+
+def url_host(url):
+    # "https://www.toko.com/promo" -> "toko.com/promo", supaya cari "toko" langsung ketemu
+    rest = url.split("://", 1)[-1].lower()
+    return rest[4:] if rest.startswith("www.") else rest
+
+
+def prefix_upper_bound(prefix):
+    # Semua string yang diawali `prefix` ada di rentang [prefix, upper); range scan
+    # ini pakai index, beda dengan LIKE 'prefix%' yang case-insensitive
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+class CompetitorStore:
+    def __init__(self, path=HISTORY_DB, legacy_file=LEGACY_HISTORY_FILE):
+        self.path = path
+        self.lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS competitors (
+                    url TEXT PRIMARY KEY,
+                    host TEXT NOT NULL,
+                    added_at REAL NOT NULL,
+                    last_used REAL NOT NULL,
+                    last_scraped REAL,
+                    hit_count INTEGER NOT NULL DEFAULT 0,
+                    text_size INTEGER
+                )"""
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_competitors_host ON competitors(host)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_competitors_used ON competitors(last_used)")
+        self._import_legacy(legacy_file)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _import_legacy(self, legacy_file):
+        # Sekali saja: pindahkan isi competitor_history.json lama kalau tabel masih kosong
+        if not legacy_file or not os.path.exists(legacy_file):
+            return
+        with self.lock, self._connect() as conn:
+            if conn.execute("SELECT 1 FROM competitors LIMIT 1").fetchone():
+                return
+            try:
+                with open(legacy_file, "r") as f:
+                    urls = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                return
+            now = time.time()
+            # Urutan lama = urutan ditambahkan; jaga supaya yang terakhir tetap paling baru
+            conn.executemany(
+                "INSERT OR IGNORE INTO competitors (url, host, added_at, last_used) VALUES (?, ?, ?, ?)",
+                [(u, url_host(u), now + i * 1e-3, now + i * 1e-3)
+                 for i, u in enumerate(urls) if isinstance(u, str) and u.strip()],
+            )
+
+    def add(self, urls):
+        """Catat URL yang dipakai untuk generate: URL baru disimpan, yang lama hit_count-nya naik."""
+        now = time.time()
+        rows = [(u, url_host(u), now, now) for u in dict.fromkeys(urls) if u]
+        if not rows:
+            return
+        with self.lock, self._connect() as conn:
+            conn.executemany(
+                """INSERT INTO competitors (url, host, added_at, last_used, hit_count) VALUES (?, ?, ?, ?, 1)
+                   ON CONFLICT(url) DO UPDATE SET last_used = excluded.last_used, hit_count = hit_count + 1""",
+                rows,
+            )
+
+    def record_scrape(self, url, text_size):
+        with self.lock, self._connect() as conn:
+            conn.execute(
+                "UPDATE competitors SET last_scraped = ?, text_size = ? WHERE url = ?",
+                (time.time(), text_size, url),
+            )
+
+    def search(self, prefix="", limit=SEARCH_LIMIT):
+        """URL yang diawali `prefix` (URL lengkap atau nama domain), terbaru dipakai dulu."""
+        prefix = prefix.strip()
+        with self.lock, self._connect() as conn:
+            if not prefix:
+                rows = conn.execute(
+                    "SELECT url FROM competitors ORDER BY last_used DESC LIMIT ?", (limit,)
+                ).fetchall()
+            else:
+                host_prefix = url_host(prefix)
+                rows = conn.execute(
+                    """SELECT url FROM competitors
+                       WHERE (url >= ? AND url < ?) OR (host >= ? AND host < ?)
+                       ORDER BY last_used DESC LIMIT ?""",
+                    (prefix, prefix_upper_bound(prefix), host_prefix, prefix_upper_bound(host_prefix), limit),
+                ).fetchall()
+        return [row[0] for row in rows]
+
+    def get(self, url):
+        with self.lock, self._connect() as conn:
+            row = conn.execute(
+                "SELECT url, added_at, last_used, last_scraped, hit_count, text_size FROM competitors WHERE url = ?",
+                (url,),
+            ).fetchone()
+        if row is None:
+            return None
+        keys = ("url", "added_at", "last_used", "last_scraped", "hit_count", "text_size")
+        return dict(zip(keys, row))
+
+    def count(self):
+        with self.lock, self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM competitors").fetchone()[0]
@@ -0,0 +1,156 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+# --- DISK CACHE ---
+# Cache sederhana berbasis SQLite: key -> value (teks), dengan TTL dan
+# eviction LRU berdasarkan total ukuran. Dipakai bersama oleh semua cache di app.
+
+CACHE_DIR = "cache"
+
+
+def content_hash(*parts):
+    h = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode("utf-8")
+        h.update(part)
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+def normalize_prompt(prompt):
+    # Prompt dibangun dari f-string berindentasi; indentasi & spasi di ujung baris
+    # tidak mengubah makna, jadi jangan sampai bikin cache miss
+    lines = [line.strip() for line in prompt.strip().splitlines()]
+    return "\n".join(lines)
+
+
+class DiskCache:
+    def __init__(self, name, ttl=24 * 3600, max_bytes=200 * 1024 * 1024, cache_dir=CACHE_DIR, keep_stale=False):
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, f"{name}.db")
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        # keep_stale=True: entry kadaluarsa tidak dihapus (hanya dibuang lewat LRU ukuran),
+        # supaya masih bisa direvalidasi (ETag / Last-Modified) lewat get_stale()
+        self.keep_stale = keep_stale
+        self.lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS entries (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )"""
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_access ON entries(last_access)")
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, key):
+        now = time.time()
+        with self.lock, self._connect() as conn:
+            row = conn.execute("SELECT value, created_at FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            value, created_at = row
+            if self.ttl and now - created_at > self.ttl:
+                if not self.keep_stale:
+                    conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                return None
+            conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (now, key))
+            return value
+
+    def set(self, key, value):
+        now = time.time()
+        size = len(value.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        with self.lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, created_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, value, size, now, now),
+            )
+            self._evict(conn, now)
+
+    def get_stale(self, key):
+        # Ambil value walaupun TTL sudah lewat (untuk revalidasi)
+        with self.lock, self._connect() as conn:
+            row = conn.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key))
+            return row[0]
+
+    def touch(self, key):
+        # Entry masih valid (mis. server balas 304), hitung ulang umurnya dari sekarang
+        now = time.time()
+        with self.lock, self._connect() as conn:
+            conn.execute("UPDATE entries SET created_at = ?, last_access = ? WHERE key = ?", (now, now, key))
+
+    def delete(self, key):
+        with self.lock, self._connect() as conn:
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def _evict(self, conn, now):
+        if self.ttl and not self.keep_stale:
+            conn.execute("DELETE FROM entries WHERE created_at < ?", (now - self.ttl,))
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # Buang yang paling lama tidak diakses sampai total ukuran di bawah batas
+        rows = conn.execute("SELECT key, size FROM entries ORDER BY last_access ASC").fetchall()
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            total -= size
+
+    def stats(self):
+        with self.lock, self._connect() as conn:
+            count, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        return {"entries": count, "bytes": total}
+
+
+class MemoryLRU:
+    # LRU kecil di memori (per proses) di depan DiskCache, dibatasi jumlah & ukuran total
+    def __init__(self, max_items=64, max_size=50 * 1000 * 1000):
+        self.max_items = max_items
+        self.max_size = max_size
+        self.items = OrderedDict()
+        self.total = 0
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            if key not in self.items:
+                return None
+            self.items.move_to_end(key)
+            return self.items[key][0]
+
+    def set(self, key, value, size=1):
+        with self.lock:
+            if key in self.items:
+                self.total -= self.items.pop(key)[1]
+            if size > self.max_size:
+                return
+            self.items[key] = (value, size)
+            self.total += size
+            while len(self.items) > self.max_items or self.total > self.max_size:
+                _, (_, old_size) = self.items.popitem(last=False)
+                self.total -= old_size
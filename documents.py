@@ -0,0 +1,171 @@
+import io
+import json
+import multiprocessing
+import threading
+
+from disk_cache import DiskCache, MemoryLRU, content_hash
+
+# --- DOCUMENTS ---
+# Membaca teks dari ebook / materi produk yang di-upload (PDF, DOCX, TXT).
+# Teks dibaca per halaman / per paragraf dan berhenti begitu batas karakter
+# terpenuhi, jadi ebook 400 halaman tidak perlu diparse semua.
+
+EBOOK_CHAR_BUDGET = 15000
+PROCESS_THRESHOLD = 2 * 1024 * 1024   # file lebih besar dari ini diparse di proses terpisah
+PROCESS_TIMEOUT = 120
+PROCESS_WORKERS = 2                   # maksimal parse paralel di proses terpisah
+
+MIME_PDF = "application/pdf"
+MIME_DOCX = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+MIME_TXT = "text/plain"
+
+_process_slots = threading.BoundedSemaphore(PROCESS_WORKERS)
+
+# Hasil parse di-cache per SHA-256 isi file: tiap rerun Streamlit (ganti tone, bonus, dll)
+# tidak perlu parse ulang PDF yang sama
+_parsed_memory = MemoryLRU(max_items=32, max_size=40 * 1000 * 1000)
+upload_cache = DiskCache("uploads", ttl=7 * 24 * 3600, max_bytes=200 * 1024 * 1024)
+
+
+class UnsupportedFormat(ValueError):
+    pass
+
+
+class DocumentTimeout(TimeoutError):
+    pass
+
+
+class WorkerDied(RuntimeError):
+    pass
+
+
+def iter_document_text(data, mime_type):
+    """Yield potongan teks (per halaman PDF / per paragraf DOCX) secara berurutan."""
+    if mime_type == MIME_PDF:
+        import PyPDF2
+        pdf_reader = PyPDF2.PdfReader(io.BytesIO(data))
+        for page in pdf_reader.pages:
+            yield page.extract_text() or ""
+    elif mime_type == MIME_DOCX:
+        import docx
+        doc = docx.Document(io.BytesIO(data))
+        for paragraph in doc.paragraphs:
+            yield paragraph.text + "\n"
+    elif mime_type == MIME_TXT:
+        yield data.decode("utf-8")
+    else:
+        raise UnsupportedFormat("Format file tidak didukung.")
+
+
+def parse_document(data, mime_type, budget=EBOOK_CHAR_BUDGET):
+    """Parse sampai budget terpenuhi. Return dict teks + index awal tiap halaman/paragraf."""
+    parts = []
+    pages = []
+    size = 0
+    complete = True
+    for text in iter_document_text(data, mime_type):
+        pages.append(size)
+        parts.append(text)
+        size += len(text)
+        if budget and size >= budget:
+            complete = False
+            break
+    return {"text": "".join(parts), "pages": pages, "complete": complete, "budget": budget}
+
+
+def read_document(data, mime_type, budget=EBOOK_CHAR_BUDGET):
+    text = parse_document(data, mime_type, budget)["text"]
+    return text[:budget] if budget else text
+
+
+def _process_main(conn, fn, args):
+    try:
+        result = ("ok", fn(*args))
+    except Exception as e:
+        result = ("error", e)
+    try:
+        conn.send(result)
+    except Exception as e:
+        # Hasil / exception yang tidak bisa di-pickle
+        conn.send(("error", RuntimeError(f"Hasil parse tidak bisa dikirim: {e}")))
+    finally:
+        conn.close()
+
+
+def run_in_process(fn, *args, timeout=PROCESS_TIMEOUT):
+    """Jalankan fn(*args) di proses sendiri. Lewat timeout prosesnya di-terminate (bukan dibiarkan
+    jalan seperti worker pool), lalu DocumentTimeout. WorkerDied kalau prosesnya mati duluan."""
+    # spawn: jangan fork proses Streamlit yang punya banyak thread
+    context = multiprocessing.get_context("spawn")
+    with _process_slots:
+        receiver, sender = context.Pipe(duplex=False)
+        process = context.Process(target=_process_main, args=(sender, fn, args), daemon=True)
+        process.start()
+        sender.close()
+        try:
+            if not receiver.poll(timeout):
+                raise DocumentTimeout(f"File terlalu lama dibaca (lebih dari {timeout} detik).")
+            status, value = receiver.recv()
+        except EOFError:
+            raise WorkerDied("Proses parser berhenti sebelum selesai.") from None
+        finally:
+            receiver.close()
+            if process.is_alive():
+                process.terminate()
+            process.join(5)
+    if status == "error":
+        raise value
+    return value
+
+
+def covers(entry, budget):
+    # Hasil parse lama cukup kalau dokumennya sudah terbaca habis atau budget-nya lebih besar
+    return entry["complete"] or (budget and entry["budget"] and entry["budget"] >= budget)
+
+
+def get_parsed(data, mime_type, budget=EBOOK_CHAR_BUDGET):
+    """Parse dokumen dengan cache per hash isi file (memori dulu, lalu disk)."""
+    key = content_hash(data, mime_type)
+
+    entry = _parsed_memory.get(key)
+    if entry is None:
+        stored = upload_cache.get(key)
+        entry = json.loads(stored) if stored else None
+    if entry is not None and covers(entry, budget):
+        _parsed_memory.set(key, entry, size=len(entry["text"]))
+        return entry
+
+    entry = None
+    # File besar diparse di proses terpisah, supaya parsing PDF tidak memegang GIL
+    # dan tidak membuat sesi lain ikut tersendat. Timeout tidak diparse ulang di sini (sama lamanya).
+    if len(data) > PROCESS_THRESHOLD:
+        try:
+            entry = run_in_process(parse_document, data, mime_type, budget)
+        except WorkerDied as e:
+            # Mis. kehabisan memori: coba sekali lagi di thread ini
+            print(f"[DOCUMENTS] {e}")
+    if entry is None:
+        entry = parse_document(data, mime_type, budget)
+
+    _parsed_memory.set(key, entry, size=len(entry["text"]))
+    upload_cache.set(key, json.dumps(entry))
+    return entry
+
+
+def read_document_bytes(data, mime_type, budget=EBOOK_CHAR_BUDGET):
+    text = get_parsed(data, mime_type, budget)["text"]
+    return text[:budget] if budget else text
+
+
+def get_page_index(data, mime_type, budget=EBOOK_CHAR_BUDGET):
+    # Offset karakter awal tiap halaman (PDF) / paragraf (DOCX) di dalam teks hasil parse
+    return get_parsed(data, mime_type, budget)["pages"]
+
+
+def read_file_content(uploaded_file, budget=EBOOK_CHAR_BUDGET):
+    try:
+        return read_document_bytes(uploaded_file.getvalue(), uploaded_file.type, budget)
+    except (UnsupportedFormat, DocumentTimeout) as e:
+        return str(e)
+    except Exception as e:
+        return f"Gagal membaca file: {e}"
@@ -0,0 +1,195 @@
+import difflib
+import gzip
+import json
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from disk_cache import MemoryLRU, content_hash
+
+# --- GENERATION STORE ---
+# Semua hasil generate disimpan ke disk: input form, HTML, copywriting, timing, dan
+# model/key yang dipakai. Session state cukup menyimpan id-nya, jadi refresh browser tidak
+# menghilangkan hasil dan memori server tidak membengkak per sesi.
+#
+# Isi besar (HTML, copywriting) disimpan sekali per hash isinya (generate ulang dengan
+# hasil sama tidak menambah ukuran) dan dikompres zstd kalau paketnya ada, selain itu gzip.
+
+HISTORY_DB = "generation_history.db"
+PAGE_SIZE = 10
+
+try:
+    import zstandard
+    DEFAULT_CODEC = "zstd"
+except ImportError:
+    zstandard = None
+    DEFAULT_CODEC = "gzip"
+
+
+def compress(data, codec=DEFAULT_CODEC):
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=10).compress(data)
+    return gzip.compress(data, compresslevel=6)
+
+
+def decompress(data, codec):
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("Riwayat ini dikompres zstd, install paket zstandard untuk membukanya.")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+class GenerationStore:
+    def __init__(self, path=HISTORY_DB):
+        self.path = path
+        self.lock = threading.Lock()
+        # Hasil yang baru dibuka / disimpan tetap di memori, reload tanpa dekompresi
+        self.memory = MemoryLRU(max_items=32, max_size=20 * 1000 * 1000)
+        with self._connect() as conn:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS blobs (
+                    hash TEXT PRIMARY KEY,
+                    codec TEXT NOT NULL,
+                    data BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    stored_size INTEGER NOT NULL
+                )"""
+            )
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS generations (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    created_at REAL NOT NULL,
+                    product_name TEXT NOT NULL,
+                    mode TEXT NOT NULL,
+                    inputs TEXT NOT NULL,
+                    html_hash TEXT NOT NULL,
+                    copy_hash TEXT NOT NULL,
+                    parse_ok INTEGER NOT NULL,
+                    model TEXT,
+                    key_id TEXT,
+                    trace TEXT
+                )"""
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_generations_created ON generations(created_at)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_generations_product ON generations(product_name)")
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    # --- BLOBS ---
+    def _put_blob(self, conn, text):
+        raw = text.encode("utf-8")
+        digest = content_hash(raw)
+        if conn.execute("SELECT 1 FROM blobs WHERE hash = ?", (digest,)).fetchone() is None:
+            packed = compress(raw)
+            conn.execute(
+                "INSERT OR IGNORE INTO blobs (hash, codec, data, size, stored_size) VALUES (?, ?, ?, ?, ?)",
+                (digest, DEFAULT_CODEC, packed, len(raw), len(packed)),
+            )
+        self.memory.set(digest, text, size=len(raw))
+        return digest
+
+    def _get_blob(self, conn, digest):
+        text = self.memory.get(digest)
+        if text is not None:
+            return text
+        row = conn.execute("SELECT codec, data FROM blobs WHERE hash = ?", (digest,)).fetchone()
+        if row is None:
+            return None
+        text = decompress(row[1], row[0]).decode("utf-8")
+        self.memory.set(digest, text, size=len(text))
+        return text
+
+    # --- GENERATIONS ---
+    def save(self, inputs, html, copy_sections, mode, parse_ok=True):
+        """Simpan satu hasil generate. Return id-nya."""
+        with self.lock, self._connect() as conn:
+            html_hash = self._put_blob(conn, html or "")
+            copy_hash = self._put_blob(conn, json.dumps(copy_sections or {}, ensure_ascii=False, sort_keys=True))
+            cursor = conn.execute(
+                """INSERT INTO generations (created_at, product_name, mode, inputs, html_hash, copy_hash, parse_ok)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                (time.time(), inputs.get("product_name", ""), mode,
+                 json.dumps(inputs, ensure_ascii=False), html_hash, copy_hash, int(parse_ok)),
+            )
+            return cursor.lastrowid
+
+    def attach_trace(self, generation_id, trace):
+        # Trace baru selesai setelah preview dirender, jadi disimpan belakangan
+        model = key = None
+        for entry in trace.get("stages", []):
+            if "model" in entry:
+                model, key = entry["model"], entry.get("key")
+        with self.lock, self._connect() as conn:
+            conn.execute(
+                "UPDATE generations SET trace = ?, model = ?, key_id = ? WHERE id = ?",
+                (json.dumps(trace, ensure_ascii=False), model, key, generation_id),
+            )
+
+    def load(self, generation_id):
+        with self.lock, self._connect() as conn:
+            row = conn.execute(
+                """SELECT id, created_at, product_name, mode, inputs, html_hash, copy_hash, parse_ok, model, key_id, trace
+                   FROM generations WHERE id = ?""",
+                (generation_id,),
+            ).fetchone()
+            if row is None:
+                return None
+            html = self._get_blob(conn, row[5])
+            copy_sections = json.loads(self._get_blob(conn, row[6]) or "{}")
+        return {
+            "id": row[0], "created_at": row[1], "product_name": row[2], "mode": row[3],
+            "inputs": json.loads(row[4]), "html": html, "copy_sections": copy_sections,
+            "parse_ok": bool(row[7]), "model": row[8], "key_id": row[9],
+            "trace": json.loads(row[10]) if row[10] else None,
+        }
+
+    def page(self, page=0, page_size=PAGE_SIZE, product_name=None):
+        """Daftar ringkas (tanpa isi HTML) untuk satu halaman riwayat, terbaru dulu."""
+        query = """SELECT g.id, g.created_at, g.product_name, g.mode, g.parse_ok, g.model, b.size
+                   FROM generations g JOIN blobs b ON b.hash = g.html_hash"""
+        params = []
+        if product_name:
+            query += " WHERE g.product_name = ?"
+            params.append(product_name)
+        query += " ORDER BY g.id DESC LIMIT ? OFFSET ?"
+        params += [page_size, page * page_size]
+        with self.lock, self._connect() as conn:
+            rows = conn.execute(query, params).fetchall()
+        keys = ("id", "created_at", "product_name", "mode", "parse_ok", "model", "html_size")
+        return [dict(zip(keys, row)) for row in rows]
+
+    def count(self, product_name=None):
+        with self.lock, self._connect() as conn:
+            if product_name:
+                return conn.execute("SELECT COUNT(*) FROM generations WHERE product_name = ?", (product_name,)).fetchone()[0]
+            return conn.execute("SELECT COUNT(*) FROM generations").fetchone()[0]
+
+    def diff(self, old_id, new_id, context=3):
+        """Unified diff HTML antara dua versi (per baris, tag dipecah supaya diff-nya terbaca)."""
+        old, new = self.load(old_id), self.load(new_id)
+        if old is None or new is None:
+            return ""
+
+        def lines(html):
+            return html.replace("><", ">\n<").splitlines()
+
+        return "\n".join(difflib.unified_diff(
+            lines(old["html"]), lines(new["html"]),
+            fromfile=f"#{old_id} {old['product_name']}", tofile=f"#{new_id} {new['product_name']}",
+            n=context, lineterm="",
+        ))
+
+    def stats(self):
+        with self.lock, self._connect() as conn:
+            size, stored = conn.execute("SELECT COALESCE(SUM(size), 0), COALESCE(SUM(stored_size), 0) FROM blobs").fetchone()
+        return {"generations": self.count(), "bytes": size, "stored_bytes": stored}
@@ -0,0 +1,852 @@
+import math
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+from key_pool import KeyPool, key_id, client_kwargs, is_rate_limit_error, is_leaked_key_error
+from disk_cache import DiskCache, content_hash, normalize_prompt
+from router import ModelRouter
+from scheduler import QuotaScheduler, QuotaExhausted, MAX_WAIT, PRIORITY_INTERACTIVE, current_priority, estimate_tokens
+from singleflight import SingleFlight
+from tracing import annotate, usage_fields
+from response_parser import decode_landing_response, decode_json_response
+from page_templates import render_landing_page, normalize_content
+from sections import SECTION_LABELS, get_section, replace_section, clean_section_output
+
+# --- GENERATOR ---
+# Logika generate yang dipakai bersama oleh app.py (Streamlit) dan batch_generate.py (CLI):
+# rotasi key, cache response, prompt landing page, dan parsing output JSON.
+
+PRIMARY_MODEL = 'gemini-2.0-flash'
+FALLBACK_MODEL = 'gemini-flash-latest'
+
+# Satu pool & satu cache untuk seluruh proses (semua sesi Streamlit / semua worker batch)
+key_pool = KeyPool()
+response_cache = DiskCache("responses", ttl=24 * 3600, max_bytes=200 * 1024 * 1024)
+router = ModelRouter([PRIMARY_MODEL, FALLBACK_MODEL])
+# Jatah RPM/TPM per key dibagi rata antar sesi lewat antrian ini (lihat scheduler.py)
+scheduler = QuotaScheduler(key_pool)
+# Prompt identik yang sedang di-generate cukup satu panggilan ke Gemini (lihat singleflight.py)
+inflight = SingleFlight()
+REQUEST_TIMEOUT = 300       # detik, batas satu panggilan Gemini (termasuk streaming)
+
+# Panggilan ke Gemini jalan di thread sendiri supaya bisa di-hedge; thread yang kalah
+# cepat dibiarkan selesai di belakang (hasilnya tetap masuk statistik router)
+_call_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="gemini-call")
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(key):
+    # genai.configure() mengubah state global, tidak aman kalau beberapa thread
+    # generate bersamaan dengan key berbeda. Jadi tiap key punya client sendiri.
+    with _clients_lock:
+        if key not in _clients:
+            from google.ai import generativelanguage as glm
+            _clients[key] = glm.GenerativeServiceClient(**client_kwargs(key))
+        return _clients[key]
+
+
+def build_request(model_name, prompt, system_instruction=None):
+    from google.ai import generativelanguage as glm
+
+    request = {"model": f"models/{model_name}", "contents": [{"role": "user", "parts": [{"text": prompt}]}]}
+    if system_instruction:
+        request["system_instruction"] = {"parts": [{"text": system_instruction}]}
+    return glm.GenerateContentRequest(request)
+
+
+def send_request(model_name, key, prompt, system_instruction=None, stream=False):
+    # Dikirim lewat client milik key ini (bukan GenerativeModel yang memakai client global
+    # genai.configure); respons dibungkus tipe SDK supaya .text / usage_metadata tetap sama
+    from google.generativeai.types import GenerateContentResponse
+
+    request = build_request(model_name, prompt, system_instruction)
+    if stream:
+        return GenerateContentResponse.from_iterator(get_client(key).stream_generate_content(request, timeout=REQUEST_TIMEOUT))
+    return GenerateContentResponse.from_response(get_client(key).generate_content(request, timeout=REQUEST_TIMEOUT))
+
+
+def parse_price(price_str):
+    try:
+        price_str = price_str.lower().replace(" ", "").replace("rp", "").replace(".", "").replace(",", "")
+        multiplier = 1
+        if "ribu" in price_str or "rb" in price_str:
+            multiplier = 1000
+            price_str = price_str.replace("ribu", "").replace("rb", "")
+        elif "juta" in price_str or "jt" in price_str:
+            multiplier = 1000000
+            price_str = price_str.replace("juta", "").replace("jt", "")
+
+        # Extract digits
+        digits = re.sub(r'\D', '', price_str)
+        if not digits: return 0
+        return int(digits) * multiplier
+    except:
+        return 0
+
+def calculate_discount(original_price_str, selling_price_str):
+    try:
+        original = parse_price(original_price_str)
+        selling = parse_price(selling_price_str)
+
+        if original > selling and original > 0:
+            discount = int(((original - selling) / original) * 100)
+            return f"HEMAT {discount}% HARI INI"
+        else:
+            return "HEMAT HARI INI"
+    except Exception:
+        return "PENAWARAN SPESIAL"
+
+
+# --- ROTATION GENERATOR ---
+def used_tokens(usage):
+    return usage.get("prompt_token_count", 0) + usage.get("candidates_token_count", 0)
+
+def reserve_route(routes, tokens, block=False):
+    """Pilih rute pertama yang key-nya masih punya jatah RPM/TPM. Return (rute, tiket).
+
+    block=True: kalau semua habis, antri di scheduler sampai salah satu key dapat giliran.
+    Tanpa block, return None.
+    """
+    for route in routes:
+        ticket = scheduler.try_acquire(route[0], tokens)
+        if ticket is not None:
+            return route, ticket
+    if not block:
+        return None
+    key, ticket = scheduler.acquire(dict.fromkeys(key for key, _ in routes), tokens)
+    return next(route for route in routes if route[0] == key), ticket
+
+def timed_call(key, model_name, prompt, system_instruction=None, ticket=None):
+    # Satu percobaan di satu rute; hasilnya dicatat ke router & key pool,
+    # termasuk percobaan hedge yang kalah cepat
+    started = time.time()
+    try:
+        response = send_request(model_name, key, prompt, system_instruction)
+        response.text  # respons yang diblokir safety baru error saat .text dibaca
+    except Exception as e:
+        router.record(key, model_name, time.time() - started, ok=False)
+        key_pool.mark_failure(key, e)
+        print(f"Key {key_id(key)} ({model_name}) failed: {e}")
+        raise
+    router.record(key, model_name, time.time() - started, ok=True)
+    key_pool.mark_success(key)
+    tokens = used_tokens(usage_fields(response))
+    if ticket is not None and tokens:
+        # Jatah TPM dihitung dari pemakaian asli, bukan perkiraan awal
+        scheduler.settle(ticket, tokens)
+    return response
+
+
+def generate_content_with_rotation(prompt, keys, system_instruction=None):
+    candidates = key_pool.candidates(keys, reserve=True)
+    if not candidates:
+        raise Exception("403 Semua API Key ditandai leaked/diblokir. Silakan buat API Key baru.")
+
+    routes = router.routes(candidates)
+    tokens = estimate_tokens(prompt, system_instruction)
+    pending = {}
+    dead_keys = set()
+    last_error = None
+    hedged = False
+
+    def launch(block=False):
+        # Rute berikutnya yang key-nya tidak sedang dipakai request ini, tidak kena 429/403,
+        # dan masih punya jatah kuota. Hedge tidak pernah menunggu kuota (block=False).
+        busy = {key for key, _ in pending.values()}
+        usable = [route for route in routes if route[0] not in dead_keys and route[0] not in busy]
+        reserved = reserve_route(usable, tokens, block=block) if usable else None
+        if reserved is None:
+            return False
+        (key, model_name), ticket = reserved
+        routes.remove((key, model_name))
+        key_pool.mark_used(key)
+        future = _call_executor.submit(timed_call, key, model_name, prompt, system_instruction, ticket)
+        pending[future] = (key, model_name)
+        return True
+
+    launch(block=True)
+    while pending:
+        timeout = None
+        if not hedged and len(pending) == 1:
+            timeout = router.hedge_delay(*next(iter(pending.values())))
+        done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+        if not done:
+            # Lewat p95 rute ini: kirim duplikat ke key lain, pakai yang duluan selesai
+            hedged = True
+            launch()
+            continue
+        for future in done:
+            key, model_name = pending.pop(future)
+            try:
+                response = future.result()
+            except Exception as e:
+                last_error = e
+                # 429/403 berlaku untuk key-nya, tidak perlu buang waktu coba model kedua
+                if is_rate_limit_error(e) or is_leaked_key_error(e):
+                    dead_keys.add(key)
+                continue
+            annotate(model=model_name, key=key_id(key), hedged=hedged, **usage_fields(response))
+            return response
+        if not pending:
+            launch(block=True)
+
+    # Semua rute gagal, atau tidak ada satu pun yang sempat dijalankan (last_error masih None)
+    raise last_error or QuotaExhausted(math.inf)
+
+def stream_content_with_rotation(prompt, keys, system_instruction=None):
+    # Sama seperti rotasi biasa, tapi hasilnya di-yield per chunk (tanpa hedging:
+    # chunk yang sudah tampil tidak bisa ditarik lagi). Ganti rute hanya bisa sebelum
+    # chunk pertama keluar.
+    last_error = None
+    candidates = key_pool.candidates(keys, reserve=True)
+    if not candidates:
+        raise Exception("403 Semua API Key ditandai leaked/diblokir. Silakan buat API Key baru.")
+
+    routes = router.routes(candidates)
+    tokens = estimate_tokens(prompt, system_instruction)
+    dead_keys = set()
+    while True:
+        usable = [route for route in routes if route[0] not in dead_keys]
+        if not usable:
+            break
+        (key, model_name), ticket = reserve_route(usable, tokens, block=True)
+        routes.remove((key, model_name))
+        key_pool.mark_used(key)
+        started = False
+        start_time = time.time()
+        usage = {}
+        try:
+            response = send_request(model_name, key, prompt, system_instruction, stream=True)
+            for chunk in response:
+                usage = usage_fields(chunk) or usage
+                try:
+                    text = chunk.text
+                except ValueError:
+                    # Chunk tanpa teks (mis. hanya metadata / safety rating)
+                    continue
+                if text:
+                    started = True
+                    yield text
+            router.record(key, model_name, time.time() - start_time, ok=True)
+            key_pool.mark_success(key)
+            if used_tokens(usage):
+                scheduler.settle(ticket, used_tokens(usage))
+            annotate(model=model_name, key=key_id(key), **usage)
+            return
+        except Exception as e:
+            router.record(key, model_name, time.time() - start_time, ok=False)
+            key_pool.mark_failure(key, e)
+            print(f"Key {key_id(key)} ({model_name}) failed: {e}")
+            if started:
+                raise
+            if is_rate_limit_error(e) or is_leaked_key_error(e):
+                dead_keys.add(key)
+            last_error = e
+            continue
+
+    raise last_error or QuotaExhausted(math.inf)
+
+
+# --- RESPONSE CACHE ---
+def flight_timeout():
+    # Follower menunggu selama leader boleh antri kuota + satu panggilan penuh
+    return MAX_WAIT.get(current_priority(), MAX_WAIT[PRIORITY_INTERACTIVE]) + REQUEST_TIMEOUT
+
+def prompt_cache_key(prompt, system_instruction=None):
+    if system_instruction:
+        return content_hash(normalize_prompt(system_instruction), normalize_prompt(prompt), PRIMARY_MODEL)
+    return content_hash(normalize_prompt(prompt), PRIMARY_MODEL)
+
+def generate_text(prompt, keys, force=False, system_instruction=None):
+    # Prompt yang sama (setelah dinormalisasi) + model yang sama = jawaban dari cache
+    cache_key = prompt_cache_key(prompt, system_instruction)
+    if not force:
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            annotate(cache_hit=True, bytes=len(cached.encode("utf-8")))
+            return cached
+
+    flight, leader = inflight.join(cache_key, timeout=flight_timeout())
+    if not leader:
+        text = flight.result()
+        annotate(cache_hit=False, coalesced=True, bytes=len(text.encode("utf-8")))
+        return text
+    try:
+        response = generate_content_with_rotation(prompt, keys, system_instruction)
+        text = response.text
+        response_cache.set(cache_key, text)
+        flight.publish(text)
+    except BaseException as e:
+        inflight.finish(cache_key, flight, e)
+        raise
+    inflight.finish(cache_key, flight)
+    annotate(cache_hit=False, bytes=len(text.encode("utf-8")))
+    return text
+
+def generate_text_stream(prompt, keys, force=False, system_instruction=None):
+    cache_key = prompt_cache_key(prompt, system_instruction)
+    if not force:
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            annotate(cache_hit=True, bytes=len(cached.encode("utf-8")))
+            yield cached
+            return
+
+    chunks = []
+    flight, leader = inflight.join(cache_key, timeout=flight_timeout())
+    if not leader:
+        # Ikut stream request identik yang sudah jalan, mulai dari chunk pertamanya
+        for text in flight.follow():
+            chunks.append(text)
+            yield text
+        annotate(cache_hit=False, coalesced=True, bytes=len("".join(chunks).encode("utf-8")))
+        return
+    try:
+        for text in stream_content_with_rotation(prompt, keys, system_instruction):
+            chunks.append(text)
+            flight.publish(text)
+            yield text
+        full_text = "".join(chunks)
+        response_cache.set(cache_key, full_text)
+    except BaseException as e:
+        # Termasuk GeneratorExit saat pemanggil berhenti membaca (mis. job dibatalkan)
+        inflight.finish(cache_key, flight, e)
+        raise
+    inflight.finish(cache_key, flight)
+    annotate(cache_hit=False, bytes=len(full_text.encode("utf-8")))
+
+
+# --- RESPONSE PARSING ---
+def parse_landing_response(text_response):
+    """Return (generated_html, copy_sections, error). error None kalau JSON valid / berhasil diperbaiki."""
+    generated_html, copy_sections, error, repaired = decode_landing_response(text_response)
+    if repaired:
+        print("JSON output tidak valid, berhasil diperbaiki otomatis")
+    return generated_html, copy_sections, error
+
+
+# --- PROMPT ENGINEERING ---
+# Bagian prompt yang SAMA untuk setiap generate (aturan desain, CSS wajib, format output).
+# Dikirim sebagai system instruction: awal request jadi sama persis di setiap generate, jadi
+# model yang mendukung implicit caching bisa memakai prefix ini dari cache (terlihat di
+# usage_metadata.cached_content_token_count). Explicit CachedContent tidak dipakai: instruksi
+# ini (~1.3k token) di bawah minimum 4096 token yang bisa dijadikan CachedContent.
+LANDING_SYSTEM_INSTRUCTION = """
+    Bertindaklah sebagai Expert Web Developer & UI/UX Designer kelas dunia yang biasa menangani klien "High-Ticket".
+    Tugasmu adalah membuat SATU FILE HTML LENGKAP (Single File) untuk Landing Page produk dengan standar desain PREMIUM.
+    
+    INSTRUKSI DESAIN (MINIMALIS, FRESH, MUDAH DIBACA):
+    
+    **PRIORITAS: CLEAN, SIMPLE, READABLE**
+    Desain minimalis modern yang nyaman dibaca di HP:
+    
+    1. **TYPOGRAPHY (CLEAN & READABLE)**:
+       - Headline (H1): text-2xl font-semibold (24px) - Clean & Bold
+       - Subheading (H2): text-xl font-medium (20px)
+       - Body text (P): text-base leading-relaxed (16px)
+       - Font: Inter, system-ui, atau sans-serif modern
+       - Color: text-gray-900 untuk heading, text-gray-700 untuk body
+    
+    2. **SPACING & PADDING** (🔒 LOCKED - JANGAN DIUBAH!):
+       - Container: max-w-7xl mx-auto (PADDING 2PX KIRI-KANAN - FINAL!)
+       - Section padding: py-6 (PADDING 2PX KIRI-KANAN - LOCKED!)
+       - Paragraph spacing: mb-3
+       - Jarak antar section: my-4 (COMPACT!)
+       - 🔒 CRITICAL: Padding horizontal TETAP 2px!
+    
+    3. **COLORS (FRESH & MINIMALIST - FULL WHITE)**:
+       - Background: bg-white (SEMUA SECTION - NO ALTERNATING!)
+       - JANGAN gunakan bg-gray-50 atau warna lain
+       - Semua section full white background
+       - Accent color: Blue atau Teal (bg-blue-600, bg-teal-500)
+       - Text: text-gray-900 (headings), text-gray-700 (body)
+       - Border: border-gray-200 (subtle dividers jika perlu)
+    
+    4. **LAYOUT (SIMPLE & CLEAN - WHITE CANVAS)**:
+       - Full white background di semua section
+       - NO alternating backgrounds (semua putih!)
+       - Vertical stack (flex-col) di mobile
+       - Cards: bg-white border border-gray-200 rounded-xl (opsional)
+       - Gunakan border atau spacing untuk pemisah section, bukan warna background
+       - Clean spacing antar elemen
+    
+    5. **VISUAL ELEMENTS (MINIMAL)**:
+       - NO gradient backgrounds
+       - NO emoji di text
+       - Simple border-l-4 untuk accent (optional)
+       - Cards: shadow-sm hover:shadow-md (subtle elevation)
+       - Images: rounded-lg shadow-md (simple, clean)
+       - Focused on whitespace and breathing room
+    
+    
+    7. **OVERALL AESTHETIC**:
+       - Clean white space
+       - Subtle shadows (sm, md only)
+       - Clear visual hierarchy
+       - Easy to scan and read
+       - Modern but not flashy
+       - Professional and trustworthy
+    
+    ⚠️ **CRITICAL - NO CTA BUTTONS**:
+    - DILARANG membuat tombol CTA/button "Beli Sekarang", "Dapatkan Sekarang", dll
+    - JANGAN buat tag <button> atau <a> yang berfungsi sebagai CTA
+    - User akan menambahkan form order sendiri dari penyedia web eksternal
+    - Landing page ini HANYA informatif + pricing, TANPA action button
+    
+    **CSS WAJIB (CRITICAL - PASTE KE <HEAD>)**:
+    
+    Tambahkan CSS ini di <head> untuk memastikan teks tidak pecah:
+    
+    <style>
+      * {
+        word-wrap: break-word;
+        overflow-wrap: break-word;
+        -webkit-hyphens: auto;
+        hyphens: auto;
+      }
+      
+      body {
+        font-size: 16px;
+        line-height: 1.6;
+      }
+      
+      h1, h2, h3 {
+        word-break: keep-all;
+        overflow-wrap: normal;
+      }
+      
+      @media (max-width: 768px) {
+        h1 {
+          font-size: 1.5rem !important; /* 24px */
+          line-height: 1.3 !important;
+        }
+        
+        h2 {
+          font-size: 1.25rem !important; /* 20px */
+          line-height: 1.4 !important;
+        }
+        
+        p {
+          font-size: 1rem !important; /* 16px */
+          line-height: 1.625 !important;
+          margin-bottom: 1rem !important;
+        }
+        
+        /* JARAK MINIMAL KIRI/KANAN - 2px */
+        body {
+          padding-left: 2px !important;
+          padding-right: 2px !important;
+          margin: 0 !important;
+        }
+        
+        .container, section, div {
+          padding-left: 2px !important;
+          padding-right: 2px !important;
+        }
+      }
+    </style>
+    
+    TEKNIS:
+    - Gunakan Tailwind CSS via CDN
+    - Mobile responsive 100%
+    - Pastikan tag <html>, <head>, <body> lengkap
+    - JANGAN gunakan JavaScript
+
+    MARKER SECTION (WAJIB):
+    - Bungkus SETIAP section dengan comment HTML `<!-- NAMA_START -->` dan `<!-- NAMA_END -->`.
+    - NAMA sesuai isi section: HERO, STORY, SOLUTION, WHAT_YOU_GET, WHY_NOW, SOCIAL_PROOF, BONUS, PRICING, TRUST, FAQ.
+    - Contoh: `<!-- PRICING_START -->` (kode section harga) `<!-- PRICING_END -->`.
+    - Satu nama hanya dipakai sekali, marker tidak boleh bersarang.
+
+    INSTRUKSI OUTPUT (CRITICAL - MUST BE VALID JSON):
+    
+    WAJIB: Output kamu HARUS JSON VALID. Format EXACT:
+    
+    {
+      "copywriting": {
+        "headline": "...",
+        "subheadline": "...",
+        "body_copy": "...",
+        "benefits": ["...", "..."],
+        "cta": "...",
+        "guarantee": "..."
+      },
+      "html_code": "<!DOCTYPE html><html>...FULL HTML...</html>"
+    }
+    
+    RULES KETAT:
+    - Output HANYA JSON, no text outside JSON
+    - html_code harus complete HTML (DOCTYPE to </html>)
+    - NO markdown fence (```json or ```)
+    - Escape quotes properly in JSON strings
+    """
+
+
+def competitor_block(competitor_text):
+    competitor_data = ""
+    if competitor_text:
+        competitor_data = f"""
+        DATA KOMPETITOR (ATM - AMATI TIRU MODIFIKASI):
+        Berikut adalah konten dari landing page kompetitor:
+        ---
+        {competitor_text}
+        ---
+        TUGAS ATM (FOKUS COPYWRITING SAJA):
+        1. **AMBIL KONSEP COPYWRITINGNYA**: Pelajari flow, hook, angle, dan cara mereka menjual (Storytelling? Hard selling? Fear mongering?).
+        2. **TIRU STRUKTUR PERSUASINYA**: Jika mereka mulai dengan masalah -> solusi -> testimoni, ikuti alur tersebut.
+        3. **JANGAN TIRU DESAINNYA**: Buat desain yang JAUH LEBIH BAGUS, LEBIH PREMIUM, dan LEBIH MODERN dari kompetitor. Jangan terpaku pada tampilan visual mereka yang mungkin jadul.
+        4. **MODIFIKASI ISI**: Tulis ulang dengan gaya bahasa kita yang lebih "nendang".
+        """
+    return competitor_data
+
+
+def ebook_block(ebook_text):
+    ebook_content = ""
+    if ebook_text:
+        # Limit content to prevent token overflow (approx 10k chars)
+        ebook_content = f"""
+        SUMBER MATERI / ISI EBOOK (WAJIB DIGUNAKAN SEBAGAI REFERENSI UTAMA):
+        Berikut adalah ringkasan/isi dari produk yang dijual:
+        ---
+        {ebook_text[:15000]} 
+        ---
+        INSTRUKSI KHUSUS:
+        1. Gunakan materi di atas untuk menulis Body Copy, Benefit, dan Storytelling yang SANGAT RELEVAN.
+        2. Jangan mengarang bebas jika info sudah ada di materi ini.
+        3. Ambil "Emas" (poin penting) dari materi ini untuk dijadikan Hook.
+        """
+    return ebook_content
+
+
+def build_landing_prompt(product_name, product_type, tone, harga_coret="", harga_jual="",
+                         hero_image="", product_image="", bonuses=None, use_boosters=True,
+                         competitor_text="", ebook_text=""):
+    # Calculate Discount Label
+    discount_label = "HEMAT 90% HARI INI" # Default
+    if harga_coret and harga_jual:
+        discount_label = calculate_discount(harga_coret, harga_jual)
+    
+    competitor_data = competitor_block(competitor_text)
+    ebook_content = ebook_block(ebook_text)
+
+    booster_instruction = ""
+    if use_boosters:
+        booster_instruction = """
+        FITUR BOOSTER PENJUALAN (WAJIB ADA):
+        1. **FAQ SECTION**: Buat section FAQ (Tanya Jawab) yang menjawab 3-5 keraguan utama pembeli (Objection Handling). Gunakan tag <details> dan <summary> untuk accordion.
+        2. **TRUST BADGES**: Tambahkan elemen visual "Garansi 30 Hari Uang Kembali", "Pembayaran Aman", dll.
+        """
+
+    # Prepare Image Instructions
+    image_instruction = ""
+    
+    # URL Images Logic
+    if hero_image:
+        image_instruction += f"\nHERO IMAGE (Di bawah headline utama): {hero_image}\n"
+    if product_image:
+        image_instruction += f"\nSOLUTION IMAGE (Di bawah heading 'Solusi'): {product_image}\n"
+    
+    if not hero_image and not product_image:
+        image_instruction += "\nTIDAK ADA GAMBAR. Gunakan Placeholder dari unsplash/placehold.co.\n"
+
+    image_instruction += f"\nGAYA BAHASA: {tone} (Wajib ikuti tone ini di seluruh teks!)\n"
+    
+    # Prepare Bonus Instructions
+    bonus_instruction = ""
+    bonus_list = [b for b in (bonuses or []) if b]
+    
+    if bonus_list:
+        bonus_text = "\n".join([f"  - {b}" for b in bonus_list])
+        bonus_instruction = f"""
+        BONUS YANG HARUS DITAMPILKAN (WAJIB):
+        Tambahkan section "BONUS EKSKLUSIF" atau "DAPATKAN BONUS INI" dengan bonus berikut:
+{bonus_text}
+        
+        Desain bonus section dengan card yang menarik, gunakan ikon/emoji untuk setiap bonus item.
+        Letakkan section bonus SEBELUM pricing section untuk meningkatkan perceived value.
+        """
+
+    base_prompt = f"""
+    DATA PRODUK:
+    - Nama: {product_name}
+
+    
+    {competitor_data}
+    
+    {ebook_content}
+    
+    INSTRUKSI DESAIN (PENTING):
+    1. **PENGGUNAAN GAMBAR (WAJIB)**:
+       {image_instruction}
+       - Buat layout `zig-zag` (Gambar Kiri - Teks Kanan, lalu sebaliknya) agar dinamis.
+    {image_instruction}
+    
+    {bonus_instruction}
+    """
+
+    if product_type == "Ebook / Produk Digital":
+        # Build image references
+        hero_img_html = f'<img src="{hero_image}" class="w-full max-w-lg mx-auto rounded-2xl shadow-xl my-8" alt="Hero">' if hero_image else '<img src="https://placehold.co/600x400/e2e8f0/475569?text=Hero+Image" class="w-full max-w-lg mx-auto rounded-2xl shadow-xl my-8" alt="Hero">'
+        product_img_html = f'<img src="{product_image}" class="w-full max-w-md mx-auto rounded-2xl shadow-lg my-6" alt="Product">' if product_image else '<img src="https://placehold.co/500x400/e2e8f0/475569?text=Product+Image" class="w-full max-w-md mx-auto rounded-2xl shadow-lg my-6" alt="Product">'
+        
+        scenario_prompt = f"""
+        SKENARIO: EBOOK / DIGITAL PRODUCT (Storytelling Mode)
+        Struktur Halaman:
+        1. **Headline Provokatif + Hero Image**: 
+           - Tulis headline yang fokus pada pain point/frustasi target audience. Font besar & bold.
+           - WAJIB gunakan HTML gambar ini PERSIS seperti ini (JANGAN GANTI):
+             {hero_img_html}
+        2. **Story Section**: 2-3 paragraf pendek. Ceritakan masalah yang relate dengan user. Sesuaikan dengan gaya bahasa yang dipilih: {tone}
+         7. **FAQ (Tanya Jawab)**:
+            - WAJIB: Bungkus section FAQ dengan comment HTML ini:
+              `<!-- FAQ_START -->`
+              (Kode Section FAQ disini)
+              `<!-- FAQ_END -->`
+            - WAJIB: Gunakan tag HTML `<details>` dan `<summary>` untuk membuat Accordion.
+            - Style `<details>` agar terlihat rapi (border bottom, padding).
+            - Style `<summary>` agar cursor pointer dan bold.
+            - JANGAN biarkan jawaban terbuka semua. Gunakan native HTML accordion.
+        3. **Solution + Image**: 
+           - Tulis heading "Solusi: [Nama Produk]"
+           - WAJIB gunakan HTML gambar ini PERSIS seperti ini (JANGAN GANTI):
+             {product_img_html}
+           - Tulis 2-3 paragraf penjelasan produk sebagai solusi yang JELAS dan TERSTRUKTUR
+        4. **What You Get**: List bullet points materi/isi produk yang SPESIFIK dan JELAS.
+        5. **Kenapa Ini Penting**: Section yang menjelaskan WHY user harus peduli/action sekarang. Fokus pada konsekuensi TIDAK belajar ini (kehilangan peluang, tetap stuck, dll). 2-3 paragraf pendek yang memotivasi.
+         6. **Pricing & Guarantee (PREMIUM DESIGN - CARD LAYOUT)**: 
+            WAJIB buat section pricing dengan desain **CARD PREMIUM** agar terlihat mahal & profesional:
+            
+            Gunakan struktur HTML ini (sesuaikan text):
+            <div class="w-[90%] max-w-md mx-auto bg-white rounded-3xl shadow-2xl overflow-hidden border-2 border-blue-100 relative mt-8">
+                <!-- Header Card -->
+                <div class="bg-gradient-to-r from-blue-600 to-indigo-700 py-4 px-6 text-center">
+                    <span class="text-white font-bold tracking-wider text-sm uppercase">✨ Penawaran Spesial Terbatas</span>
+                </div>
+                
+                <!-- Body Card -->
+                <div class="p-8 text-center">
+                    <!-- Harga Coret -->
+                    <p class="text-gray-400 text-lg mb-1">Harga Normal</p>
+                    <p class="text-2xl text-gray-400 line-through font-medium mb-4">{harga_coret if harga_coret else "Rp 1.150.000"}</p>
+                    
+                    <!-- Harga Jual -->
+                    <div class="mb-6">
+                        <span class="bg-red-100 text-red-700 px-3 py-1 rounded-full text-sm font-bold mb-2 inline-block">{discount_label}</span>
+                        <p class="text-5xl font-extrabold text-gray-900 mt-2 tracking-tight">{harga_jual if harga_jual else "Rp 99.000"}</p>
+                    </div>
+                    
+                    <!-- Value Comparison -->
+                    <p class="text-gray-600 text-sm mb-6 italic border-t border-gray-100 pt-4">
+                        "Cuma seharga 2 gelas kopi, tapi ilmunya bisa dipakai seumur hidup untuk karirmu!"
+                    </p>
+                    
+                    <!-- Garansi Badge -->
+                    <div class="flex items-center justify-center gap-2 text-green-600 font-semibold bg-green-50 py-3 rounded-xl">
+                        <svg xmlns="http://www.w3.org/2000/svg" class="h-5 w-5" viewBox="0 0 20 20" fill="currentColor"><path fill-rule="evenodd" d="M10 18a8 8 0 100-16 8 8 0 000 16zm3.707-9.293a1 1 0 00-1.414-1.414L9 10.586 7.707 9.293a1 1 0 00-1.414 1.414l2 2a1 1 0 001.414 0l4-4z" clip-rule="evenodd"/></svg>
+                        <span>Garansi 30 Hari Uang Kembali</span>
+                    </div>
+                </div>
+            </div>
+        
+        
+        PENTING - KUALITAS TEKS (MOBILE-FRIENDLY):
+        - Teks harus RAPI, TERSTRUKTUR, dan MUDAH DIBACA di HP
+        - WAJIB: Setiap kalimat (setelah titik) HARUS jadi PARAGRAPH TERPISAH
+        - Format: <p>Kalimat pertama.</p><p>Kalimat kedua.</p><p>Kalimat ketiga.</p>
+        - JANGAN gabung banyak kalimat dalam 1 tag <p>
+        - Setiap <p> hanya boleh 1 kalimat saja
+        - DILARANG menggunakan tanda petik satu (')
+        - Headline tidak boleh terlalu panjang (max 10 kata)
+        - Gunakan bahasa yang langsung to the point
+        """
+    else: # Produk Fisik
+        # Build image references
+        hero_img_html = f'<img src="{hero_image}" class="w-full max-w-lg mx-auto rounded-2xl shadow-xl my-8" alt="Hero">' if hero_image else '<img src="https://placehold.co/600x400/e2e8f0/475569?text=Product+Image" class="w-full max-w-lg mx-auto rounded-2xl shadow-xl my-8" alt="Hero">'
+        product_img_html = f'<img src="{product_image}" class="w-full max-w-md mx-auto rounded-2xl shadow-lg my-6" alt="Product">' if product_image else '<img src="https://placehold.co/500x400/e2e8f0/475569?text=Product+Detail" class="w-full max-w-md mx-auto rounded-2xl shadow-lg my-6" alt="Product">'
+        
+        scenario_prompt = f"""
+        SKENARIO: PRODUK FISIK (Visual & Urgency Mode)
+        Struktur Halaman:
+        1. **Hero Section**: 
+           - Background bersih, Headline kuat & singkat
+           - WAJIB gunakan HTML gambar ini PERSIS seperti ini (JANGAN GANTI):
+             {hero_img_html}
+        2. **Agitation**: Sub-headline yang menekan masalah (misal: "Sering merasa minder karena...?"). Sesuaikan dengan gaya bahasa: {tone}
+        3. **Product Solution**: 
+           - WAJIB gunakan HTML gambar ini PERSIS seperti ini (JANGAN GANTI):
+             {product_img_html}
+           - Penjelasan singkat cara pakai & solusi praktis yang JELAS dan TERSTRUKTUR
+        4. **Benefit Grid**: Layout Grid 2x2 atau 4 kolom. Ikon (bisa pakai emoji atau SVG inline) + Poin keunggulan yang SPESIFIK.
+        5. **Social Proof**: Placeholder untuk 3 testimoni user (Foto bulat + Nama + Teks pendek).
+         6. **Scarcity Offer & Pricing**: 
+            - "Promo Terbatas", "Beli 2 Gratis 1", atau Countdown Timer (tampilan visual saja).
+            - WAJIB TAMPILKAN HARGA:
+              * Harga Coret: {harga_coret if harga_coret else "Harga Tinggi"}
+              * Harga Jual: {harga_jual if harga_jual else "Harga Promo"}
+        
+        PENTING - KUALITAS TEKS:
+        - Teks harus RAPI, TERSTRUKTUR, dan MUDAH DIBACA
+        - WAJIB: Setiap kalimat (setelah titik) HARUS jadi PARAGRAPH TERPISAH
+        - Format: <p>Kalimat pertama.</p><p>Kalimat kedua.</p><p>Kalimat ketiga.</p>
+        - JANGAN gabung banyak kalimat dalam 1 tag <p>
+        - Setiap <p> hanya boleh 1 kalimat saja
+        - Hindari teks yang terlalu panjang atau bertele-tele
+        - DILARANG menggunakan tanda petik satu (')
+        - Headline tidak boleh terlalu panjang (max 10 kata)
+        - Gunakan paragraf pendek dengan tag <p>
+        """
+
+    return base_prompt + "\n" + scenario_prompt
+
+
+# --- TWO-PHASE MODE (AI tulis copy, HTML dari template lokal) ---
+CONTENT_SCHEMA_EBOOK = """
+{
+  "copywriting": {
+    "headline": "...",
+    "subheadline": "...",
+    "body_copy": "...",
+    "benefits": ["...", "..."],
+    "cta": "...",
+    "guarantee": "..."
+  },
+  "sections": {
+    "hero": {"headline": "Headline provokatif soal pain point (max 10 kata)", "subheadline": "..."},
+    "story": ["Kalimat 1.", "Kalimat 2.", "..."],
+    "solution": ["Kalimat penjelasan produk sebagai solusi.", "..."],
+    "what_you_get": ["Materi / isi produk yang spesifik", "..."],
+    "why_now": ["Kalimat kenapa harus action sekarang.", "..."],
+    "bonus_descriptions": ["Deskripsi singkat bonus #1", "..."],
+    "value_line": "Perbandingan harga yang bikin terasa murah (1 kalimat)",
+    "trust_badges": ["Garansi 30 Hari Uang Kembali", "Pembayaran Aman", "..."],
+    "faq": [{"q": "Pertanyaan / keraguan pembeli", "a": "Jawaban"}]
+  }
+}
+"""
+
+CONTENT_SCHEMA_PHYSICAL = """
+{
+  "copywriting": {
+    "headline": "...",
+    "subheadline": "...",
+    "body_copy": "...",
+    "benefits": ["...", "..."],
+    "cta": "...",
+    "guarantee": "..."
+  },
+  "sections": {
+    "hero": {"headline": "Headline kuat & singkat (max 10 kata)", "subheadline": "..."},
+    "agitation": {"question": "Sub-headline yang menekan masalah?", "paragraphs": ["Kalimat 1.", "..."]},
+    "solution": ["Kalimat cara pakai & solusi praktis.", "..."],
+    "benefits": [{"icon": "emoji", "title": "Keunggulan", "text": "Penjelasan singkat"}],
+    "testimonials": [{"name": "Nama", "text": "Testimoni pendek"}],
+    "offer": {"label": "Promo Terbatas / Beli 2 Gratis 1", "text": "Kalimat urgensi"},
+    "bonus_descriptions": ["Deskripsi singkat bonus #1", "..."],
+    "trust_badges": ["Garansi 30 Hari Uang Kembali", "Pembayaran Aman", "..."],
+    "faq": [{"q": "Pertanyaan / keraguan pembeli", "a": "Jawaban"}]
+  }
+}
+"""
+
+
+def build_content_prompt(product_name, product_type, tone, harga_coret="", harga_jual="",
+                         bonuses=None, use_boosters=True, competitor_text="", ebook_text=""):
+    # Versi ringkas dari build_landing_prompt: tanpa instruksi desain/CSS/HTML,
+    # karena HTML dirakit oleh page_templates.py
+    bonus_list = [b for b in (bonuses or []) if b]
+    bonus_text = "\n".join(f"  - {b}" for b in bonus_list) if bonus_list else "  (tidak ada bonus, isi bonus_descriptions dengan [])"
+    is_ebook = product_type == "Ebook / Produk Digital"
+    schema = CONTENT_SCHEMA_EBOOK if is_ebook else CONTENT_SCHEMA_PHYSICAL
+    booster_text = "Isi faq dengan 3-5 keraguan utama pembeli (Objection Handling)." if use_boosters else "Isi faq dan trust_badges dengan []."
+
+    return f"""
+    Bertindaklah sebagai Copywriter kelas dunia untuk landing page produk.
+    Tugasmu HANYA menulis teks (copywriting) untuk setiap section. Desain & HTML sudah disiapkan, JANGAN tulis HTML.
+
+    DATA PRODUK:
+    - Nama: {product_name}
+    - Jenis: {product_type} ({"Storytelling Mode" if is_ebook else "Visual & Urgency Mode"})
+    - Harga Coret: {harga_coret or "-"}
+    - Harga Jual: {harga_jual or "-"}
+
+    {competitor_block(competitor_text)}
+
+    {ebook_block(ebook_text)}
+
+    GAYA BAHASA: {tone} (Wajib ikuti tone ini di seluruh teks!)
+
+    BONUS (tulis deskripsi singkat untuk tiap bonus, urutan sama):
+{bonus_text}
+
+    {booster_text}
+
+    ATURAN TEKS:
+    - Setiap item di list paragraf = SATU kalimat saja
+    - Headline tidak boleh terlalu panjang (max 10 kata)
+    - DILARANG menggunakan tanda petik satu (')
+    - DILARANG menulis ajakan tombol seperti "Klik di sini" (form order ditambahkan sendiri oleh user)
+    - Gunakan bahasa yang langsung to the point
+
+    INSTRUKSI OUTPUT (CRITICAL - MUST BE VALID JSON):
+    Output HANYA JSON, tanpa markdown fence, dengan format EXACT:
+    {schema}
+    """
+
+
+def render_content_response(text_response, product):
+    """Return (generated_html, copy_sections, error) untuk respons mode template."""
+    data, error, repaired = decode_json_response(text_response)
+    if repaired:
+        print("JSON output tidak valid, berhasil diperbaiki otomatis")
+    product = dict(product)
+    product.setdefault("discount_label", calculate_discount(product.get("harga_coret", ""), product.get("harga_jual", ""))
+                       if product.get("harga_coret") and product.get("harga_jual") else "HEMAT 90% HARI INI")
+    data, problems = normalize_content(data)
+    if problems and error is None:
+        # Halaman tetap dirakit dari bagian yang bisa dipakai, tapi hasilnya ditandai bermasalah
+        error = ValueError(f"Struktur JSON tidak sesuai format: {', '.join(problems)}")
+    return render_landing_page(data, product), data["copywriting"], error
+
+
+# --- SECTION REGENERATION ---
+def build_section_prompt(name, section_html, product, instruction=""):
+    # Hanya data produk + HTML section itu sendiri yang dikirim, bukan seluruh halaman
+    bonuses = ", ".join(product.get("bonuses") or []) or "-"
+    request = instruction.strip() or "Tulis ulang dengan angle & kalimat yang lebih kuat, struktur tetap sama."
+    return f"""
+    Kamu sedang merevisi SATU section landing page: {SECTION_LABELS.get(name, name)}.
+
+    DATA PRODUK:
+    - Nama: {product.get("product_name", "")}
+    - Jenis: {product.get("product_type", "")}
+    - Harga: {product.get("harga_coret", "") or "-"} -> {product.get("harga_jual", "") or "-"}
+    - Bonus: {bonuses}
+    - Gaya bahasa: {product.get("tone", "")}
+
+    PERMINTAAN REVISI: {request}
+
+    HTML SECTION SAAT INI:
+    {section_html}
+
+    ATURAN:
+    - Output HANYA HTML pengganti section ini (tanpa markdown, tanpa penjelasan, tanpa comment marker).
+    - Pertahankan class Tailwind, warna, padding, dan src gambar yang sudah ada.
+    - Untuk FAQ tetap pakai <details> & <summary>.
+    - JANGAN gunakan JavaScript.
+    """
+
+
+def regenerate_section(html, name, product, keys, instruction="", force=False):
+    """Generate ulang satu section bermarker lalu tempel balik ke halaman. Return HTML halaman baru."""
+    section_html = get_section(html, name)
+    if section_html is None:
+        raise ValueError(f"Section {name} tidak ditemukan di halaman ini.")
+    text = generate_text(build_section_prompt(name, section_html, product, instruction), keys, force=force)
+    new_section = clean_section_output(text)
+    if not new_section:
+        raise ValueError("AI tidak mengembalikan HTML untuk section ini.")
+    return replace_section(html, name, new_section)
@@ -0,0 +1,142 @@
+import gzip
+import re
+
+from tailwind_lite import PREFLIGHT, build_css
+
+# --- HTML OPTIMIZER ---
+# Tahap terakhir setelah generated_html jadi: Tailwind CDN (script ~300 KB yang meng-compile
+# CSS di browser pengunjung) diganti CSS inline yang hanya berisi class yang dipakai halaman,
+# blok <style> yang dobel (CSS WAJIB word-wrap sering ditulis ulang per section) digabung,
+# lalu whitespace & comment dibuang. Marker section (<!-- NAMA_START -->) tetap dipertahankan
+# supaya split kode FAQ & regenerate per section tetap jalan di hasil optimasi.
+#
+# Kalau ada class yang tidak dikenali tailwind_lite (atau halaman punya tailwind.config
+# sendiri), CDN dibiarkan: lebih baik halaman sedikit lebih berat daripada tampilannya rusak.
+
+TAILWIND_CDN = re.compile(r"""<script[^>]*\bsrc=["']https?://cdn\.tailwindcss\.com[^"']*["'][^>]*>\s*</script>\s*""", re.I)
+TAILWIND_CONFIG = re.compile(r"<script[^>]*>\s*tailwind\.config\b", re.I)
+STYLE_BLOCK = re.compile(r"<style[^>]*>(.*?)</style>\s*", re.I | re.DOTALL)
+CLASS_ATTR = re.compile(r"""\bclass\s*=\s*(["'])(.*?)\1""", re.I | re.DOTALL)
+CSS_CLASS = re.compile(r"\.(-?[_a-zA-Z][\w-]*)")
+COMMENT = re.compile(r"<!--(.*?)-->", re.DOTALL)
+SECTION_MARKER = re.compile(r"^\s*[A-Z_]+_(?:START|END)\s*$")
+PRESERVED = re.compile(r"<(pre|textarea|script)\b[^>]*>.*?</\1>", re.I | re.DOTALL)
+CSS_COMMENT = re.compile(r"/\*.*?\*/", re.DOTALL)
+# Kelas penanda tanpa CSS sendiri di Tailwind
+MARKER_CLASSES = {"group", "peer"}
+# Perkiraan ukuran transfer (gzip) script Tailwind Play CDN yang diunduh tiap pengunjung
+TAILWIND_CDN_WEIGHT = 110 * 1000
+
+
+def used_classes(html):
+    """Semua class di atribut class="...", urut kemunculan pertama."""
+    found = {}
+    for match in CLASS_ATTR.finditer(html):
+        for name in match.group(2).split():
+            found.setdefault(name, None)
+    return list(found)
+
+
+def minify_css(css):
+    css = CSS_COMMENT.sub("", css)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,>])\s*", r"\1", css)
+    css = re.sub(r"(?<!\\):\s+", ":", css)
+    css = re.sub(r"\s+!important", "!important", css)
+    css = css.replace(";}", "}")
+    return css.strip()
+
+
+def css_statements(css):
+    # Pecah per statement tingkat atas (rule biasa atau blok @media utuh)
+    statements, depth, start = [], 0, 0
+    for i, char in enumerate(css):
+        if char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                statements.append(css[start:i + 1])
+                start = i + 1
+        elif char == ";" and depth == 0:
+            statements.append(css[start:i + 1])
+            start = i + 1
+    if css[start:].strip():
+        statements.append(css[start:])
+    return statements
+
+
+def merge_styles(blocks):
+    """Gabung isi beberapa <style> jadi satu; rule yang persis sama cukup disimpan sekali.
+
+    Yang disimpan kemunculan terakhir, jadi urutan cascade tetap sama seperti aslinya.
+    """
+    statements = [s for block in blocks for s in css_statements(minify_css(block))]
+    last = {s: i for i, s in enumerate(statements)}
+    return "".join(s for i, s in enumerate(statements) if last[s] == i)
+
+
+def minify_html(html):
+    preserved = []
+
+    def keep(match):
+        preserved.append(match.group(0))
+        return f"\x00{len(preserved) - 1}\x00"
+
+    html = PRESERVED.sub(keep, html)
+    html = COMMENT.sub(lambda m: m.group(0) if SECTION_MARKER.match(m.group(1)) else "", html)
+    # Whitespace beruntun cukup satu karakter (browser memperlakukannya sama)
+    html = re.sub(r"\s+", lambda m: "\n" if "\n" in m.group(0) else " ", html)
+    html = re.sub(r"\x00(\d+)\x00", lambda m: preserved[int(m.group(1))], html)
+    return html.strip()
+
+
+def page_weight(html):
+    raw = html.encode("utf-8")
+    return len(raw), len(gzip.compress(raw, compresslevel=6))
+
+
+def optimize_html(html):
+    """Return (html_teroptimasi, report). Report berisi ukuran sebelum/sesudah & status CDN."""
+    before, before_gzip = page_weight(html)
+    blocks = [m.group(1) for m in STYLE_BLOCK.finditer(html)]
+    page_css = merge_styles(blocks)
+
+    classes = used_classes(html)
+    has_cdn = bool(TAILWIND_CDN.search(html))
+    unknown = []
+    tailwind_css = ""
+    if has_cdn:
+        defined = set(CSS_CLASS.findall(page_css)) | MARKER_CLASSES
+        tailwind_css, unknown = build_css([c for c in classes if c not in defined])
+        if TAILWIND_CONFIG.search(html):
+            unknown.append("tailwind.config")
+    remove_cdn = has_cdn and not unknown
+
+    # Tailwind CDN menyisipkan CSS-nya di akhir <head>, setelah CSS halaman: urutan yang sama dipakai di sini
+    css = page_css + (PREFLIGHT + tailwind_css if remove_cdn else "")
+    body = STYLE_BLOCK.sub("", html)
+    if remove_cdn:
+        body = TAILWIND_CDN.sub("", body)
+    style = f"<style>{css}</style>" if css else ""
+    if re.search(r"</head>", body, re.I):
+        body = re.sub(r"</head>", lambda m: style + m.group(0), body, count=1, flags=re.I)
+    else:
+        body = style + body
+    optimized = minify_html(body)
+
+    after, after_gzip = page_weight(optimized)
+    # Bobot yang benar-benar diunduh pengunjung: HTML (gzip) + script CDN kalau masih dipakai
+    return optimized, {
+        "before_bytes": before,
+        "after_bytes": after,
+        "before_gzip": before_gzip,
+        "after_gzip": after_gzip,
+        "before_transfer": before_gzip + (TAILWIND_CDN_WEIGHT if has_cdn else 0),
+        "after_transfer": after_gzip + (TAILWIND_CDN_WEIGHT if has_cdn and not remove_cdn else 0),
+        "style_blocks": len(blocks),
+        "classes": len(classes),
+        "css_bytes": len(css.encode("utf-8")),
+        "cdn_removed": remove_cdn,
+        "unknown_classes": unknown,
+    }
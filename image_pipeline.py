@@ -0,0 +1,338 @@
+import base64
+import io
+import json
+import mimetypes
+import os
+import re
+import threading
+import zipfile
+from html import escape
+
+from disk_cache import DiskCache, MemoryLRU, content_hash
+
+# --- IMAGE PIPELINE ---
+# Gambar hero & produk (link atau upload) diolah sekali jadi beberapa ukuran WebP/AVIF,
+# disimpan per hash isinya di IMAGE_DIR. Di HTML hasil generate, <img> yang memakai gambar
+# itu diganti <picture> dengan srcset/sizes, width/height (mencegah layout shift), dan
+# prioritas muat: hero langsung diunduh (fetchpriority=high), sisanya lazy.
+#
+# File varian dirujuk lewat IMAGE_BASE_URL: default folder relatif "images" yang hanya ikut
+# di ZIP / folder output batch, atau URL absolut kalau folder itu di-hosting sendiri. Karena
+# itu <img> menyimpan link aslinya (data-original-src): HTML yang di-download / di-copy tanpa
+# folder gambar memakai link asli itu lagi (upload tanpa link: data URI), lihat standalone_html().
+
+IMAGE_DIR = "image_cache"
+IMAGE_BASE_URL = os.environ.get("IMAGE_BASE_URL", "images").rstrip("/")
+VARIANT_WIDTHS = (480, 768, 1024, 1536)
+FALLBACK_WIDTH = 768                    # ukuran <img src> untuk browser tanpa dukungan srcset
+QUALITY = {"avif": 55, "webp": 80}
+MAX_IMAGE_BYTES = 15 * 1024 * 1024
+FETCH_TIMEOUT = 15
+URL_TTL = 24 * 3600                     # link gambar yang sama tidak diunduh ulang selama ini
+
+# Lebar tampil mengikuti class di prompt & template (max-w-lg / max-w-md)
+SLOTS = {
+    "hero": {"sizes": "(max-width: 32rem) 100vw, 32rem", "priority": True},
+    "product": {"sizes": "(max-width: 28rem) 100vw, 28rem", "priority": False},
+}
+
+IMG_TAG = re.compile(r"<img\b[^>]*>", re.I)
+PICTURE = re.compile(r"<picture\b[^>]*>.*?</picture>", re.I | re.DOTALL)
+ORIGINAL_ATTR = re.compile(r"""\s+data-original-src=(["']).*?\1""", re.I | re.DOTALL)
+ATTR = re.compile(r"""\b([a-zA-Z-]+)\s*=\s*(["'])(.*?)\2""", re.DOTALL)
+VARIANT_NAME = re.compile(r"\b[0-9a-f]{16}(?:-\d+)?\.(?:avif|webp|jpe?g|png|gif)\b")
+
+_lock = threading.Lock()
+_url_cache = None
+_pillow = None          # (Image, ImageOps), False kalau Pillow tidak terpasang
+# Data URI untuk preview di Streamlit (iframe tidak bisa membaca folder images/)
+_data_uris = MemoryLRU(max_items=64, max_size=30 * 1000 * 1000)
+
+
+def pillow():
+    """(Image, ImageOps), atau None tanpa Pillow. Baru di-import saat gambar pertama diolah."""
+    global _pillow
+    with _lock:
+        if _pillow is None:
+            try:
+                from PIL import Image, ImageOps
+            except ImportError:
+                _pillow = False
+            else:
+                try:
+                    # Pillow < 11.2 / build tanpa libavif: AVIF lewat plugin (pip install pillow-avif-plugin)
+                    import pillow_avif  # noqa: F401
+                except ImportError:
+                    pass
+                Image.init()
+                _pillow = (Image, ImageOps)
+        return _pillow or None
+
+
+def available_formats():
+    # Format yang encoder-nya terpasang (bawaan Pillow atau plugin), AVIF dulu
+    pil = pillow()
+    if pil is None:
+        return []
+    return [fmt for fmt in ("avif", "webp") if fmt.upper() in pil[0].SAVE]
+
+
+def get_url_cache():
+    global _url_cache
+    with _lock:
+        if _url_cache is None:
+            _url_cache = DiskCache("image_urls", ttl=URL_TTL)
+        return _url_cache
+
+
+def fetch_image(url):
+    from scraper import get_session, host_limit
+
+    with host_limit(url):
+        response = get_session().get(url, timeout=FETCH_TIMEOUT, stream=True)
+        try:
+            response.raise_for_status()
+            content_type = response.headers.get("Content-Type", "")
+            if content_type and not content_type.startswith("image/"):
+                raise ValueError(f"Link bukan gambar ({content_type})")
+            body = bytearray()
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                body.extend(chunk)
+                if len(body) > MAX_IMAGE_BYTES:
+                    raise ValueError(f"Gambar lebih dari {MAX_IMAGE_BYTES // (1024 * 1024)} MB")
+        finally:
+            response.close()
+    return bytes(body), content_type
+
+
+def variant_url(name):
+    return f"{IMAGE_BASE_URL}/{name}"
+
+
+def hosted_images():
+    """True kalau IMAGE_BASE_URL menunjuk ke server (varian bisa dirujuk dari HTML mana pun)."""
+    return IMAGE_BASE_URL.startswith(("http://", "https://", "//"))
+
+
+def image_folder():
+    # Folder varian di dalam ZIP / output batch: ikut IMAGE_BASE_URL kalau relatif,
+    # kalau sudah di-hosting cukup "images" (isinya yang di-upload ke IMAGE_BASE_URL)
+    if hosted_images():
+        return "images"
+    return os.path.normpath(IMAGE_BASE_URL.strip("/")) if IMAGE_BASE_URL.strip("/") else "images"
+
+
+def _save(image, path, fmt):
+    # Tulis ke file sementara dulu supaya proses lain tidak membaca file setengah jadi
+    tmp = f"{path}.tmp{threading.get_ident()}"
+    options = {"quality": QUALITY[fmt]}
+    if fmt == "webp":
+        options["method"] = 6
+    image.save(tmp, fmt.upper(), **options)
+    os.replace(tmp, path)
+
+
+def process_image(data, content_type="", image_dir=IMAGE_DIR):
+    """Olah bytes gambar jadi varian per ukuran & format. Return meta (dict), di-cache per hash isi."""
+    digest = content_hash(data)[:16]
+    os.makedirs(image_dir, exist_ok=True)
+    meta_path = os.path.join(image_dir, f"{digest}.json")
+    if os.path.exists(meta_path):
+        with open(meta_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    formats = available_formats()
+    if not formats:
+        # Tanpa Pillow: simpan aslinya saja supaya tetap bisa ikut ZIP & preview
+        ext = mimetypes.guess_extension(content_type or "") or ".jpg"
+        name = f"{digest}{'.jpg' if ext == '.jpe' else ext}"
+        with open(os.path.join(image_dir, name), "wb") as f:
+            f.write(data)
+        meta = {"hash": digest, "width": None, "height": None, "variants": {}, "src": name}
+    else:
+        Image, ImageOps = pillow()
+        with Image.open(io.BytesIO(data)) as opened:
+            image = ImageOps.exif_transpose(opened)
+            if image.mode not in ("RGB", "RGBA"):
+                image = image.convert("RGBA" if "A" in image.getbands() or "transparency" in image.info else "RGB")
+            width, height = image.size
+            widths = sorted({w for w in VARIANT_WIDTHS if w < width} | {min(width, VARIANT_WIDTHS[-1])})
+            variants = {}
+            for fmt in formats:
+                variants[fmt] = []
+                for w in widths:
+                    name = f"{digest}-{w}.{fmt}"
+                    path = os.path.join(image_dir, name)
+                    if not os.path.exists(path):
+                        resized = image if w == width else image.resize((w, round(height * w / width)), Image.LANCZOS)
+                        _save(resized, path, fmt)
+                    variants[fmt].append([w, name])
+        fallback = [name for w, name in variants["webp" if "webp" in variants else formats[0]] if w <= FALLBACK_WIDTH]
+        meta = {
+            "hash": digest,
+            "width": widths[-1],
+            "height": round(height * widths[-1] / width),
+            "variants": variants,
+            "src": fallback[-1] if fallback else variants[formats[-1]][0][1],
+        }
+    with open(meta_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    return meta
+
+
+def prepare_image(source, content_type="", image_dir=IMAGE_DIR):
+    """source: link gambar (str) atau isi file upload (bytes). Return meta, atau None kalau gagal."""
+    if not source:
+        return None
+    try:
+        if isinstance(source, str):
+            cache = get_url_cache()
+            digest = cache.get(source)
+            meta_path = os.path.join(image_dir, f"{digest}.json") if digest else None
+            if meta_path and os.path.exists(meta_path):
+                with open(meta_path, "r", encoding="utf-8") as f:
+                    return json.load(f)
+            data, content_type = fetch_image(source)
+            meta = process_image(data, content_type, image_dir)
+            cache.set(source, meta["hash"])
+            return meta
+        return process_image(source, content_type, image_dir)
+    except Exception as e:
+        print(f"[IMAGE] Gagal mengolah gambar: {e}")
+        return None
+
+
+def picture_html(meta, slot, classes="", alt="", original=""):
+    config = SLOTS.get(slot, SLOTS["product"])
+    loading = ' loading="eager" fetchpriority="high"' if config["priority"] else ' loading="lazy"'
+    size = f' width="{meta["width"]}" height="{meta["height"]}"' if meta.get("width") else ""
+    original = f' data-original-src="{escape(original, quote=True)}"' if original else ""
+    img = (f'<img src="{escape(variant_url(meta["src"]), quote=True)}"{original}{size} class="{escape(classes, quote=True)}" '
+           f'alt="{escape(alt, quote=True)}"{loading} decoding="async">')
+    if not meta["variants"]:
+        return img
+    sources = "".join(
+        f'<source type="image/{fmt}" srcset="{", ".join(f"{variant_url(name)} {w}w" for w, name in variants)}" '
+        f'sizes="{config["sizes"]}">'
+        for fmt, variants in meta["variants"].items()
+    )
+    return f'<picture class="block">{sources}{img}</picture>'
+
+
+def optimize_images(html, images):
+    """Ganti <img> yang src-nya ada di `images` ({src: (meta, slot, link_asli)}) dengan <picture>.
+
+    meta None: gambar tanpa varian (tanpa Pillow / opsi optimasi mati), <img> tetap apa adanya
+    tapi slot prioritas (hero) dimuat duluan. <img> lain tidak disentuh: bisa saja itu gambar LCP.
+    """
+    def rewrite(match):
+        tag = match.group(0)
+        attrs = {name.lower(): value for name, _, value in ATTR.findall(tag)}
+        src = attrs.get("src", "")
+        if src not in images:
+            return tag
+        meta, slot, original = images[src]
+        if meta:
+            return picture_html(meta, slot, attrs.get("class", ""), attrs.get("alt", ""), original)
+        if SLOTS.get(slot, SLOTS["product"])["priority"] and "loading" not in attrs and "fetchpriority" not in attrs:
+            return re.sub(r"\s*/?>$", ' loading="eager" fetchpriority="high">', tag)
+        return tag
+
+    return IMG_TAG.sub(rewrite, html)
+
+
+def image_files(html, image_dir=IMAGE_DIR):
+    """Nama file varian yang dirujuk HTML dan memang ada di image_dir."""
+    names = dict.fromkeys(VARIANT_NAME.findall(html))
+    return [name for name in names if os.path.exists(os.path.join(image_dir, name))]
+
+
+def data_uri(name, image_dir=IMAGE_DIR):
+    uri = _data_uris.get(name)
+    if uri is None:
+        with open(os.path.join(image_dir, name), "rb") as f:
+            data = f.read()
+        mime = mimetypes.guess_type(name)[0] or f"image/{name.rsplit('.', 1)[-1]}"
+        uri = f"data:{mime};base64,{base64.b64encode(data).decode()}"
+        _data_uris.set(name, uri, size=len(uri))
+    return uri
+
+
+def inline_images(html, image_dir=IMAGE_DIR):
+    """Untuk preview: rujukan ke file lokal diganti data URI. srcset diringkas ke satu varian."""
+    names = image_files(html, image_dir)
+    if not names:
+        return html
+    # Preview cukup pakai <img src>; <source> dibuang supaya data URI tidak dobel-dobel
+    html = re.sub(r"<source\b[^>]*\bsrcset=[^>]*>", "", html, flags=re.I)
+    for name in names:
+        html = html.replace(variant_url(name), data_uri(name, image_dir))
+    return html
+
+
+def local_src(tag):
+    # src <img> yang menunjuk ke file varian lokal (bukan link luar / placeholder)
+    src = dict((name.lower(), value) for name, _, value in ATTR.findall(tag)).get("src", "")
+    return src if src.startswith(f"{IMAGE_BASE_URL}/") and VARIANT_NAME.search(src) else ""
+
+
+def standalone_html(html, image_dir=IMAGE_DIR):
+    """HTML untuk download / copy tanpa folder gambar.
+
+    Kalau varian di-hosting (IMAGE_BASE_URL absolut), <picture> dipertahankan. Kalau tidak,
+    <picture> diganti <img> ke link asli gambarnya; gambar upload (tanpa link) jadi data URI.
+    """
+    if hosted_images():
+        return packaged_html(html)
+
+    def fallback_img(tag):
+        src = local_src(tag)
+        if not src:
+            return tag
+        original = re.search(r"""\bdata-original-src=(["'])(.*?)\1""", tag, re.I | re.DOTALL)
+        name = src.rsplit("/", 1)[-1]
+        if original:
+            target = original.group(2)
+        elif os.path.exists(os.path.join(image_dir, name)):
+            target = data_uri(name, image_dir)
+        else:
+            return tag
+        tag = ORIGINAL_ATTR.sub("", tag)
+        return tag.replace(f'src="{src}"', f'src="{target}"', 1).replace(f"src='{src}'", f"src='{target}'", 1)
+
+    def unwrap(match):
+        img = IMG_TAG.search(match.group(0))
+        return fallback_img(img.group(0)) if img and local_src(img.group(0)) else match.group(0)
+
+    html = PICTURE.sub(unwrap, html)
+    return IMG_TAG.sub(lambda m: fallback_img(m.group(0)), html)
+
+
+def packaged_html(html):
+    """HTML yang dikirim bersama file variannya (ZIP / folder batch): penanda link asli dibuang."""
+    return ORIGINAL_ATTR.sub("", html)
+
+
+def export_images(html, dest_dir, image_dir=IMAGE_DIR):
+    """Salin file varian yang dipakai HTML ke dest_dir/<image_folder()> (untuk batch output)."""
+    names = image_files(html, image_dir)
+    folder = os.path.join(dest_dir, image_folder())
+    if names:
+        os.makedirs(folder, exist_ok=True)
+    for name in names:
+        target = os.path.join(folder, name)
+        if not os.path.exists(target):
+            with open(os.path.join(image_dir, name), "rb") as src, open(target, "wb") as dst:
+                dst.write(src.read())
+    return names
+
+
+def package_zip(html, file_name="index.html", image_dir=IMAGE_DIR):
+    """ZIP berisi HTML + folder gambar (image_folder()) yang dirujuknya."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr(file_name, packaged_html(html))
+        for name in image_files(html, image_dir):
+            # Gambar sudah terkompresi, tidak perlu di-deflate lagi
+            zf.write(os.path.join(image_dir, name), arcname=f"{image_folder()}/{name}", compress_type=zipfile.ZIP_STORED)
+    return buffer.getvalue()
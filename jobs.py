@@ -0,0 +1,221 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+# --- JOB QUEUE ---
+# Generate landing page dijalankan sebagai job di worker pool milik proses, bukan di thread
+# script Streamlit. Rerun / tab ditutup di tengah jalan tidak membuang hasil & kuota yang
+# sudah terpakai: job tetap jalan, UI cukup polling status-nya lalu mengambil hasilnya.
+#
+# Status job disimpan di SQLite (tahan refresh browser, bisa dibaca sesi lain); progres
+# streaming (potongan HTML / copywriting) hanya di memori karena berubah tiap detik.
+
+JOBS_DB = "generation_jobs.db"
+JOB_WORKERS = int(os.environ.get("JOB_WORKERS", "4"))
+JOB_RETENTION = 7 * 24 * 3600          # job selesai lebih lama dari ini dihapus saat start
+ACTIVE_STATUSES = ("queued", "running")
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class Job:
+    """Handle yang diterima fungsi job: lapor progres, kirim hasil sementara, cek pembatalan."""
+
+    def __init__(self, queue, job_id):
+        self.queue = queue
+        self.id = job_id
+
+    def progress(self, fraction=None, message=None):
+        self.queue._update(self.id, progress=fraction, message=message)
+
+    def partial(self, **fields):
+        self.queue._set_partial(self.id, fields)
+
+    def check_cancelled(self):
+        if self.queue._is_cancelled(self.id):
+            raise JobCancelled("Dibatalkan")
+
+
+class JobQueue:
+    def __init__(self, path=JOBS_DB, workers=JOB_WORKERS):
+        self.path = path
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="job")
+        self.live = {}          # job_id -> status dict (queued / running)
+        self.partials = {}      # job_id -> hasil sementara
+        self.futures = {}
+        self.cancelled = set()
+        with self._connect() as conn:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    label TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    progress REAL NOT NULL DEFAULT 0,
+                    message TEXT,
+                    result TEXT,
+                    error TEXT,
+                    created_at REAL NOT NULL,
+                    started_at REAL,
+                    finished_at REAL
+                )"""
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status)")
+            # Job yang belum selesai saat proses sebelumnya mati tidak akan pernah jalan lagi
+            conn.execute(
+                "UPDATE jobs SET status = 'error', error = ?, finished_at = ? WHERE status IN ('queued', 'running')",
+                ("Server restart sebelum job selesai, silakan generate ulang.", time.time()),
+            )
+            conn.execute("DELETE FROM jobs WHERE finished_at < ?", (time.time() - JOB_RETENTION,))
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def submit(self, kind, fn, *args, label="", **kwargs):
+        """Antrikan fn(job, *args, **kwargs). Return id job (str)."""
+        job_id = uuid.uuid4().hex[:12]
+        now = time.time()
+        info = {"id": job_id, "kind": kind, "label": label, "status": "queued", "progress": 0.0,
+                "message": "Menunggu giliran...", "result": None, "error": None,
+                "created_at": now, "started_at": None, "finished_at": None}
+        with self.lock:
+            self.live[job_id] = info
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, kind, label, status, message, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, kind, label, "queued", info["message"], now),
+            )
+        future = self.executor.submit(self._run, job_id, fn, args, kwargs)
+        with self.lock:
+            # Job super cepat bisa sudah selesai (dan dibersihkan) sebelum baris ini
+            if job_id in self.live:
+                self.futures[job_id] = future
+        return job_id
+
+    def _run(self, job_id, fn, args, kwargs):
+        if self._is_cancelled(job_id):
+            return self._finish(job_id, "cancelled", error="Dibatalkan")
+        try:
+            self._update(job_id, status="running", started_at=time.time(), message="Mulai...", persist=True)
+            result = fn(Job(self, job_id), *args, **kwargs)
+        except JobCancelled:
+            self._finish(job_id, "cancelled", error="Dibatalkan")
+        except Exception as e:
+            self._finish(job_id, "error", error=str(e))
+        else:
+            self._finish(job_id, "done", result=result)
+
+    def _update(self, job_id, persist=False, **fields):
+        fields = {k: v for k, v in fields.items() if v is not None}
+        with self.lock:
+            info = self.live.get(job_id)
+            if info is None:
+                return
+            # Pesan tahap baru ikut disimpan ke SQLite, angka progres saja cukup di memori
+            persist = persist or ("message" in fields and fields["message"] != info["message"])
+            info.update(fields)
+            snapshot = dict(info)
+        if persist:
+            with self._connect() as conn:
+                conn.execute(
+                    "UPDATE jobs SET status = ?, progress = ?, message = ?, started_at = ? WHERE id = ?",
+                    (snapshot["status"], snapshot["progress"], snapshot["message"], snapshot["started_at"], job_id),
+                )
+
+    def _set_partial(self, job_id, fields):
+        with self.lock:
+            self.partials.setdefault(job_id, {}).update(fields)
+
+    def _finish(self, job_id, status, result=None, error=None):
+        now = time.time()
+        try:
+            try:
+                payload = json.dumps(result, ensure_ascii=False) if result is not None else None
+            except (TypeError, ValueError) as e:
+                status, payload, error = "error", None, f"Hasil job tidak bisa disimpan: {e}"
+            try:
+                self._store_finish(job_id, status, payload, error, now)
+            except Exception as e:
+                # Jangan sampai baris-nya tertinggal "running" selamanya
+                print(f"[JOBS] Gagal menyimpan hasil job {job_id}: {e}")
+                self._store_finish(job_id, "error", None, f"Hasil job tidak bisa disimpan: {e}", now)
+        finally:
+            with self.lock:
+                self.live.pop(job_id, None)
+                self.partials.pop(job_id, None)
+                self.futures.pop(job_id, None)
+                self.cancelled.discard(job_id)
+
+    def _store_finish(self, job_id, status, payload, error, now):
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, progress = COALESCE(?, progress), result = ?, error = ?, finished_at = ? WHERE id = ?",
+                (status, 1.0 if status == "done" else None, payload, error, now, job_id),
+            )
+
+    def _is_cancelled(self, job_id):
+        with self.lock:
+            return job_id in self.cancelled
+
+    def cancel(self, job_id):
+        """Job yang masih antri langsung batal; yang sedang jalan berhenti di cek berikutnya."""
+        with self.lock:
+            if job_id not in self.live:
+                return False
+            self.cancelled.add(job_id)
+            future = self.futures.get(job_id)
+        if future is not None and future.cancel():
+            self._finish(job_id, "cancelled", error="Dibatalkan")
+        return True
+
+    def status(self, job_id):
+        with self.lock:
+            info = self.live.get(job_id)
+            if info is not None:
+                return dict(info)
+        with self._connect() as conn:
+            row = conn.execute(
+                """SELECT id, kind, label, status, progress, message, result, error, created_at, started_at, finished_at
+                   FROM jobs WHERE id = ?""",
+                (job_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        keys = ("id", "kind", "label", "status", "progress", "message", "result", "error",
+                "created_at", "started_at", "finished_at")
+        info = dict(zip(keys, row))
+        info["result"] = json.loads(info["result"]) if info["result"] else None
+        return info
+
+    def partial(self, job_id):
+        with self.lock:
+            return dict(self.partials.get(job_id, {}))
+
+    def position(self, job_id):
+        """Urutan job di antrian (0 = sedang jalan / berikutnya)."""
+        with self.lock:
+            info = self.live.get(job_id)
+            if info is None or info["status"] != "queued":
+                return 0
+            return sum(1 for other in self.live.values()
+                       if other["status"] == "queued" and other["created_at"] < info["created_at"])
+
+    def stats(self):
+        with self.lock:
+            running = sum(1 for info in self.live.values() if info["status"] == "running")
+            return {"running": running, "queued": len(self.live) - running}
@@ -0,0 +1,175 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+
+# --- KEY POOL ---
+# Menyimpan status tiap API key (cooldown setelah 429, banned setelah 403 "leaked")
+# supaya rotasi tidak selalu mulai dari key pertama. Status disimpan ke disk
+# sehingga tetap berlaku antar rerun dan antar sesi browser.
+
+STATE_FILE = "key_pool_state.json"
+
+BASE_COOLDOWN = 60        # detik, cooldown pertama setelah 429
+MAX_COOLDOWN = 15 * 60    # batas atas cooldown (exponential backoff)
+
+
+def key_id(key):
+    # Jangan simpan API key mentah ke disk, cukup hash pendeknya
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+
+
+def api_endpoint():
+    # Arahkan semua client Gemini ke server lain (mis. mock lokal di mock_gemini.py untuk benchmark).
+    # Dibaca saat client dibuat, bukan saat import: benchmark baru tahu alamat mock setelah server jalan
+    return os.environ.get("GEMINI_API_ENDPOINT")
+
+
+def client_kwargs(key):
+    # Argumen untuk client generativelanguage per key
+    endpoint = api_endpoint()
+    if endpoint:
+        return {"client_options": {"api_key": key, "api_endpoint": endpoint}, "transport": "rest"}
+    return {"client_options": {"api_key": key}}
+
+
+def is_rate_limit_error(error):
+    msg = str(error)
+    return "429" in msg or "ResourceExhausted" in type(error).__name__ or "quota" in msg.lower()
+
+
+def is_leaked_key_error(error):
+    msg = str(error)
+    return "403" in msg and "leaked" in msg.lower()
+
+
+def parse_retry_delay(error):
+    # Gemini kadang menyertakan "retry in 37.5s" / "retry_delay { seconds: 37 }"
+    msg = str(error)
+    match = re.search(r"retry in ([\d.]+)\s*s", msg, re.IGNORECASE)
+    if not match:
+        match = re.search(r"retry_delay\s*\{\s*seconds:\s*(\d+)", msg)
+    if match:
+        try:
+            return float(match.group(1))
+        except ValueError:
+            return None
+    return None
+
+
+class KeyPool:
+    def __init__(self, state_file=STATE_FILE):
+        self.state_file = state_file
+        self.lock = threading.Lock()
+        self.state = self._load()
+
+    # --- PERSISTENCE ---
+    def _load(self):
+        try:
+            with open(self.state_file, "r") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _save(self):
+        # Tulis ke file sementara lalu rename, supaya file tidak pernah setengah jadi
+        tmp_file = f"{self.state_file}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_file, "w") as f:
+                json.dump(self.state, f)
+            os.replace(tmp_file, self.state_file)
+        except OSError as e:
+            print(f"Gagal menyimpan status key pool: {e}")
+
+    def _entry(self, key):
+        kid = key_id(key)
+        if kid not in self.state:
+            self.state[kid] = {
+                "last_used": 0,
+                "cooldown_until": 0,
+                "failures": 0,
+                "banned": False,
+                "successes": 0,
+            }
+        return self.state[kid]
+
+    # --- SELECTION ---
+    def candidates(self, keys, reserve=False):
+        """Urutkan key: yang sehat dulu (paling lama tidak dipakai), lalu yang masih cooldown.
+
+        reserve=True langsung menandai key pertama sebagai dipakai, supaya thread lain
+        yang memilih di saat bersamaan dapat key yang berbeda.
+        """
+        now = time.time()
+        with self.lock:
+            healthy, cooling = [], []
+            for key in dict.fromkeys(keys):
+                entry = self._entry(key)
+                if entry["banned"]:
+                    continue
+                if entry["cooldown_until"] > now:
+                    cooling.append((entry["cooldown_until"], key))
+                else:
+                    healthy.append((entry["last_used"], key))
+            healthy.sort(key=lambda item: item[0])
+            cooling.sort(key=lambda item: item[0])
+            if reserve and healthy:
+                self._entry(healthy[0][1])["last_used"] = now
+        # Key yang cooldown tetap dicoba paling akhir, siapa tahu limitnya sudah reset
+        return [key for _, key in healthy] + [key for _, key in cooling]
+
+    def status(self, keys):
+        now = time.time()
+        summary = {"healthy": 0, "cooldown": 0, "banned": 0}
+        with self.lock:
+            for key in dict.fromkeys(keys):
+                entry = self._entry(key)
+                if entry["banned"]:
+                    summary["banned"] += 1
+                elif entry["cooldown_until"] > now:
+                    summary["cooldown"] += 1
+                else:
+                    summary["healthy"] += 1
+        return summary
+
+    def available_at(self, key):
+        """Waktu key boleh dipakai lagi (0 = sekarang, inf = diblokir)."""
+        with self.lock:
+            entry = self._entry(key)
+            return float("inf") if entry["banned"] else entry["cooldown_until"]
+
+    # --- FEEDBACK ---
+    def mark_used(self, key):
+        with self.lock:
+            self._entry(key)["last_used"] = time.time()
+
+    def mark_success(self, key):
+        with self.lock:
+            entry = self._entry(key)
+            entry["last_used"] = time.time()
+            entry["failures"] = 0
+            entry["cooldown_until"] = 0
+            entry["successes"] = entry.get("successes", 0) + 1
+            self._save()
+
+    def mark_failure(self, key, error):
+        with self.lock:
+            entry = self._entry(key)
+            entry["last_used"] = time.time()
+            if is_leaked_key_error(error):
+                entry["banned"] = True
+            elif is_rate_limit_error(error):
+                entry["failures"] += 1
+                delay = parse_retry_delay(error)
+                if delay is None:
+                    delay = min(BASE_COOLDOWN * (2 ** (entry["failures"] - 1)), MAX_COOLDOWN)
+                entry["cooldown_until"] = time.time() + delay
+            self._save()
+
+    def reset(self, key):
+        with self.lock:
+            self.state.pop(key_id(key), None)
+            self._save()
@@ -0,0 +1,228 @@
+import time
+
+from generator import (
+    response_cache, prompt_cache_key, generate_text, generate_text_stream,
+    parse_landing_response, build_landing_prompt, build_content_prompt, render_content_response,
+    regenerate_section, LANDING_SYSTEM_INSTRUCTION,
+)
+from response_parser import StreamingFieldParser
+from scheduler import scheduling
+from sections import SECTION_LABELS
+from tracing import start_trace, end_trace, stage
+
+# --- LANDING PAGE JOB ---
+# Seluruh alur generate (scrape, baca ebook, olah gambar, prompt, Gemini, parse, simpan)
+# sebagai fungsi job untuk jobs.JobQueue: tidak menyentuh Streamlit sama sekali. Progres
+# dilaporkan lewat job.progress(), potongan hasil streaming lewat job.partial().
+
+STREAM_COPY_FIELDS = [
+    ("headline", "Headline"),
+    ("subheadline", "Subheadline"),
+    ("body_copy", "Body Copy / Story"),
+    ("cta", "CTA Copy"),
+    ("guarantee", "Garansi"),
+]
+PARTIAL_INTERVAL = 0.8      # detik antar update preview streaming
+
+
+def run_landing_job(job, request, keys, generation_store, competitor_store):
+    """request: dict isi form (upload sudah berupa bytes). Return dict hasil untuk sesi."""
+    from scraper import scrape_many, format_competitor_texts
+    from documents import read_document_bytes, UnsupportedFormat, DocumentTimeout
+    from summarizer import digest_document
+    from image_pipeline import prepare_image, variant_url, optimize_images
+
+    warnings = []
+    # Selama antri kuota API, perkiraan tunggunya ditampilkan di panel progres
+    on_quota_wait = lambda wait: job.partial(quota_wait=wait)
+    start_trace("landing_page")
+    saved_generation_id = None
+    try:
+        # Semua kompetitor di-scrape paralel
+        job.progress(0.05, "Membaca halaman kompetitor...")
+        competitor_urls = request["competitor_urls"]
+        with stage("scrape", urls=len(competitor_urls)) as scrape_stage:
+            scraped_texts = scrape_many(competitor_urls)
+            for url, text in scraped_texts.items():
+                if not text.startswith("Gagal scraping"):
+                    competitor_store.record_scrape(url, len(text))
+            competitor_text = format_competitor_texts(scraped_texts)
+            scrape_stage["bytes"] = len(competitor_text.encode("utf-8"))
+        job.check_cancelled()
+
+        ebook = request.get("ebook")
+        ebook_text = ""
+        ebook_error = None
+        with stage("read_file") as read_stage, scheduling(on_wait=on_quota_wait):
+            if ebook and request["summarize_ebook"]:
+                job.progress(0.1, "Meringkas isi ebook...")
+                try:
+                    ebook_text = digest_document(
+                        ebook["data"], ebook["type"], keys,
+                        on_progress=lambda done, total: job.progress(0.1 + 0.2 * done / total, f"Meringkas isi ebook... ({done}/{total} bagian)"),
+                        warnings=warnings,
+                    )
+                except (UnsupportedFormat, DocumentTimeout) as e:
+                    # File-nya sendiri yang tidak terbaca: membaca ulang 15.000 karakter pertama juga gagal
+                    ebook_error = e
+                except Exception as e:
+                    warnings.append(f"⚠️ Gagal meringkas ebook, pakai 15.000 karakter pertama saja. ({e})")
+            if ebook and not ebook_text and ebook_error is None:
+                try:
+                    ebook_text = read_document_bytes(ebook["data"], ebook["type"])
+                except Exception as e:
+                    ebook_error = e
+            if ebook_error is not None:
+                # Pesan error tidak boleh ikut masuk prompt sebagai "isi ebook"
+                warnings.append(f"⚠️ Isi ebook tidak dipakai: {ebook_error}")
+                read_stage["error"] = type(ebook_error).__name__
+            if ebook:
+                read_stage["upload_bytes"] = len(ebook["data"])
+            read_stage["bytes"] = len(ebook_text.encode("utf-8"))
+        job.check_cancelled()
+
+        # Gambar diolah sekali (per hash isi) jadi varian WebP/AVIF; prompt memakai path
+        # varian fallback-nya, lalu <img> itu diganti <picture> setelah HTML jadi
+        job.progress(0.3, "Mengolah gambar...")
+        images = {"hero": request["hero_image"], "product": request["product_image"]}
+        page_images = {}
+        with stage("images") as image_stage:
+            for slot, link in (("hero", request["hero_image"]), ("product", request["product_image"])):
+                upload = request.get(f"{slot}_upload")
+                # File upload selalu diolah (perlu disimpan di images/); link hanya kalau opsi aktif
+                if not upload and not (link and request["optimize_images"]):
+                    continue
+                meta = prepare_image(upload["data"], upload["type"]) if upload else prepare_image(link)
+                if meta is None:
+                    warnings.append(f"⚠️ Gambar {slot} gagal diolah, dipakai apa adanya.")
+                    continue
+                if not upload and not meta["variants"]:
+                    # Tanpa Pillow tidak ada varian: salinan lokal link tidak lebih baik dari link-nya
+                    warnings.append(f"⚠️ Pillow tidak terpasang, gambar {slot} tidak dioptimasi (pip install Pillow).")
+                    continue
+                images[slot] = variant_url(meta["src"])
+                page_images[images[slot]] = (meta, slot, "" if upload else link)
+            image_stage["images"] = len(page_images)
+            # Link yang dipakai apa adanya tetap didaftarkan (tanpa meta): hero-nya dimuat duluan, bukan lazy
+            for slot, link in images.items():
+                if link and link not in page_images:
+                    page_images[link] = (None, slot, link)
+
+        product = {
+            "product_name": request["product_name"], "product_type": request["product_type"],
+            "harga_coret": request["harga_coret"], "harga_jual": request["harga_jual"],
+            "hero_image": images["hero"], "product_image": images["product"],
+            "bonuses": request["bonuses"], "use_boosters": request["use_boosters"],
+        }
+        with stage("prompt") as prompt_stage:
+            system_instruction = None
+            if request["use_templates"]:
+                final_prompt = build_content_prompt(
+                    product["product_name"], product["product_type"], request["tone"],
+                    harga_coret=product["harga_coret"], harga_jual=product["harga_jual"],
+                    bonuses=product["bonuses"], use_boosters=product["use_boosters"],
+                    competitor_text=competitor_text, ebook_text=ebook_text,
+                )
+            else:
+                final_prompt = build_landing_prompt(
+                    product["product_name"], product["product_type"], request["tone"],
+                    harga_coret=product["harga_coret"], harga_jual=product["harga_jual"],
+                    hero_image=product["hero_image"], product_image=product["product_image"],
+                    bonuses=product["bonuses"], use_boosters=product["use_boosters"],
+                    competitor_text=competitor_text, ebook_text=ebook_text,
+                )
+                # Aturan desain & format output tetap, dikirim terpisah sebagai prefix yang stabil
+                # (implicit caching Gemini, lihat LANDING_SYSTEM_INSTRUCTION)
+                system_instruction = LANDING_SYSTEM_INSTRUCTION
+            prompt_stage["bytes"] = len(final_prompt.encode("utf-8"))
+        job.check_cancelled()
+
+        # Generate with Rotation
+        job.progress(0.4, "AI sedang menulis halaman...")
+        with stage("gemini", streaming=request["use_streaming"]), scheduling(on_wait=on_quota_wait):
+            if request["use_streaming"]:
+                parser = StreamingFieldParser([field for field, _ in STREAM_COPY_FIELDS] + ["html_code"])
+                chunks = []
+                received = 0
+                last_partial = 0
+                for chunk in generate_text_stream(final_prompt, keys, force=request["force"],
+                                                  system_instruction=system_instruction):
+                    chunks.append(chunk)
+                    received += len(chunk)
+                    parser.feed(chunk)
+                    # Jangan kirim preview di setiap chunk, cukup tiap ~1 detik
+                    if time.time() - last_partial > PARTIAL_INTERVAL:
+                        job.check_cancelled()
+                        job.partial(
+                            copy={field: parser.value(field) for field, _ in STREAM_COPY_FIELDS if parser.is_done(field)},
+                            html=parser.value("html_code") if parser.has_started("html_code") else "",
+                            received=received,
+                        )
+                        last_partial = time.time()
+                response_text = "".join(chunks)
+            else:
+                response_text = generate_text(final_prompt, keys, force=request["force"],
+                                              system_instruction=system_instruction)
+
+        # Parse JSON Response
+        job.progress(0.9, "Merapikan hasil...")
+        with stage("parse", bytes=len(response_text.encode("utf-8"))) as parse_stage:
+            if request["use_templates"]:
+                generated_html, copy_sections, parse_error = render_content_response(response_text, product)
+            else:
+                generated_html, copy_sections, parse_error = parse_landing_response(response_text)
+            parse_stage["ok"] = parse_error is None
+            if page_images:
+                generated_html = optimize_images(generated_html, page_images)
+        if parse_error:
+            # Jangan simpan jawaban rusak di cache, biar klik berikutnya minta ulang
+            response_cache.delete(prompt_cache_key(final_prompt, system_instruction))
+            warnings.append("Gagal parse JSON properly. Silakan coba lagi atau check API response.")
+
+        # Simpan ke riwayat, sesi cukup pegang id-nya
+        saved_generation_id = generation_store.save(
+            {
+                "product_name": request["product_name"], "product_type": request["product_type"], "tone": request["tone"],
+                "harga_coret": request["harga_coret"], "harga_jual": request["harga_jual"],
+                "hero_image": request["hero_image"], "product_image": request["product_image"],
+                "bonuses": request["bonuses"], "use_boosters": request["use_boosters"],
+                "competitor_urls": competitor_urls,
+                "ebook_file": ebook["name"] if ebook else "",
+            },
+            generated_html, copy_sections,
+            mode="template" if request["use_templates"] else "full",
+            parse_ok=parse_error is None,
+        )
+    finally:
+        trace = end_trace()
+    if trace and saved_generation_id:
+        generation_store.attach_trace(saved_generation_id, trace)
+    return {"generation_id": saved_generation_id, "parse_ok": parse_error is None,
+            "warnings": warnings, "trace": trace}
+
+
+def run_section_job(job, generation_id, section_name, instruction, keys, generation_store, force=False):
+    """Generate ulang satu section dari hasil tersimpan sebagai versi baru. Return dict seperti run_landing_job."""
+    on_quota_wait = lambda wait: job.partial(quota_wait=wait)
+    start_trace("section")
+    saved_generation_id = None
+    try:
+        generation = generation_store.load(generation_id)
+        if generation is None:
+            raise ValueError(f"Hasil generate #{generation_id} tidak ditemukan.")
+        job.progress(0.1, f"Menulis ulang section {SECTION_LABELS[section_name]}...")
+        with stage("gemini", section=section_name), scheduling(on_wait=on_quota_wait):
+            new_html = regenerate_section(generation["html"], section_name, generation["inputs"], keys,
+                                          instruction=instruction, force=force)
+        job.check_cancelled()
+        job.progress(0.9, "Menyimpan versi baru...")
+        saved_generation_id = generation_store.save(
+            dict(generation["inputs"], parent_id=generation["id"], regenerated_section=section_name),
+            new_html, generation["copy_sections"], mode=generation["mode"], parse_ok=generation["parse_ok"],
+        )
+    finally:
+        trace = end_trace()
+    if trace and saved_generation_id:
+        generation_store.attach_trace(saved_generation_id, trace)
+    return {"generation_id": saved_generation_id, "parse_ok": True, "warnings": [], "trace": trace,
+            "section": section_name}
@@ -0,0 +1,213 @@
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# --- MOCK GEMINI ---
+# Server lokal yang meniru REST API Gemini (generateContent & streamGenerateContent) supaya
+# pipeline generate bisa diukur tanpa kuota dan tanpa jaringan. Latency, error 429 (kuota)
+# dan 403 (key leaked) bisa diatur per key. Halaman kompetitor fixture juga disajikan dari
+# sini (GET /pages/...), jadi scraper ikut diukur lewat HTTP sungguhan.
+#
+# Pakai: python mock_gemini.py --port 8765 --latency 0.8
+#        GEMINI_API_ENDPOINT=http://127.0.0.1:8765 streamlit run app.py
+
+GENERATE_PATH = re.compile(r"^/v1beta/models/([^/:]+):(generateContent|streamGenerateContent)")
+
+LEAKED_MESSAGE = "Your API key was reported as leaked. Please use another API key."
+QUOTA_MESSAGE = "Resource has been exhausted (e.g. check quota). Please retry in 20s."
+
+
+def landing_response_text(prompt):
+    # Jawaban berbentuk sama dengan output model: JSON copywriting + html_code
+    headline = f"Headline untuk {len(prompt)} karakter prompt"
+    body = "<section class='py-6'><p class='mb-3'>Paragraf contoh.</p></section>\n" * 40
+    return json.dumps({
+        "copywriting": {
+            "headline": headline,
+            "subheadline": "Subheadline contoh",
+            "body_copy": "Cerita singkat produk.",
+            "benefits": ["Manfaat 1", "Manfaat 2", "Manfaat 3"],
+            "cta": "Beli Sekarang",
+            "guarantee": "Garansi 30 hari",
+        },
+        "html_code": f"<!DOCTYPE html><html><head><title>{headline}</title></head><body>{body}</body></html>",
+    }, ensure_ascii=False)
+
+
+class MockConfig:
+    def __init__(self, latency=0.5, jitter=0.2, rate_limit=0.0, leaked_keys=(),
+                 rate_limited_keys=(), slow_keys=(), slow_factor=4.0, chunk_size=400, chunk_delay=0.02):
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit = rate_limit                 # peluang 429 untuk key mana pun
+        self.leaked_keys = set(leaked_keys)          # selalu 403 leaked
+        self.rate_limited_keys = set(rate_limited_keys)  # selalu 429
+        self.slow_keys = set(slow_keys)              # latency x slow_factor
+        self.slow_factor = slow_factor
+        self.chunk_size = chunk_size
+        self.chunk_delay = chunk_delay
+        self.pages = {}                              # path -> html (fixture kompetitor)
+        self.lock = threading.Lock()
+        self.calls = {}                              # (key, status) -> jumlah
+
+    def count(self, key, status):
+        with self.lock:
+            self.calls[(key, status)] = self.calls.get((key, status), 0) + 1
+
+    def delay_for(self, key):
+        delay = max(0.0, random.gauss(self.latency, self.jitter))
+        if key in self.slow_keys:
+            delay *= self.slow_factor
+        return delay
+
+
+def usage_metadata(prompt, text):
+    prompt_tokens = max(1, len(prompt) // 4)
+    output_tokens = max(1, len(text) // 4)
+    return {"promptTokenCount": prompt_tokens, "candidatesTokenCount": output_tokens,
+            "totalTokenCount": prompt_tokens + output_tokens}
+
+
+def candidate(text, finish=True):
+    entry = {"content": {"parts": [{"text": text}], "role": "model"}, "index": 0}
+    if finish:
+        entry["finishReason"] = "STOP"
+    return entry
+
+
+def prompt_text(request):
+    parts = []
+    for content in request.get("contents", []):
+        for part in content.get("parts", []):
+            parts.append(part.get("text", ""))
+    return "".join(parts)
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    config = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=UTF-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status, message, reason):
+        self._send_json(status, {"error": {"code": status, "message": message, "status": reason}})
+
+    def do_GET(self):
+        page = self.config.pages.get(self.path.split("?")[0])
+        if page is None:
+            self.send_error(404)
+            return
+        body = page.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        request = json.loads(self.rfile.read(length) or b"{}")
+        key = self.headers.get("x-goog-api-key") or ""
+        config = self.config
+
+        if self.path.startswith("/v1beta/cachedContents"):
+            # Sama seperti Gemini untuk instruksi pendek: terlalu kecil untuk di-cache
+            self._send_error(400, "Cached content is too small. min_total_token_count=4096", "INVALID_ARGUMENT")
+            return
+
+        match = GENERATE_PATH.match(self.path)
+        if not match:
+            self._send_error(404, f"Unknown path {self.path}", "NOT_FOUND")
+            return
+
+        if key in config.leaked_keys:
+            config.count(key, 403)
+            self._send_error(403, LEAKED_MESSAGE, "PERMISSION_DENIED")
+            return
+        if key in config.rate_limited_keys or random.random() < config.rate_limit:
+            config.count(key, 429)
+            time.sleep(config.delay_for(key) * 0.1)
+            self._send_error(429, QUOTA_MESSAGE, "RESOURCE_EXHAUSTED")
+            return
+
+        prompt = prompt_text(request)
+        text = landing_response_text(prompt)
+        config.count(key, 200)
+        if match.group(2) == "generateContent":
+            time.sleep(config.delay_for(key))
+            self._send_json(200, {"candidates": [candidate(text)], "usageMetadata": usage_metadata(prompt, text)})
+        else:
+            self._stream(prompt, text, config.delay_for(key))
+
+    def _stream(self, prompt, text, first_delay):
+        # REST streamGenerateContent (tanpa alt=sse) = satu JSON array yang dikirim bertahap
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=UTF-8")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        def write(data):
+            raw = data.encode("utf-8")
+            self.wfile.write(f"{len(raw):X}\r\n".encode("ascii") + raw + b"\r\n")
+            self.wfile.flush()
+
+        time.sleep(first_delay)
+        pieces = [text[i:i + self.config.chunk_size] for i in range(0, len(text), self.config.chunk_size)]
+        write("[")
+        for i, piece in enumerate(pieces):
+            last = i == len(pieces) - 1
+            item = {"candidates": [candidate(piece, finish=last)]}
+            if last:
+                item["usageMetadata"] = usage_metadata(prompt, text)
+            write(("," if i else "") + json.dumps(item))
+            if not last:
+                time.sleep(self.config.chunk_delay)
+        write("]")
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+
+def start_mock_server(config, host="127.0.0.1", port=0):
+    """Jalankan mock di thread daemon. Return (server, base_url)."""
+    handler = type("ConfiguredMockHandler", (MockHandler,), {"config": config})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True, name="mock-gemini").start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mock lokal Gemini generateContent untuk benchmark / uji offline.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.5, help="Rata-rata latency per request (detik)")
+    parser.add_argument("--jitter", type=float, default=0.2)
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="Peluang 429 per request (0-1)")
+    parser.add_argument("--leaked-key", action="append", default=[], help="Key yang selalu dibalas 403 leaked")
+    args = parser.parse_args()
+
+    config = MockConfig(latency=args.latency, jitter=args.jitter, rate_limit=args.rate_limit,
+                        leaked_keys=args.leaked_key)
+    server, url = start_mock_server(config, port=args.port)
+    print(f"Mock Gemini jalan di {url} (set GEMINI_API_ENDPOINT={url})")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
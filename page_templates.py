@@ -0,0 +1,366 @@
+import re
+from html import escape
+from string import Template
+
+from sections import marked
+
+# --- PAGE TEMPLATES ---
+# Mode "Hemat": AI cukup menulis copywriting + isi tiap section (JSON kecil),
+# HTML-nya dirakit di sini dari template yang sudah disiapkan sekali saat import.
+# Desainnya mengikuti aturan yang sama dengan prompt Full AI (putih bersih,
+# pricing card premium, FAQ accordion). Tiap section dibungkus marker NAMA_START / NAMA_END
+# (lihat sections.py) supaya bisa di-generate ulang satu per satu.
+
+SENTENCE_SPLIT = re.compile(r'(?<=[.!?])\s+(?=\S)')
+
+PAGE = Template("""<!DOCTYPE html>
+<html lang="id">
+<head>
+<meta charset="UTF-8">
+<meta name="viewport" content="width=device-width, initial-scale=1.0">
+<title>$title</title>
+<script src="https://cdn.tailwindcss.com"></script>
+<style>
+  * {
+    word-wrap: break-word;
+    overflow-wrap: break-word;
+    -webkit-hyphens: auto;
+    hyphens: auto;
+  }
+
+  body {
+    font-size: 16px;
+    line-height: 1.6;
+    font-family: Inter, system-ui, sans-serif;
+  }
+
+  h1, h2, h3 {
+    word-break: keep-all;
+    overflow-wrap: normal;
+  }
+
+  @media (max-width: 768px) {
+    h1 {
+      font-size: 1.5rem !important; /* 24px */
+      line-height: 1.3 !important;
+    }
+
+    h2 {
+      font-size: 1.25rem !important; /* 20px */
+      line-height: 1.4 !important;
+    }
+
+    p {
+      font-size: 1rem !important; /* 16px */
+      line-height: 1.625 !important;
+      margin-bottom: 1rem !important;
+    }
+
+    /* JARAK MINIMAL KIRI/KANAN - 2px */
+    body {
+      padding-left: 2px !important;
+      padding-right: 2px !important;
+      margin: 0 !important;
+    }
+
+    .container, section, div {
+      padding-left: 2px !important;
+      padding-right: 2px !important;
+    }
+  }
+</style>
+</head>
+<body class="bg-white text-gray-700">
+<main class="max-w-7xl mx-auto">
+$sections
+</main>
+</body>
+</html>
+""")
+
+SECTION = Template("""<section class="bg-white py-6 my-4 border-b border-gray-200">
+<div class="max-w-3xl mx-auto">
+$body
+</div>
+</section>""")
+
+HERO = Template("""<h1 class="text-2xl font-semibold text-gray-900 text-center mb-3">$headline</h1>
+$subheadline
+$image""")
+
+PRICING_CARD = Template("""<div class="w-[90%] max-w-md mx-auto bg-white rounded-3xl shadow-2xl overflow-hidden border-2 border-blue-100 relative mt-8">
+    <!-- Header Card -->
+    <div class="bg-gradient-to-r from-blue-600 to-indigo-700 py-4 px-6 text-center">
+        <span class="text-white font-bold tracking-wider text-sm uppercase">$offer_label</span>
+    </div>
+
+    <!-- Body Card -->
+    <div class="p-8 text-center">
+        <!-- Harga Coret -->
+        <p class="text-gray-400 text-lg mb-1">Harga Normal</p>
+        <p class="text-2xl text-gray-400 line-through font-medium mb-4">$harga_coret</p>
+
+        <!-- Harga Jual -->
+        <div class="mb-6">
+            <span class="bg-red-100 text-red-700 px-3 py-1 rounded-full text-sm font-bold mb-2 inline-block">$discount_label</span>
+            <p class="text-5xl font-extrabold text-gray-900 mt-2 tracking-tight">$harga_jual</p>
+        </div>
+
+        <!-- Value Comparison -->
+        <p class="text-gray-600 text-sm mb-6 italic border-t border-gray-100 pt-4">
+            $value_line
+        </p>
+
+        <!-- Garansi Badge -->
+        <div class="flex items-center justify-center gap-2 text-green-600 font-semibold bg-green-50 py-3 rounded-xl">
+            <svg xmlns="http://www.w3.org/2000/svg" class="h-5 w-5" viewBox="0 0 20 20" fill="currentColor"><path fill-rule="evenodd" d="M10 18a8 8 0 100-16 8 8 0 000 16zm3.707-9.293a1 1 0 00-1.414-1.414L9 10.586 7.707 9.293a1 1 0 00-1.414 1.414l2 2a1 1 0 001.414 0l4-4z" clip-rule="evenodd"/></svg>
+            <span>$guarantee</span>
+        </div>
+    </div>
+</div>""")
+
+FAQ_ITEM = Template("""<details class="border-b border-gray-200 py-3">
+<summary class="cursor-pointer font-semibold text-gray-900">$question</summary>
+<p class="mt-2 text-gray-700">$answer</p>
+</details>""")
+
+TRUST_BADGES = Template("""<div class="grid grid-cols-1 sm:grid-cols-3 gap-3 text-center text-sm font-medium text-gray-700">
+$badges
+</div>""")
+
+
+# --- CONTENT SHAPE ---
+# Bentuk JSON yang diharapkan dari AI (lihat CONTENT_SCHEMA_* di generator.py). Model kadang
+# menulis string di tempat object (atau sebaliknya); semuanya diseragamkan dulu di sini supaya
+# renderer cukup memakai .get() tanpa takut AttributeError.
+# Field object: (dict, field tujuan kalau AI menulis string saja, bentuk isi object-nya)
+CONTENT_SHAPE = {
+    "copywriting": (dict, "body_copy", {
+        "headline": str, "subheadline": str, "body_copy": str, "benefits": list, "cta": str, "guarantee": str,
+    }),
+    "sections": (dict, None, {
+        "hero": (dict, "headline", {"headline": str, "subheadline": str}),
+        "agitation": (dict, "paragraphs", {"question": str, "paragraphs": list}),
+        "offer": (dict, "text", {"label": str, "text": str}),
+        "story": list, "solution": list, "what_you_get": list, "why_now": list,
+        "bonus_descriptions": list, "trust_badges": list, "faq": list, "benefits": list, "testimonials": list,
+        "value_line": str,
+    }),
+}
+
+
+def _flatten(value):
+    if isinstance(value, dict):
+        value = list(value.values())
+    if isinstance(value, list):
+        return " ".join(_flatten(v) for v in value if v is not None).strip()
+    return "" if value is None else str(value)
+
+
+def _normalize(value, shape, path, problems):
+    kind = shape[0] if isinstance(shape, tuple) else shape
+    if value is None:
+        return {} if kind is dict else [] if kind is list else ""
+    if kind is dict:
+        _, text_field, fields = shape
+        if isinstance(value, dict):
+            result = dict(value)
+        else:
+            problems.append(path)
+            result = {}
+            if isinstance(value, str) and text_field:
+                result[text_field] = value
+            elif isinstance(value, list):
+                # Object yang dibungkus list: pakai elemen object pertamanya
+                result = dict(next((v for v in value if isinstance(v, dict)), {}))
+        for name, field_shape in fields.items():
+            if name in result:
+                result[name] = _normalize(result[name], field_shape, f"{path}.{name}", problems)
+        return result
+    if kind is list:
+        if isinstance(value, list):
+            return value
+        if isinstance(value, (str, int, float)):
+            return [value]
+        problems.append(path)
+        return [value] if isinstance(value, dict) else []
+    if isinstance(value, (dict, list)):
+        problems.append(path)
+    return _flatten(value)
+
+
+def normalize_content(content):
+    """Seragamkan bentuk JSON konten. Return (content, problems); problems = path field yang salah tipe."""
+    problems = []
+    content = _normalize(content, (dict, None, CONTENT_SHAPE), "content", problems)
+    return content, [path.split(".", 1)[-1] for path in problems]
+
+
+# --- RENDER HELPERS ---
+def _text(value):
+    return escape(str(value or "").strip())
+
+
+def _list(value):
+    if isinstance(value, str):
+        return [value] if value.strip() else []
+    return [v for v in (value or []) if v]
+
+
+def paragraphs(items):
+    # Aturan copy: satu kalimat per <p>
+    html = []
+    for item in _list(items):
+        for sentence in SENTENCE_SPLIT.split(str(item).strip()):
+            html.append(f'<p class="text-base leading-relaxed mb-3">{_text(sentence)}</p>')
+    return "\n".join(html)
+
+
+def heading(text):
+    return f'<h2 class="text-xl font-medium text-gray-900 mb-4">{_text(text)}</h2>'
+
+
+def bullet_list(items):
+    rows = "\n".join(
+        f'<li class="flex gap-2"><span class="text-teal-500 font-bold">&#10003;</span><span>{_text(item)}</span></li>'
+        for item in _list(items)
+    )
+    return f'<ul class="space-y-2 text-base">\n{rows}\n</ul>'
+
+
+def image_tag(src, placeholder, alt, classes):
+    return f'<img src="{escape(src or placeholder, quote=True)}" class="{classes}" alt="{alt}">'
+
+
+def section(body):
+    return SECTION.substitute(body=body)
+
+
+def hero_section(hero, hero_img_html):
+    hero = hero or {}
+    subheadline = hero.get("subheadline")
+    return section(HERO.substitute(
+        headline=_text(hero.get("headline")),
+        subheadline=f'<p class="text-lg text-gray-700 text-center mb-3">{_text(subheadline)}</p>' if subheadline else "",
+        image=hero_img_html,
+    ))
+
+
+def bonus_section(bonuses, descriptions):
+    if not bonuses:
+        return ""
+    descriptions = _list(descriptions)
+    cards = []
+    for i, bonus in enumerate(bonuses):
+        desc = descriptions[i] if i < len(descriptions) else ""
+        cards.append(
+            f'<div class="bg-white border border-gray-200 rounded-xl p-4 shadow-sm hover:shadow-md">'
+            f'<p class="font-semibold text-gray-900">🎁 Bonus #{i + 1}: {_text(bonus)}</p>'
+            + (f'<p class="text-sm text-gray-700 mt-1">{_text(desc)}</p>' if desc else "")
+            + '</div>'
+        )
+    return section(heading("Bonus Eksklusif Untuk Anda") + '\n<div class="grid gap-3">\n' + "\n".join(cards) + "\n</div>")
+
+
+def trust_section(badges):
+    badges = _list(badges) or ["Garansi 30 Hari Uang Kembali", "Pembayaran Aman", "Akses Instan"]
+    items = "\n".join(f'<div class="border border-gray-200 rounded-xl py-3">{_text(b)}</div>' for b in badges[:3])
+    return section(TRUST_BADGES.substitute(badges=items))
+
+
+def faq_section(faq):
+    items = []
+    for entry in faq or []:
+        if isinstance(entry, dict) and entry.get("q"):
+            items.append(FAQ_ITEM.substitute(question=_text(entry.get("q")), answer=_text(entry.get("a"))))
+    if not items:
+        return ""
+    return section(heading("Pertanyaan yang Sering Ditanyakan") + "\n" + "\n".join(items))
+
+
+# --- LAYOUTS ---
+def render_ebook(content, product):
+    s = content.get("sections", {})
+    copy = content.get("copywriting", {})
+    hero_img_html = image_tag(product.get("hero_image"), "https://placehold.co/600x400/e2e8f0/475569?text=Hero+Image", "Hero", "w-full max-w-lg mx-auto rounded-2xl shadow-xl my-8")
+    product_img_html = image_tag(product.get("product_image"), "https://placehold.co/500x400/e2e8f0/475569?text=Product+Image", "Product", "w-full max-w-md mx-auto rounded-2xl shadow-lg my-6")
+
+    parts = [
+        marked("HERO", hero_section(s.get("hero") or {"headline": copy.get("headline"), "subheadline": copy.get("subheadline")}, hero_img_html)),
+        marked("STORY", section(paragraphs(s.get("story")))),
+        marked("SOLUTION", section(heading(f"Solusi: {product['product_name']}") + "\n" + product_img_html + "\n" + paragraphs(s.get("solution")))),
+        marked("WHAT_YOU_GET", section(heading("Apa yang Akan Anda Dapatkan") + "\n" + bullet_list(s.get("what_you_get") or copy.get("benefits")))),
+        marked("WHY_NOW", section(heading("Kenapa Ini Penting") + "\n" + paragraphs(s.get("why_now")))),
+        marked("BONUS", bonus_section(product.get("bonuses"), s.get("bonus_descriptions"))),
+        marked("PRICING", section(PRICING_CARD.substitute(
+            offer_label="✨ Penawaran Spesial Terbatas",
+            harga_coret=_text(product.get("harga_coret") or "Rp 1.150.000"),
+            discount_label=_text(product["discount_label"]),
+            harga_jual=_text(product.get("harga_jual") or "Rp 99.000"),
+            value_line=_text(s.get("value_line") or "Cuma seharga 2 gelas kopi, tapi ilmunya bisa dipakai seumur hidup untuk karirmu!"),
+            guarantee=_text(copy.get("guarantee") or "Garansi 30 Hari Uang Kembali"),
+        ))),
+    ]
+    if product.get("use_boosters", True):
+        parts.append(marked("TRUST", trust_section(s.get("trust_badges"))))
+        parts.append(marked("FAQ", faq_section(s.get("faq"))))
+    return parts
+
+
+def render_physical(content, product):
+    s = content.get("sections", {})
+    copy = content.get("copywriting", {})
+    hero_img_html = image_tag(product.get("hero_image"), "https://placehold.co/600x400/e2e8f0/475569?text=Product+Image", "Hero", "w-full max-w-lg mx-auto rounded-2xl shadow-xl my-8")
+    product_img_html = image_tag(product.get("product_image"), "https://placehold.co/500x400/e2e8f0/475569?text=Product+Detail", "Product", "w-full max-w-md mx-auto rounded-2xl shadow-lg my-6")
+
+    agitation = s.get("agitation") or {}
+    benefit_cards = "\n".join(
+        f'<div class="bg-white border border-gray-200 rounded-xl p-4 shadow-sm hover:shadow-md">'
+        f'<p class="text-2xl mb-2">{_text(b.get("icon"))}</p>'
+        f'<p class="font-semibold text-gray-900">{_text(b.get("title"))}</p>'
+        f'<p class="text-sm text-gray-700">{_text(b.get("text"))}</p></div>'
+        for b in s.get("benefits") or [] if isinstance(b, dict)
+    )
+    testimonials = "\n".join(
+        f'<div class="bg-white border border-gray-200 rounded-xl p-4 shadow-sm text-center">'
+        f'<img src="https://placehold.co/80x80/e2e8f0/475569?text={escape(str(t.get("name", "?"))[:1], quote=True)}" class="w-16 h-16 rounded-full mx-auto mb-2" alt="{_text(t.get("name"))}">'
+        f'<p class="font-semibold text-gray-900">{_text(t.get("name"))}</p>'
+        f'<p class="text-sm text-gray-700">{_text(t.get("text"))}</p></div>'
+        for t in s.get("testimonials") or [] if isinstance(t, dict)
+    )
+    offer = s.get("offer") or {}
+
+    parts = [
+        marked("HERO", hero_section(s.get("hero") or {"headline": copy.get("headline")}, hero_img_html)),
+        marked("STORY", section(
+            (f'<h2 class="text-xl font-medium text-gray-900 mb-4">{_text(agitation.get("question"))}</h2>\n' if agitation.get("question") else "")
+            + paragraphs(agitation.get("paragraphs"))
+        )),
+        marked("SOLUTION", section(product_img_html + "\n" + paragraphs(s.get("solution")))),
+        marked("WHAT_YOU_GET", section(heading("Keunggulan Produk") + f'\n<div class="grid grid-cols-2 md:grid-cols-4 gap-3">\n{benefit_cards}\n</div>')),
+        marked("SOCIAL_PROOF", section(heading("Kata Mereka yang Sudah Pakai") + f'\n<div class="grid md:grid-cols-3 gap-3">\n{testimonials}\n</div>')),
+        marked("BONUS", bonus_section(product.get("bonuses"), s.get("bonus_descriptions"))),
+        marked("PRICING", section(PRICING_CARD.substitute(
+            offer_label=_text(offer.get("label") or "🔥 Promo Terbatas"),
+            harga_coret=_text(product.get("harga_coret") or "Harga Tinggi"),
+            discount_label=_text(product["discount_label"]),
+            harga_jual=_text(product.get("harga_jual") or "Harga Promo"),
+            value_line=_text(offer.get("text") or "Stok promo terbatas, harga bisa naik sewaktu-waktu."),
+            guarantee=_text(copy.get("guarantee") or "Garansi 30 Hari Uang Kembali"),
+        ))),
+    ]
+    if product.get("use_boosters", True):
+        parts.append(marked("TRUST", trust_section(s.get("trust_badges"))))
+        parts.append(marked("FAQ", faq_section(s.get("faq"))))
+    return parts
+
+
+def render_landing_page(content, product):
+    """content: JSON dari AI (copywriting + sections). product: data dari form."""
+    content, _ = normalize_content(content)
+    if product["product_type"] == "Ebook / Produk Digital":
+        parts = render_ebook(content, product)
+    else:
+        parts = render_physical(content, product)
+    title = content.get("copywriting", {}).get("headline") or product["product_name"]
+    return PAGE.substitute(title=_text(title), sections="\n".join(p for p in parts if p))
@@ -0,0 +1,317 @@
+import json
+import re
+from html import escape as html_escape
+
+# --- RESPONSE PARSER ---
+# Membaca field string dari JSON output Gemini selagi masih di-stream,
+# jadi preview & copywriting bisa tampil sebelum JSON-nya lengkap.
+
+PLAIN_RUN = re.compile(r'[^"\\]+')
+KEY_SEPARATOR = re.compile(r'\s*(?::\s*)?')
+
+SIMPLE_ESCAPES = {
+    '"': '"',
+    '\\': '\\',
+    '/': '/',
+    'b': '\b',
+    'f': '\f',
+    'n': '\n',
+    'r': '\r',
+    't': '\t',
+}
+
+
+def decode_string_from(text, pos, parts):
+    """Decode isi string JSON mulai dari `pos` (setelah tanda kutip pembuka).
+
+    Hasil decode ditambahkan ke `parts`. Return (pos_baru, selesai) - kalau teks
+    berhenti di tengah string/escape, selesai=False dan pos_baru menunjuk ke bagian
+    yang belum bisa di-decode supaya bisa dilanjutkan saat chunk berikutnya datang.
+    """
+    length = len(text)
+    while pos < length:
+        match = PLAIN_RUN.match(text, pos)
+        if match:
+            parts.append(match.group(0))
+            pos = match.end()
+            continue
+        char = text[pos]
+        if char == '"':
+            return pos + 1, True
+        # Backslash escape
+        if pos + 1 >= length:
+            break
+        esc = text[pos + 1]
+        if esc == 'u':
+            if pos + 6 > length:
+                break
+            try:
+                parts.append(chr(int(text[pos + 2:pos + 6], 16)))
+            except ValueError:
+                parts.append(text[pos:pos + 6])
+            pos += 6
+        else:
+            parts.append(SIMPLE_ESCAPES.get(esc, esc))
+            pos += 2
+    return pos, False
+
+
+def join_parts(parts):
+    value = "".join(parts)
+    # 🚀 (emoji) ter-decode jadi 2 surrogate, gabungkan lagi
+    try:
+        return value.encode("utf-16", "surrogatepass").decode("utf-16")
+    except UnicodeDecodeError:
+        return value
+
+
+class StreamingFieldParser:
+    def __init__(self, fields):
+        self.buffer = ""
+        self.fields = {}
+        for field in fields:
+            self.fields[field] = {
+                "key": '"' + field + '"',
+                "pattern": re.compile(r'"' + re.escape(field) + r'"\s*:\s*"'),
+                "scan": 0,      # field belum ketemu: posisi buffer tempat pencarian dilanjutkan
+                "pos": None,
+                "parts": [],
+                "done": False,
+            }
+
+    def feed(self, chunk):
+        self.buffer += chunk
+        for state in self.fields.values():
+            if state["done"]:
+                continue
+            if state["pos"] is None:
+                state["pos"] = self._find_value(state)
+                if state["pos"] is None:
+                    continue
+            state["pos"], state["done"] = decode_string_from(self.buffer, state["pos"], state["parts"])
+        self._trim()
+
+    def _find_value(self, state):
+        # Cari `"field": "` mulai dari scan terakhir, bukan dari awal buffer di setiap chunk
+        key = state["key"]
+        while True:
+            start = self.buffer.find(key, state["scan"])
+            if start == -1:
+                # Kuncinya bisa saja terpotong di ujung buffer: sisakan sepanjang kunci itu
+                state["scan"] = max(state["scan"], len(self.buffer) - len(key) + 1)
+                return None
+            match = state["pattern"].match(self.buffer, start)
+            if match:
+                return match.end()
+            if KEY_SEPARATOR.match(self.buffer, start + len(key)).end() == len(self.buffer):
+                # `"field" :` belum lengkap, tunggu chunk berikutnya
+                state["scan"] = start
+                return None
+            state["scan"] = start + 1
+
+    def _trim(self):
+        # Buang awal buffer yang sudah dilewati semua field yang belum selesai, jadi
+        # buffer (dan penyambungan chunk) tidak ikut membesar sepanjang respons
+        marks = [state["scan"] if state["pos"] is None else state["pos"]
+                 for state in self.fields.values() if not state["done"]]
+        cut = min(marks, default=len(self.buffer))
+        if not cut:
+            return
+        self.buffer = self.buffer[cut:]
+        for state in self.fields.values():
+            if state["done"]:
+                continue
+            if state["pos"] is None:
+                state["scan"] -= cut
+            else:
+                state["pos"] -= cut
+
+    def value(self, field):
+        return join_parts(self.fields[field]["parts"])
+
+    def is_done(self, field):
+        return self.fields[field]["done"]
+
+    def has_started(self, field):
+        return self.fields[field]["pos"] is not None
+
+
+# --- FULL RESPONSE DECODER ---
+# Satu kali jalan di atas teks respons: buang fence markdown, json.loads, dan kalau
+# gagal, perbaiki kesalahan JSON yang umum dibuat LLM lalu coba lagi. Tidak ada lagi
+# .encode().decode('unicode_escape') yang merusak teks Indonesia & emoji.
+
+COPY_FIELDS = ("headline", "subheadline", "body_copy", "cta", "guarantee")
+STRING_RUN = re.compile(r'[^"\\\x00-\x1f]+')
+CONTROL_ESCAPES = {"\n": "\\n", "\r": "\\r", "\t": "\\t", "\b": "\\b", "\f": "\\f"}
+BENEFITS_ARRAY = re.compile(r'"benefits"\s*:\s*\[')
+RAW_HTML = re.compile(r'<!DOCTYPE html>.*?(?:</html>|$)', re.DOTALL | re.IGNORECASE)
+
+_decoder = json.JSONDecoder()
+
+
+def extract_json_body(text):
+    # Mulai dari "{" / "[" pertama; sisa di belakang (fence ```, teks penutup) diabaikan raw_decode
+    starts = [i for i in (text.find("{"), text.find("[")) if i != -1]
+    if not starts:
+        return ""
+    body = text[min(starts):].rstrip()
+    if body.endswith("```"):
+        body = body[:-3].rstrip()
+    return body
+
+
+def _drop_trailing_comma(out):
+    while out and out[-1] in (" ", "\n", "\r", "\t"):
+        out.pop()
+    if out and out[-1] == ",":
+        out.pop()
+
+
+def repair_json(text):
+    """Perbaiki kesalahan JSON yang sering dibuat LLM, dalam satu kali scan:
+    - newline / tab mentah di dalam string
+    - tanda kutip di dalam string yang tidak di-escape (mis. atribut HTML class="...")
+    - escape tidak valid (\\. , \\')
+    - koma berlebih sebelum } atau ]
+    - output terpotong (string / kurung belum ditutup)
+    """
+    out = []
+    stack = []
+    in_string = False
+    i = 0
+    n = len(text)
+    while i < n:
+        if in_string:
+            match = STRING_RUN.match(text, i)
+            if match:
+                out.append(match.group(0))
+                i = match.end()
+                continue
+            char = text[i]
+            if char == "\\":
+                if i + 1 < n and text[i + 1] in '"\\/bfnrtu':
+                    out.append(text[i:i + 2])
+                    i += 2
+                elif i + 1 < n and text[i + 1] == "'":
+                    out.append("'")
+                    i += 2
+                else:
+                    # Escape tidak dikenal (mis. "Rp 99\.000"): buang backslash-nya
+                    i += 1
+                continue
+            if char == '"':
+                # Kutip penutup asli selalu diikuti , } ] atau : (setelah spasi)
+                j = i + 1
+                while j < n and text[j] in " \t\r\n":
+                    j += 1
+                if j >= n or text[j] in ",}]:":
+                    in_string = False
+                    out.append('"')
+                else:
+                    out.append('\\"')
+                i += 1
+                continue
+            out.append(CONTROL_ESCAPES.get(char, "\\u%04x" % ord(char)))
+            i += 1
+            continue
+
+        char = text[i]
+        if char == '"':
+            in_string = True
+        elif char in "{[":
+            stack.append("}" if char == "{" else "]")
+        elif char in "}]":
+            _drop_trailing_comma(out)
+            if stack:
+                stack.pop()
+        out.append(char)
+        i += 1
+
+    if in_string:
+        out.append('"')
+    while stack:
+        _drop_trailing_comma(out)
+        out.append(stack.pop())
+    return "".join(out)
+
+
+def salvage_fields(body):
+    # JSON tetap rusak: ambil field yang bisa diambil satu per satu
+    parser = StreamingFieldParser(("html_code",) + COPY_FIELDS)
+    parser.feed(body)
+    copywriting = {f: parser.value(f) for f in COPY_FIELDS if parser.has_started(f)}
+
+    match = BENEFITS_ARRAY.search(body)
+    if match:
+        benefits = []
+        pos = match.end()
+        while True:
+            while pos < len(body) and body[pos] in " \t\r\n,":
+                pos += 1
+            if pos >= len(body) or body[pos] != '"':
+                break
+            parts = []
+            pos, done = decode_string_from(body, pos + 1, parts)
+            benefits.append(join_parts(parts))
+            if not done:
+                break
+        copywriting["benefits"] = benefits
+
+    data = {"copywriting": copywriting}
+    if parser.has_started("html_code"):
+        data["html_code"] = parser.value("html_code")
+    return data
+
+
+def close_html(html):
+    # Output terpotong: tutup tag utama supaya preview tetap tampil rapi
+    lower_tail = html[-200:].lower()
+    if html and "<html" in html[:500].lower() and "</html>" not in lower_tail:
+        if "</body>" not in lower_tail:
+            html += "\n</body>"
+        html += "\n</html>"
+    return html
+
+
+def decode_json_response(text):
+    """Return (data, error, repaired). error None kalau JSON bisa dibaca (langsung atau setelah diperbaiki)."""
+    body = extract_json_body(text)
+    error = None
+    repaired = False
+    try:
+        data, _ = _decoder.raw_decode(body)
+    except json.JSONDecodeError as e:
+        try:
+            data, _ = _decoder.raw_decode(repair_json(body))
+            repaired = True
+        except json.JSONDecodeError:
+            data = salvage_fields(body)
+            error = e
+
+    # Handle if AI returns list
+    if isinstance(data, list):
+        data = data[0] if data else {}
+    if not isinstance(data, dict):
+        data = {}
+    return data, error, repaired
+
+
+def decode_landing_response(text):
+    """Return (html_code, copywriting, error, repaired)."""
+    data, error, repaired = decode_json_response(text)
+
+    generated_html = data.get("html_code") or ""
+    copy_sections = data.get("copywriting") or {}
+    if not isinstance(copy_sections, dict):
+        copy_sections = {}
+
+    if not generated_html:
+        # Model kadang langsung menulis HTML tanpa JSON
+        match = RAW_HTML.search(text)
+        if match:
+            generated_html = match.group(0)
+        elif error is not None:
+            generated_html = f"<html><body><h1>JSON Parse Error</h1><pre>{html_escape(text[:1000])}</pre></body></html>"
+
+    return close_html(generated_html), copy_sections, error, repaired
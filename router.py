@@ -0,0 +1,97 @@
+import threading
+from collections import deque
+
+from key_pool import key_id
+
+# --- MODEL ROUTER ---
+# Mencatat latency & error rate tiap rute (key x model) dari request-request terakhir,
+# lalu mengurutkan rute: yang sehat & tidak lambat dulu. Model kedua di key yang sama
+# ditaruh di belakang semua key lain, jadi satu key bermasalah tidak lagi memakan dua
+# kegagalan berturut-turut. p95 tiap rute juga dipakai sebagai batas waktu hedging.
+
+WINDOW = 50               # jumlah request terakhir yang dihitung per rute
+MIN_SAMPLES = 5           # di bawah ini statistik rute dianggap belum cukup
+MAX_ERROR_RATE = 0.5      # lebih dari ini rute dianggap tidak sehat
+SLOW_FACTOR = 1.5         # p50 > 1.5x median p50 semua rute = rute lambat
+HEDGE_PERCENTILE = 95
+MIN_HEDGE_DELAY = 5.0     # detik, jangan hedge lebih cepat dari ini
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class ModelRouter:
+    def __init__(self, models, window=WINDOW):
+        self.models = list(models)
+        self.window = window
+        self.lock = threading.Lock()
+        self.latencies = {}   # (key_id, model) -> deque detik (hanya request sukses)
+        self.outcomes = {}    # (key_id, model) -> deque True/False
+
+    def _route(self, key, model_name):
+        return (key_id(key), model_name)
+
+    def record(self, key, model_name, latency, ok):
+        route = self._route(key, model_name)
+        with self.lock:
+            self.outcomes.setdefault(route, deque(maxlen=self.window)).append(ok)
+            if ok:
+                self.latencies.setdefault(route, deque(maxlen=self.window)).append(latency)
+
+    def snapshot(self, key, model_name):
+        route = self._route(key, model_name)
+        with self.lock:
+            latencies = list(self.latencies.get(route, ()))
+            outcomes = list(self.outcomes.get(route, ()))
+        errors = outcomes.count(False)
+        return {
+            "samples": len(outcomes),
+            "p50": percentile(latencies, 50) if len(latencies) >= MIN_SAMPLES else None,
+            "p95": percentile(latencies, HEDGE_PERCENTILE) if len(latencies) >= MIN_SAMPLES else None,
+            "error_rate": errors / len(outcomes) if outcomes else 0.0,
+        }
+
+    def _is_healthy(self, stats):
+        return stats["samples"] < MIN_SAMPLES or stats["error_rate"] <= MAX_ERROR_RATE
+
+    def routes(self, keys):
+        """Urutan rute (key, model) untuk satu request.
+
+        `keys` sudah diurutkan key_pool (sehat & paling lama tidak dipakai dulu); urutan itu
+        dipertahankan supaya beban tetap tersebar, kecuali rutenya tidak sehat atau jelas lambat.
+        """
+        preferred, alternates = [], []
+        for rank, key in enumerate(keys):
+            scored = []
+            for index, model_name in enumerate(self.models):
+                stats = self.snapshot(key, model_name)
+                p50 = stats["p50"] if stats["p50"] is not None else float("inf")
+                scored.append((not self._is_healthy(stats), p50, index, model_name, stats))
+            scored.sort(key=lambda item: item[:3])
+            unhealthy, _, _, model_name, stats = scored[0]
+            preferred.append((unhealthy, rank, key, model_name, stats["p50"]))
+            for unhealthy, _, _, model_name, _ in scored[1:]:
+                alternates.append((unhealthy, rank, key, model_name))
+
+        known = [p50 for _, _, _, _, p50 in preferred if p50 is not None]
+        median = percentile(known, 50)
+
+        def is_slow(p50):
+            return median is not None and p50 is not None and p50 > median * SLOW_FACTOR
+
+        preferred.sort(key=lambda item: (item[0], is_slow(item[4]), item[1]))
+        alternates.sort(key=lambda item: (item[0], item[1]))
+        return [(key, model_name) for _, _, key, model_name, _ in preferred] + \
+               [(key, model_name) for _, _, key, model_name in alternates]
+
+    def hedge_delay(self, key, model_name):
+        # Belum ada data p95 = tidak hedge (request duplikat tetap makan kuota)
+        p95 = self.snapshot(key, model_name)["p95"]
+        if p95 is None:
+            return None
+        return max(MIN_HEDGE_DELAY, p95)
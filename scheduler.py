@@ -0,0 +1,201 @@
+import bisect
+import itertools
+import math
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from key_pool import key_id
+
+# --- QUOTA SCHEDULER ---
+# Satu penjadwal untuk seluruh proses: semua sesi browser, job, dan worker batch memakai
+# jatah RPM/TPM yang sama per API key (terutama key bersama dari st.secrets). Request yang
+# belum kebagian jatah antri di sini (interaktif didahulukan dari batch, FIFO di dalam
+# prioritas yang sama), bukan ditembakkan bersamaan lalu kena 429 semua.
+#
+# Jatah dihitung dengan sliding window 60 detik. Key yang sedang cooldown di KeyPool
+# dianggap baru tersedia setelah cooldown-nya habis. Kalau perkiraan tunggu lebih lama dari
+# batas, request langsung gagal dengan QuotaExhausted yang membawa perkiraan waktunya.
+
+WINDOW = 60                                             # detik
+KEY_RPM = int(os.environ.get("KEY_RPM", "15"))          # 0 = tanpa batas
+KEY_TPM = int(os.environ.get("KEY_TPM", "1000000"))     # 0 = tanpa batas
+OUTPUT_TOKEN_ESTIMATE = 4000        # perkiraan token output sebelum respons asli diketahui
+CHARS_PER_TOKEN = 4
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BATCH = 1
+MAX_WAIT = {
+    PRIORITY_INTERACTIVE: float(os.environ.get("QUOTA_MAX_WAIT", "180")),
+    PRIORITY_BATCH: float(os.environ.get("QUOTA_MAX_WAIT_BATCH", "1800")),
+}
+
+_local = threading.local()
+
+
+class QuotaExhausted(Exception):
+    def __init__(self, wait):
+        self.wait = wait
+        if math.isinf(wait):
+            super().__init__("429 Tidak ada API Key yang bisa dipakai.")
+        else:
+            super().__init__(f"429 Kuota API penuh, perkiraan tersedia lagi dalam ±{math.ceil(wait)} detik.")
+
+
+def estimate_tokens(prompt, system_instruction=None):
+    return (len(prompt) + len(system_instruction or "")) // CHARS_PER_TOKEN + OUTPUT_TOKEN_ESTIMATE
+
+
+@contextmanager
+def scheduling(priority=None, on_wait=None):
+    """Atur prioritas & callback on_wait(detik) untuk request Gemini di thread ini.
+
+    on_wait dipanggil selama request antri kuota, lalu on_wait(0) saat dapat giliran.
+    """
+    previous = (getattr(_local, "priority", None), getattr(_local, "on_wait", None))
+    _local.priority = priority if priority is not None else previous[0]
+    _local.on_wait = on_wait if on_wait is not None else previous[1]
+    try:
+        yield
+    finally:
+        _local.priority, _local.on_wait = previous
+
+
+def current_scheduling():
+    """(prioritas, on_wait) thread ini, untuk dipasang ulang di worker lewat scheduling(*...)."""
+    return getattr(_local, "priority", None), getattr(_local, "on_wait", None)
+
+
+def current_priority():
+    priority = getattr(_local, "priority", None)
+    return PRIORITY_INTERACTIVE if priority is None else priority
+
+
+class QuotaScheduler:
+    def __init__(self, key_pool, rpm=KEY_RPM, tpm=KEY_TPM):
+        self.key_pool = key_pool
+        self.rpm = rpm
+        self.tpm = tpm
+        self.cond = threading.Condition()
+        self.windows = {}       # key_id -> deque [waktu, token] request dalam WINDOW terakhir
+        self.waiters = []       # (prioritas, urutan, {key_id: key}), terurut
+        self.counter = itertools.count()
+
+    # --- BUDGET ---
+    def _window(self, kid, now):
+        window = self.windows.setdefault(kid, deque())
+        while window and window[0][0] <= now - WINDOW:
+            window.popleft()
+        return window
+
+    def _free_at(self, key, kid, tokens, now):
+        """Waktu paling cepat key bisa menerima request sebesar `tokens`."""
+        at = max(now, self.key_pool.available_at(key))
+        window = self._window(kid, now)
+        if self.rpm and len(window) >= self.rpm:
+            at = max(at, window[len(window) - self.rpm][0] + WINDOW)
+        if self.tpm:
+            used = sum(entry[1] for entry in window)
+            # Buang entri tertua satu per satu sampai sisa jatah cukup
+            for entry in window:
+                if used + min(tokens, self.tpm) <= self.tpm:
+                    break
+                used -= entry[1]
+                at = max(at, entry[0] + WINDOW)
+        return at
+
+    def _charge(self, kid, tokens, now):
+        ticket = [now, tokens]
+        self._window(kid, now).append(ticket)
+        return ticket
+
+    def _blocked(self, waiter, kid):
+        # Key yang juga ditunggu request di depan antrian jadi jatah request itu dulu
+        for other in self.waiters:
+            if other is waiter:
+                return False
+            if kid in other[2]:
+                return True
+        return False
+
+    def _estimate(self, keys, tokens, ahead, now):
+        free = min((self._free_at(key, kid, tokens, now) for kid, key in keys.items()), default=math.inf)
+        if math.isinf(free):
+            return math.inf
+        usable = sum(1 for key in keys.values() if not math.isinf(self.key_pool.available_at(key)))
+        per_second = usable * self.rpm / WINDOW if self.rpm else math.inf
+        return max(free - now, 0) + ahead / per_second
+
+    # --- QUEUE ---
+    def acquire(self, keys, tokens, priority=None):
+        """Tunggu giliran sampai salah satu key punya jatah. Return (key, tiket).
+
+        Key dicoba sesuai urutan `keys`. Gagal dengan QuotaExhausted kalau perkiraan
+        tunggunya melewati MAX_WAIT prioritas ini.
+        """
+        priority = current_priority() if priority is None else priority
+        on_wait = getattr(_local, "on_wait", None)
+        keys = {key_id(key): key for key in keys}
+        waiter = (priority, next(self.counter), keys)
+        deadline = time.time() + MAX_WAIT.get(priority, MAX_WAIT[PRIORITY_INTERACTIVE])
+        reported = None
+        with self.cond:
+            bisect.insort(self.waiters, waiter)
+        try:
+            while True:
+                with self.cond:
+                    now = time.time()
+                    for kid, key in keys.items():
+                        if not self._blocked(waiter, kid) and self._free_at(key, kid, tokens, now) <= now:
+                            if reported is not None:
+                                on_wait(0)
+                            return key, self._charge(kid, tokens, now)
+                    ahead = sum(1 for other in self.waiters[:self.waiters.index(waiter)] if other[2].keys() & keys.keys())
+                    wait = self._estimate(keys, tokens, ahead, now)
+                    if now + wait > deadline:
+                        raise QuotaExhausted(wait)
+                    self.cond.wait(timeout=min(max(wait, 0.05), 1.0))
+                # Callback (mis. update progres job) dipanggil di luar lock
+                if on_wait and math.ceil(wait) != reported:
+                    reported = math.ceil(wait)
+                    on_wait(wait)
+        finally:
+            with self.cond:
+                self.waiters.remove(waiter)
+                self.cond.notify_all()
+
+    def try_acquire(self, key, tokens):
+        """Ambil jatah tanpa menunggu (untuk hedge/fallback). Return tiket atau None."""
+        kid = key_id(key)
+        with self.cond:
+            now = time.time()
+            if any(kid in other[2] for other in self.waiters):
+                return None
+            if self._free_at(key, kid, tokens, now) > now:
+                return None
+            return self._charge(kid, tokens, now)
+
+    def settle(self, ticket, tokens):
+        """Koreksi perkiraan token tiket dengan pemakaian sebenarnya dari respons."""
+        with self.cond:
+            ticket[1] = tokens
+            self.cond.notify_all()
+
+    # --- STATUS ---
+    def estimate_wait(self, keys, tokens=OUTPUT_TOKEN_ESTIMATE):
+        """Perkiraan detik sampai request baru untuk `keys` dapat giliran."""
+        keys = {key_id(key): key for key in keys}
+        with self.cond:
+            ahead = sum(1 for other in self.waiters if other[2].keys() & keys.keys())
+            return self._estimate(keys, tokens, ahead, time.time())
+
+    def status(self, keys):
+        keys = {key_id(key): key for key in keys}
+        with self.cond:
+            now = time.time()
+            waiting = sum(1 for other in self.waiters if other[2].keys() & keys.keys())
+            recent = sum(len(self._window(kid, now)) for kid in keys)
+            wait = self._estimate(keys, OUTPUT_TOKEN_ESTIMATE, waiting, now)
+        return {"waiting": waiting, "requests_per_minute": recent, "wait": wait}
@@ -0,0 +1,166 @@
+import json
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+from disk_cache import DiskCache
+from text_extractor import extract_text, TEXT_BUDGET
+
+# --- SCRAPER ---
+# Mengambil teks dari landing page kompetitor untuk fitur ATM.
+# Semua request lewat satu Session (keep-alive + connection pool), dengan retry,
+# batas koneksi per host, dan batas ukuran body supaya halaman raksasa tidak bikin lemot.
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+FETCH_TIMEOUT = 10                  # detik (connect & read)
+MAX_BODY_BYTES = 3 * 1024 * 1024    # cukup untuk teks landing page, sisanya dibuang
+PER_HOST_LIMIT = 2                  # request bersamaan maksimal ke host yang sama
+MAX_PARALLEL_FETCH = 8
+
+SCRAPE_TTL = 6 * 3600                    # setelah ini, revalidasi dengan ETag / Last-Modified
+SCRAPE_CACHE_BYTES = 50 * 1024 * 1024    # total teks yang disimpan, sisanya dibuang (LRU)
+
+_session = None
+_scrape_cache = None
+_session_lock = threading.Lock()
+_host_limits = defaultdict(lambda: threading.BoundedSemaphore(PER_HOST_LIMIT))
+_host_limits_lock = threading.Lock()
+
+
+def accept_encoding():
+    try:
+        import brotli  # noqa: F401 - urllib3 otomatis decode "br" kalau paket ini ada
+        return "gzip, deflate, br"
+    except ImportError:
+        return "gzip, deflate"
+
+
+def get_session():
+    global _session
+    with _session_lock:
+        if _session is None:
+            # requests baru di-import saat pertama kali scraping, bukan saat app start
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+
+            retry = Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=("GET", "HEAD"),
+                respect_retry_after_header=True,
+            )
+            adapter = HTTPAdapter(pool_connections=20, pool_maxsize=20, max_retries=retry)
+            session = requests.Session()
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers.update({"User-Agent": USER_AGENT, "Accept-Encoding": accept_encoding()})
+            _session = session
+        return _session
+
+
+def host_limit(url):
+    with _host_limits_lock:
+        return _host_limits[urlparse(url).netloc.lower()]
+
+
+def fetch_html(url, headers=None):
+    """Download halaman (maks MAX_BODY_BYTES). Return objek response dengan .content terpotong."""
+    with host_limit(url):
+        response = get_session().get(url, headers=headers, timeout=FETCH_TIMEOUT, stream=True)
+        try:
+            response.raise_for_status()
+            body = bytearray()
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                body.extend(chunk)
+                if len(body) >= MAX_BODY_BYTES:
+                    del body[MAX_BODY_BYTES:]
+                    break
+            response._content = bytes(body)
+        finally:
+            response.close()
+    return response
+
+
+def html_to_text(content, encoding=None):
+    return extract_text(content, budget=TEXT_BUDGET, encoding=encoding)
+
+
+def response_encoding(response):
+    # requests menebak ISO-8859-1 kalau header tidak menyebut charset; lebih baik biarkan
+    # extractor membaca <meta charset> sendiri
+    if "charset=" in response.headers.get("Content-Type", "").lower():
+        return response.encoding
+    return None
+
+
+def get_scrape_cache():
+    global _scrape_cache
+    with _session_lock:
+        if _scrape_cache is None:
+            _scrape_cache = DiskCache("scrapes", ttl=SCRAPE_TTL, max_bytes=SCRAPE_CACHE_BYTES, keep_stale=True)
+        return _scrape_cache
+
+
+def scrape_content(url, use_cache=True):
+    cache = get_scrape_cache() if use_cache else None
+
+    # 1. Masih segar -> tanpa network & tanpa parsing sama sekali
+    if cache:
+        fresh = cache.get(url)
+        if fresh is not None:
+            return json.loads(fresh)["text"]
+
+    # 2. Sudah kadaluarsa -> tanya server apakah halamannya berubah (conditional GET)
+    stale = json.loads(cache.get_stale(url) or "null") if cache else None
+    headers = {}
+    if stale:
+        if stale.get("etag"):
+            headers["If-None-Match"] = stale["etag"]
+        if stale.get("last_modified"):
+            headers["If-Modified-Since"] = stale["last_modified"]
+
+    try:
+        response = fetch_html(url, headers=headers or None)
+        if response.status_code == 304 and stale:
+            cache.touch(url)
+            return stale["text"]
+
+        text = html_to_text(response.content, response_encoding(response))
+        if cache:
+            cache.set(url, json.dumps({
+                "text": text,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "fetched_at": time.time(),
+            }))
+        return text
+    except Exception as e:
+        # Server error / timeout: lebih baik pakai versi lama daripada kosong
+        if stale:
+            return stale["text"]
+        return f"Gagal scraping: {e}"
+
+
+def scrape_many(urls):
+    # Semua URL di-scrape paralel: total waktu ~ halaman paling lambat, bukan jumlah semuanya
+    urls = list(dict.fromkeys(u for u in urls if u))
+    if not urls:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(MAX_PARALLEL_FETCH, len(urls))) as executor:
+        texts = list(executor.map(scrape_content, urls))
+    return dict(zip(urls, texts))
+
+
+def format_competitor_texts(texts_by_url):
+    # Satu kompetitor: teks apa adanya (prompt sama seperti sebelumnya, cache tetap kena)
+    if len(texts_by_url) == 1:
+        return next(iter(texts_by_url.values()))
+    blocks = []
+    for i, (url, text) in enumerate(texts_by_url.items(), start=1):
+        blocks.append(f"[KOMPETITOR {i}] {url}\n{text}")
+    return "\n\n".join(blocks)
@@ -0,0 +1,55 @@
+import re
+
+# --- SECTIONS ---
+# Tiap section landing page dibungkus comment marker <!-- NAMA_START --> ... <!-- NAMA_END -->
+# (sama seperti FAQ_START / FAQ_END yang sudah ada), supaya satu section bisa diambil,
+# di-generate ulang sendirian, lalu ditempel balik ke halaman tanpa generate ulang semuanya.
+
+SECTION_LABELS = {
+    "HERO": "Hero (Headline & Gambar Utama)",
+    "STORY": "Story / Masalah",
+    "SOLUTION": "Solusi",
+    "WHAT_YOU_GET": "Apa yang Didapat / Keunggulan",
+    "WHY_NOW": "Kenapa Harus Sekarang",
+    "SOCIAL_PROOF": "Testimoni / Social Proof",
+    "BONUS": "Bonus",
+    "PRICING": "Harga (Pricing Card)",
+    "TRUST": "Trust Badges",
+    "FAQ": "FAQ",
+}
+
+MARKED_SECTION = re.compile(r"<!--\s*([A-Z_]+)_START\s*-->(.*?)<!--\s*\1_END\s*-->", re.DOTALL)
+STRAY_MARKER = re.compile(r"<!--\s*[A-Z_]+_(?:START|END)\s*-->")
+CODE_FENCE = re.compile(r"^```[a-zA-Z]*\s*|\s*```$")
+
+
+def marked(name, html):
+    if not html:
+        return ""
+    return f"<!-- {name}_START -->\n{html}\n<!-- {name}_END -->"
+
+
+def find_sections(html):
+    """Section bermarker yang ada di halaman, urut dari atas: list (nama, isi_html)."""
+    return [(m.group(1), m.group(2).strip()) for m in MARKED_SECTION.finditer(html or "")
+            if m.group(1) in SECTION_LABELS]
+
+
+def get_section(html, name):
+    for found, body in find_sections(html):
+        if found == name:
+            return body
+    return None
+
+
+def replace_section(html, name, new_body):
+    # Hanya section pertama dengan nama itu yang diganti; sisa halaman tidak disentuh
+    pattern = re.compile(r"(<!--\s*" + re.escape(name) + r"_START\s*-->)(.*?)(<!--\s*" + re.escape(name) + r"_END\s*-->)", re.DOTALL)
+    return pattern.sub(lambda m: f"{m.group(1)}\n{new_body.strip()}\n{m.group(3)}", html, count=1)
+
+
+def clean_section_output(text):
+    # Model kadang tetap membungkus dengan ```html atau ikut menulis marker-nya
+    text = CODE_FENCE.sub("", text.strip())
+    return STRAY_MARKER.sub("", text).strip()
+
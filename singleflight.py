@@ -0,0 +1,91 @@
+import os
+import threading
+
+# --- SINGLE FLIGHT ---
+# Request identik yang datang saat panggilan pertama masih berjalan (double-click tombol
+# Generate / Magic Fill, dua orang submit produk yang sama) tidak memanggil Gemini lagi:
+# mereka menunggu panggilan pertama (leader) lalu ikut menerima hasilnya. Chunk streaming
+# diteruskan ke follower begitu diterima leader, jadi preview follower tetap jalan.
+#
+# Follower tidak menunggu selamanya: kalau leader tidak mengirim chunk / selesai dalam
+# batas waktu flight-nya (diisi leader dari batas waktu request-nya sendiri), follower
+# berhenti dengan FlightTimeout.
+
+FOLLOW_TIMEOUT = float(os.environ.get("FOLLOW_TIMEOUT", "600"))
+
+
+class FlightAborted(Exception):
+    pass
+
+
+class FlightTimeout(FlightAborted):
+    pass
+
+
+class Flight:
+    def __init__(self, timeout=FOLLOW_TIMEOUT):
+        self.timeout = timeout      # detik tanpa kemajuan dari leader sebelum follower menyerah
+        self.cond = threading.Condition()
+        self.chunks = []
+        self.done = False
+        self.error = None
+
+    def publish(self, chunk):
+        with self.cond:
+            self.chunks.append(chunk)
+            self.cond.notify_all()
+
+    def finish(self, error=None):
+        if error is not None and not isinstance(error, Exception):
+            # Leader berhenti di tengah (mis. job dibatalkan): follower diberi error biasa
+            error = FlightAborted("Generate identik yang sedang ditunggu dihentikan sebelum selesai, silakan coba lagi.")
+        with self.cond:
+            self.done = True
+            self.error = error
+            self.cond.notify_all()
+
+    def follow(self):
+        """Yield chunk dari awal sampai leader selesai; error leader diteruskan ke sini."""
+        sent = 0
+        while True:
+            with self.cond:
+                progressed = self.cond.wait_for(lambda: sent < len(self.chunks) or self.done, timeout=self.timeout)
+                if not progressed:
+                    raise FlightTimeout(f"Generate identik yang sedang ditunggu tidak selesai dalam {self.timeout:.0f} detik, silakan coba lagi.")
+                chunks = self.chunks[sent:]
+                done, error = self.done, self.error
+            sent += len(chunks)
+            yield from chunks
+            if done:
+                if error is not None:
+                    raise error
+                return
+
+    def result(self):
+        return "".join(self.follow())
+
+
+class SingleFlight:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.flights = {}
+
+    def join(self, key, timeout=FOLLOW_TIMEOUT):
+        """Return (flight, leader). leader=True: pemanggil ini yang wajib menjalankan request.
+
+        timeout dipakai kalau pemanggil jadi leader: batas tunggu follower flight ini.
+        """
+        with self.lock:
+            flight = self.flights.get(key)
+            if flight is not None:
+                return flight, False
+            flight = self.flights[key] = Flight(timeout)
+            return flight, True
+
+    def finish(self, key, flight, error=None):
+        # Lepas dari daftar dulu: request yang datang setelah ini memakai cache / panggilan baru
+        with self.lock:
+            if self.flights.get(key) is flight:
+                del self.flights[key]
+        flight.finish(error)
+
@@ -0,0 +1,151 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from disk_cache import DiskCache, content_hash
+from documents import read_document_bytes, EBOOK_CHAR_BUDGET
+from generator import key_pool, generate_text, PRIMARY_MODEL
+from scheduler import scheduling, current_scheduling
+from tracing import annotate, current_trace, stage, use_trace
+
+# --- SUMMARIZER ---
+# Ebook tebal tidak lagi dipotong di 15.000 karakter pertama (yang isinya cuma
+# kata pengantar & daftar isi). Alurnya map-reduce:
+#   1. MAP    : dokumen dipecah per ~12rb karakter, tiap potongan diringkas paralel
+#   2. REDUCE : ringkasan-ringkasan digabung jadi satu digest "poin kunci"
+# Digest disimpan per hash file, jadi upload ulang file yang sama gratis.
+
+CHUNK_CHARS = 12000
+MAX_SOURCE_CHARS = 600000     # batas atas teks yang diringkas (~300 halaman padat)
+DIGEST_CHARS = EBOOK_CHAR_BUDGET
+MAX_REDUCE_INPUT = 40000
+FALLBACK_CHARS = 1500         # bagian yang tetap gagal diringkas: cuplikan awalnya dipakai apa adanya
+
+digest_cache = DiskCache("digests", ttl=30 * 24 * 3600, max_bytes=50 * 1024 * 1024)
+
+
+def split_chunks(text, size=CHUNK_CHARS):
+    # Potong di batas paragraf terdekat supaya kalimat tidak terbelah
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = min(start + size, len(text))
+        if end < len(text):
+            cut = text.rfind("\n", start + size // 2, end)
+            if cut != -1:
+                end = cut
+        chunks.append(text[start:end].strip())
+        start = end
+    return [c for c in chunks if c]
+
+
+def map_prompt(chunk, index, total):
+    return f"""
+    Kamu sedang membaca bagian {index} dari {total} sebuah ebook / materi produk.
+    Ringkas bagian ini menjadi poin-poin penting untuk bahan copywriting landing page:
+    - Masalah / pain point yang dibahas
+    - Solusi, teknik, atau langkah konkret yang diajarkan
+    - Hasil / manfaat yang dijanjikan
+    - Angka, studi kasus, atau kutipan yang menarik (tulis apa adanya)
+    Maksimal 200 kata. Tulis dalam bahasa Indonesia, HANYA poin-poin (pakai tanda -), tanpa pembuka.
+    ---
+    {chunk}
+    ---
+    """
+
+
+def reduce_prompt(summaries):
+    joined = "\n\n".join(f"[BAGIAN {i}]\n{s}" for i, s in enumerate(summaries, start=1))
+    return f"""
+    Berikut ringkasan per bagian dari sebuah ebook / materi produk.
+    Gabungkan menjadi SATU digest "POIN KUNCI" yang padat untuk bahan copywriting landing page:
+    1. Gambaran isi produk (2-3 kalimat)
+    2. Daftar materi / bab utama yang dibahas
+    3. Pain point target pembaca
+    4. Manfaat & hasil yang dijanjikan
+    5. Fakta, angka, studi kasus yang paling kuat untuk dijadikan hook
+    Hilangkan duplikasi. Maksimal 900 kata. Tulis dalam bahasa Indonesia, tanpa pembuka/penutup.
+    ---
+    {joined}
+    ---
+    """
+
+
+def summarize_chunks(chunks, keys, on_progress=None):
+    """Return (ringkasan per bagian, jumlah bagian yang diganti cuplikan teks asli)."""
+    total = len(chunks)
+    workers = max(1, min(total, key_pool.status(keys)["healthy"]))
+    # Prioritas, on_wait, dan trace disimpan per thread: dipasang ulang di tiap worker
+    context, trace = current_scheduling(), current_trace()
+
+    def summarize(i):
+        with scheduling(*context), use_trace(trace), stage("summarize_chunk", part=i + 1):
+            return generate_text(map_prompt(chunks[i], i + 1, total), keys).strip()
+
+    summaries = [None] * total
+    errors = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(summarize, i): i for i in range(total)}
+        for done, future in enumerate(as_completed(futures), start=1):
+            i = futures[future]
+            try:
+                summaries[i] = future.result()
+            except Exception as e:
+                errors[i] = e
+            if on_progress:
+                on_progress(done, total)
+
+    if len(errors) == total:
+        raise errors[0]
+    # Ringkasan yang sudah jadi dipertahankan; bagian yang gagal dicoba sekali lagi berurutan
+    # (key yang tadi kena limit mungkin sudah lega), kalau masih gagal pakai cuplikan awalnya
+    fallback = 0
+    for i in sorted(errors):
+        try:
+            summaries[i] = summarize(i)
+        except Exception:
+            summaries[i] = chunks[i][:FALLBACK_CHARS]
+            fallback += 1
+    if errors:
+        annotate(failed_chunks=len(errors), fallback_chunks=fallback)
+    return summaries, fallback
+
+
+def reduce_summaries(summaries, keys):
+    # Kalau gabungan ringkasan masih terlalu panjang, reduce bertingkat
+    while len(summaries) > 1 and sum(len(s) for s in summaries) > MAX_REDUCE_INPUT:
+        groups, group, size = [], [], 0
+        for s in summaries:
+            if group and size + len(s) > MAX_REDUCE_INPUT:
+                groups.append(group)
+                group, size = [], 0
+            group.append(s)
+            size += len(s)
+        groups.append(group)
+        summaries = [generate_text(reduce_prompt(g), keys).strip() for g in groups]
+    return generate_text(reduce_prompt(summaries), keys).strip()
+
+
+def digest_document(data, mime_type, keys, on_progress=None, warnings=None):
+    """Return teks untuk prompt: isi asli kalau pendek, digest map-reduce kalau panjang.
+
+    Bagian yang gagal diringkas dicatat ke `warnings` (kalau diberikan).
+    """
+    cache_key = content_hash(data, PRIMARY_MODEL)
+    cached = digest_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    text = read_document_bytes(data, mime_type, budget=MAX_SOURCE_CHARS)
+    if len(text) <= DIGEST_CHARS:
+        # Muat utuh di prompt, tidak perlu diringkas
+        return text
+
+    chunks = split_chunks(text)
+    summaries, fallback = summarize_chunks(chunks, keys, on_progress=on_progress)
+    digest = reduce_summaries(summaries, keys)[:DIGEST_CHARS]
+    if fallback:
+        # Digest belum lengkap: jangan disimpan, upload berikutnya mencoba bagian itu lagi
+        if warnings is not None:
+            warnings.append(f"⚠️ {fallback} dari {len(chunks)} bagian ebook gagal diringkas, cuplikan awalnya yang dipakai.")
+        return digest
+    digest_cache.set(cache_key, digest)
+    return digest
@@ -0,0 +1,489 @@
+import re
+
+# --- TAILWIND LITE ---
+# Pengganti Tailwind CDN untuk halaman hasil generate: dari daftar class yang benar-benar
+# dipakai halaman, buat CSS-nya langsung (subset utilitas Tailwind v3 yang dipakai prompt &
+# template: spacing, sizing, tipografi, warna, flex/grid, border, shadow, gradient, varian
+# hover/focus & responsive sm/md/lg/xl/2xl, nilai arbitrary seperti w-[90%]).
+# Class yang tidak dikenali dilaporkan, supaya pemanggil bisa tetap memakai CDN.
+
+BREAKPOINTS = {"sm": 640, "md": 768, "lg": 1024, "xl": 1280, "2xl": 1536}
+PSEUDO_VARIANTS = {
+    "hover": ":hover",
+    "focus": ":focus",
+    "active": ":active",
+    "first": ":first-child",
+    "last": ":last-child",
+    "odd": ":nth-child(odd)",
+    "even": ":nth-child(even)",
+}
+
+# Reset dasar Tailwind (preflight), diringkas: halaman hasil generate mengandalkan ini
+PREFLIGHT = (
+    "*,::before,::after{box-sizing:border-box;border-width:0;border-style:solid;border-color:#e5e7eb}"
+    "html{line-height:1.5;-webkit-text-size-adjust:100%;tab-size:4;font-family:ui-sans-serif,system-ui,sans-serif,"
+    "\"Apple Color Emoji\",\"Segoe UI Emoji\"}"
+    "body{margin:0;line-height:inherit}"
+    "hr{height:0;color:inherit;border-top-width:1px}"
+    "h1,h2,h3,h4,h5,h6{font-size:inherit;font-weight:inherit}"
+    "a{color:inherit;text-decoration:inherit}"
+    "b,strong{font-weight:bolder}"
+    "table{text-indent:0;border-color:inherit;border-collapse:collapse}"
+    "button,input,select,textarea{font-family:inherit;font-size:100%;font-weight:inherit;line-height:inherit;"
+    "color:inherit;margin:0;padding:0}"
+    "button{background-color:transparent;background-image:none;cursor:pointer}"
+    "blockquote,dl,dd,h1,h2,h3,h4,h5,h6,hr,figure,p,pre{margin:0}"
+    "ol,ul,menu{list-style:none;margin:0;padding:0}"
+    "summary{display:list-item}"
+    "img,svg,video,canvas,audio,iframe,embed,object{display:block;vertical-align:middle}"
+    "img,video{max-width:100%;height:auto}"
+    "[hidden]{display:none}"
+)
+
+PALETTE = {
+    "slate": "f8fafc f1f5f9 e2e8f0 cbd5e1 94a3b8 64748b 475569 334155 1e293b 0f172a",
+    "gray": "f9fafb f3f4f6 e5e7eb d1d5db 9ca3af 6b7280 4b5563 374151 1f2937 111827",
+    "zinc": "fafafa f4f4f5 e4e4e7 d4d4d8 a1a1aa 71717a 52525b 3f3f46 27272a 18181b",
+    "neutral": "fafafa f5f5f5 e5e5e5 d4d4d4 a3a3a3 737373 525252 404040 262626 171717",
+    "stone": "fafaf9 f5f5f4 e7e5e4 d6d3d1 a8a29e 78716c 57534e 44403c 292524 1c1917",
+    "red": "fef2f2 fee2e2 fecaca fca5a5 f87171 ef4444 dc2626 b91c1c 991b1b 7f1d1d",
+    "orange": "fff7ed ffedd5 fed7aa fdba74 fb923c f97316 ea580c c2410c 9a3412 7c2d12",
+    "amber": "fffbeb fef3c7 fde68a fcd34d fbbf24 f59e0b d97706 b45309 92400e 78350f",
+    "yellow": "fefce8 fef9c3 fef08a fde047 facc15 eab308 ca8a04 a16207 854d0e 713f12",
+    "lime": "f7fee7 ecfccb d9f99d bef264 a3e635 84cc16 65a30d 4d7c0f 3f6212 365314",
+    "green": "f0fdf4 dcfce7 bbf7d0 86efac 4ade80 22c55e 16a34a 15803d 166534 14532d",
+    "emerald": "ecfdf5 d1fae5 a7f3d0 6ee7b7 34d399 10b981 059669 047857 065f46 064e3b",
+    "teal": "f0fdfa ccfbf1 99f6e4 5eead4 2dd4bf 14b8a6 0d9488 0f766e 115e59 134e4a",
+    "cyan": "ecfeff cffafe a5f3fc 67e8f9 22d3ee 06b6d4 0891b2 0e7490 155e75 164e63",
+    "sky": "f0f9ff e0f2fe bae6fd 7dd3fc 38bdf8 0ea5e9 0284c7 0369a1 075985 0c4a6e",
+    "blue": "eff6ff dbeafe bfdbfe 93c5fd 60a5fa 3b82f6 2563eb 1d4ed8 1e40af 1e3a8a",
+    "indigo": "eef2ff e0e7ff c7d2fe a5b4fc 818cf8 6366f1 4f46e5 4338ca 3730a3 312e81",
+    "violet": "f5f3ff ede9fe ddd6fe c4b5fd a78bfa 8b5cf6 7c3aed 6d28d9 5b21b6 4c1d95",
+    "purple": "faf5ff f3e8ff e9d5ff d8b4fe c084fc a855f7 9333ea 7e22ce 6b21a8 581c87",
+    "fuchsia": "fdf4ff fae8ff f5d0fe f0abfc e879f9 d946ef c026d3 a21caf 86198f 701a75",
+    "pink": "fdf2f8 fce7f3 fbcfe8 f9a8d4 f472b6 ec4899 db2777 be185d 9d174d 831843",
+    "rose": "fff1f2 ffe4e6 fecdd3 fda4af fb7185 f43f5e e11d48 be123c 9f1239 881337",
+}
+SHADES = ("50", "100", "200", "300", "400", "500", "600", "700", "800", "900")
+COLORS = {f"{name}-{shade}": f"#{hexes.split()[i]}"
+          for name, hexes in PALETTE.items() for i, shade in enumerate(SHADES)}
+COLORS.update({"white": "#ffffff", "black": "#000000", "transparent": "transparent",
+               "current": "currentColor", "inherit": "inherit"})
+
+FONT_SIZES = {
+    "xs": ("0.75rem", "1rem"), "sm": ("0.875rem", "1.25rem"), "base": ("1rem", "1.5rem"),
+    "lg": ("1.125rem", "1.75rem"), "xl": ("1.25rem", "1.75rem"), "2xl": ("1.5rem", "2rem"),
+    "3xl": ("1.875rem", "2.25rem"), "4xl": ("2.25rem", "2.5rem"), "5xl": ("3rem", "1"),
+    "6xl": ("3.75rem", "1"), "7xl": ("4.5rem", "1"), "8xl": ("6rem", "1"), "9xl": ("8rem", "1"),
+}
+FONT_WEIGHTS = {"thin": 100, "extralight": 200, "light": 300, "normal": 400, "medium": 500,
+                "semibold": 600, "bold": 700, "extrabold": 800, "black": 900}
+FONT_FAMILIES = {
+    "sans": "ui-sans-serif,system-ui,sans-serif",
+    "serif": "ui-serif,Georgia,Cambria,\"Times New Roman\",Times,serif",
+    "mono": "ui-monospace,SFMono-Regular,Menlo,Monaco,Consolas,monospace",
+}
+LEADING = {"none": "1", "tight": "1.25", "snug": "1.375", "normal": "1.5", "relaxed": "1.625", "loose": "2"}
+TRACKING = {"tighter": "-0.05em", "tight": "-0.025em", "normal": "0em", "wide": "0.025em",
+            "wider": "0.05em", "widest": "0.1em"}
+MAX_WIDTHS = {"none": "none", "xs": "20rem", "sm": "24rem", "md": "28rem", "lg": "32rem", "xl": "36rem",
+              "2xl": "42rem", "3xl": "48rem", "4xl": "56rem", "5xl": "64rem", "6xl": "72rem", "7xl": "80rem",
+              "full": "100%", "min": "min-content", "max": "max-content", "fit": "fit-content", "prose": "65ch",
+              "screen-sm": "640px", "screen-md": "768px", "screen-lg": "1024px", "screen-xl": "1280px"}
+RADII = {"none": "0px", "sm": "0.125rem", "": "0.25rem", "md": "0.375rem", "lg": "0.5rem", "xl": "0.75rem",
+         "2xl": "1rem", "3xl": "1.5rem", "full": "9999px"}
+SHADOWS = {
+    "sm": "0 1px 2px 0 rgb(0 0 0 / 0.05)",
+    "": "0 1px 3px 0 rgb(0 0 0 / 0.1), 0 1px 2px -1px rgb(0 0 0 / 0.1)",
+    "md": "0 4px 6px -1px rgb(0 0 0 / 0.1), 0 2px 4px -2px rgb(0 0 0 / 0.1)",
+    "lg": "0 10px 15px -3px rgb(0 0 0 / 0.1), 0 4px 6px -4px rgb(0 0 0 / 0.1)",
+    "xl": "0 20px 25px -5px rgb(0 0 0 / 0.1), 0 8px 10px -6px rgb(0 0 0 / 0.1)",
+    "2xl": "0 25px 50px -12px rgb(0 0 0 / 0.25)",
+    "inner": "inset 0 2px 4px 0 rgb(0 0 0 / 0.05)",
+    "none": "0 0 #0000",
+}
+GRADIENT_DIRECTIONS = {"t": "to top", "tr": "to top right", "r": "to right", "br": "to bottom right",
+                       "b": "to bottom", "bl": "to bottom left", "l": "to left", "tl": "to top left"}
+
+STATIC = {
+    "block": "display:block", "inline-block": "display:inline-block", "inline": "display:inline",
+    "flex": "display:flex", "inline-flex": "display:inline-flex", "grid": "display:grid",
+    "inline-grid": "display:inline-grid", "table": "display:table", "hidden": "display:none",
+    "contents": "display:contents", "list-item": "display:list-item",
+    "flex-row": "flex-direction:row", "flex-row-reverse": "flex-direction:row-reverse",
+    "flex-col": "flex-direction:column", "flex-col-reverse": "flex-direction:column-reverse",
+    "flex-wrap": "flex-wrap:wrap", "flex-nowrap": "flex-wrap:nowrap",
+    "flex-1": "flex:1 1 0%", "flex-auto": "flex:1 1 auto", "flex-initial": "flex:0 1 auto", "flex-none": "flex:none",
+    "grow": "flex-grow:1", "grow-0": "flex-grow:0", "shrink": "flex-shrink:1", "shrink-0": "flex-shrink:0",
+    "flex-shrink-0": "flex-shrink:0", "flex-grow": "flex-grow:1",
+    "items-start": "align-items:flex-start", "items-end": "align-items:flex-end", "items-center": "align-items:center",
+    "items-baseline": "align-items:baseline", "items-stretch": "align-items:stretch",
+    "justify-start": "justify-content:flex-start", "justify-end": "justify-content:flex-end",
+    "justify-center": "justify-content:center", "justify-between": "justify-content:space-between",
+    "justify-around": "justify-content:space-around", "justify-evenly": "justify-content:space-evenly",
+    "self-auto": "align-self:auto", "self-start": "align-self:flex-start", "self-end": "align-self:flex-end",
+    "self-center": "align-self:center", "self-stretch": "align-self:stretch",
+    "content-center": "align-content:center", "content-between": "align-content:space-between",
+    "place-items-center": "place-items:center", "place-content-center": "place-content:center",
+    "static": "position:static", "fixed": "position:fixed", "absolute": "position:absolute",
+    "relative": "position:relative", "sticky": "position:sticky",
+    "text-left": "text-align:left", "text-center": "text-align:center", "text-right": "text-align:right",
+    "text-justify": "text-align:justify",
+    "italic": "font-style:italic", "not-italic": "font-style:normal",
+    "uppercase": "text-transform:uppercase", "lowercase": "text-transform:lowercase",
+    "capitalize": "text-transform:capitalize", "normal-case": "text-transform:none",
+    "underline": "text-decoration-line:underline", "line-through": "text-decoration-line:line-through",
+    "no-underline": "text-decoration-line:none",
+    "antialiased": "-webkit-font-smoothing:antialiased;-moz-osx-font-smoothing:grayscale",
+    "whitespace-normal": "white-space:normal", "whitespace-nowrap": "white-space:nowrap",
+    "whitespace-pre-line": "white-space:pre-line", "whitespace-pre-wrap": "white-space:pre-wrap",
+    "break-words": "overflow-wrap:break-word", "break-all": "word-break:break-all",
+    "truncate": "overflow:hidden;text-overflow:ellipsis;white-space:nowrap",
+    "overflow-hidden": "overflow:hidden", "overflow-auto": "overflow:auto", "overflow-visible": "overflow:visible",
+    "overflow-x-auto": "overflow-x:auto", "overflow-y-auto": "overflow-y:auto", "overflow-x-hidden": "overflow-x:hidden",
+    "object-cover": "object-fit:cover", "object-contain": "object-fit:contain", "object-center": "object-position:center",
+    "aspect-square": "aspect-ratio:1 / 1", "aspect-video": "aspect-ratio:16 / 9", "aspect-auto": "aspect-ratio:auto",
+    "list-none": "list-style-type:none", "list-disc": "list-style-type:disc", "list-decimal": "list-style-type:decimal",
+    "list-inside": "list-style-position:inside", "list-outside": "list-style-position:outside",
+    "border-solid": "border-style:solid", "border-dashed": "border-style:dashed", "border-dotted": "border-style:dotted",
+    "border-double": "border-style:double", "border-none": "border-style:none",
+    "cursor-pointer": "cursor:pointer", "cursor-default": "cursor:default", "cursor-not-allowed": "cursor:not-allowed",
+    "select-none": "user-select:none", "select-all": "user-select:all",
+    "pointer-events-none": "pointer-events:none", "pointer-events-auto": "pointer-events:auto",
+    "visible": "visibility:visible", "invisible": "visibility:hidden",
+    "bg-cover": "background-size:cover", "bg-contain": "background-size:contain", "bg-center": "background-position:center",
+    "bg-no-repeat": "background-repeat:no-repeat", "bg-fixed": "background-attachment:fixed",
+    "transition": "transition-property:color,background-color,border-color,text-decoration-color,fill,stroke,opacity,"
+                  "box-shadow,transform,filter,backdrop-filter;transition-timing-function:cubic-bezier(0.4,0,0.2,1);"
+                  "transition-duration:150ms",
+    "transition-all": "transition-property:all;transition-timing-function:cubic-bezier(0.4,0,0.2,1);transition-duration:150ms",
+    "transition-colors": "transition-property:color,background-color,border-color,text-decoration-color,fill,stroke;"
+                         "transition-timing-function:cubic-bezier(0.4,0,0.2,1);transition-duration:150ms",
+    "transition-transform": "transition-property:transform;transition-timing-function:cubic-bezier(0.4,0,0.2,1);"
+                            "transition-duration:150ms",
+    "transition-shadow": "transition-property:box-shadow;transition-timing-function:cubic-bezier(0.4,0,0.2,1);"
+                         "transition-duration:150ms",
+    "ease-in": "transition-timing-function:cubic-bezier(0.4,0,1,1)",
+    "ease-out": "transition-timing-function:cubic-bezier(0,0,0.2,1)",
+    "ease-in-out": "transition-timing-function:cubic-bezier(0.4,0,0.2,1)",
+    "ease-linear": "transition-timing-function:linear",
+    "transform": "transform:translate(var(--tw-translate-x,0),var(--tw-translate-y,0)) scale(var(--tw-scale-x,1),var(--tw-scale-y,1))",
+    "mx-auto": "margin-left:auto;margin-right:auto",
+    "container": "width:100%",
+    "sr-only": "position:absolute;width:1px;height:1px;padding:0;margin:-1px;overflow:hidden;clip:rect(0,0,0,0);"
+               "white-space:nowrap;border-width:0",
+}
+
+SPACING_PROPS = {
+    "p": (0, ("padding",)), "px": (1, ("padding-left", "padding-right")), "py": (1, ("padding-top", "padding-bottom")),
+    "pt": (2, ("padding-top",)), "pr": (2, ("padding-right",)), "pb": (2, ("padding-bottom",)), "pl": (2, ("padding-left",)),
+    "m": (0, ("margin",)), "mx": (1, ("margin-left", "margin-right")), "my": (1, ("margin-top", "margin-bottom")),
+    "mt": (2, ("margin-top",)), "mr": (2, ("margin-right",)), "mb": (2, ("margin-bottom",)), "ml": (2, ("margin-left",)),
+    "gap": (0, ("gap",)), "gap-x": (1, ("column-gap",)), "gap-y": (1, ("row-gap",)),
+    "inset": (0, ("inset",)), "inset-x": (1, ("left", "right")), "inset-y": (1, ("top", "bottom")),
+    "top": (2, ("top",)), "right": (2, ("right",)), "bottom": (2, ("bottom",)), "left": (2, ("left",)),
+    "w": (0, ("width",)), "h": (0, ("height",)), "min-w": (0, ("min-width",)), "min-h": (0, ("min-height",)),
+    "max-h": (0, ("max-height",)), "size": (0, ("width", "height")),
+}
+SIZE_KEYWORDS = {"full": "100%", "screen": None, "auto": "auto", "min": "min-content", "max": "max-content",
+                 "fit": "fit-content", "px": "1px"}
+
+# Awalan utilitas Tailwind: class tak dikenal dengan awalan ini berarti subset di sini kurang
+# lengkap, sedangkan class lain (mis. "faq-item") memang tidak punya CSS, juga di CDN
+TAILWIND_PREFIXES = {
+    "p", "px", "py", "pt", "pr", "pb", "pl", "m", "mx", "my", "mt", "mr", "mb", "ml", "space", "gap",
+    "w", "h", "min", "max", "size", "text", "font", "leading", "tracking", "bg", "from", "via", "to",
+    "border", "divide", "rounded", "shadow", "ring", "outline", "flex", "grid", "col", "row", "order",
+    "basis", "grow", "shrink", "items", "justify", "self", "content", "place", "inset", "top", "right",
+    "bottom", "left", "z", "opacity", "overflow", "object", "aspect", "list", "cursor", "select",
+    "transition", "duration", "ease", "delay", "animate", "scale", "rotate", "translate", "skew",
+    "origin", "decoration", "underline", "whitespace", "break", "line", "indent", "align", "columns",
+    "blur", "brightness", "backdrop", "drop", "filter", "fill", "stroke", "sr", "inline", "table",
+    "block", "hidden", "container", "pointer", "visible", "invisible", "truncate", "italic", "uppercase",
+    "lowercase", "capitalize", "antialiased", "accent", "caret", "scroll", "snap", "touch", "will",
+}
+
+
+def arbitrary(value):
+    # w-[90%] / bg-[#0f172a] / grid-cols-[1fr_2fr]: isi kurung siku, "_" berarti spasi
+    if value.startswith("[") and value.endswith("]"):
+        return value[1:-1].replace("_", " ")
+    return None
+
+
+def spacing_value(value, prop=""):
+    raw = arbitrary(value)
+    if raw is not None:
+        return raw
+    if value in SIZE_KEYWORDS:
+        if value == "screen":
+            return "100vh" if prop in ("height", "min-height", "max-height") else "100vw"
+        return SIZE_KEYWORDS[value]
+    if value == "0":
+        return "0px"
+    if re.fullmatch(r"\d+(?:\.5)?", value):
+        return f"{float(value) * 0.25:g}rem"
+    match = re.fullmatch(r"(\d+)/(\d+)", value)
+    if match and int(match.group(2)):
+        return f"{int(match.group(1)) / int(match.group(2)) * 100:g}%"
+    return None
+
+
+def color_value(value):
+    """bg-blue-500 / text-white / border-gray-200/50 / bg-[#123456] -> nilai CSS atau None."""
+    alpha = None
+    if "/" in value and not value.startswith("["):
+        value, alpha_text = value.rsplit("/", 1)
+        if not alpha_text.isdigit():
+            return None
+        alpha = int(alpha_text) / 100
+    color = arbitrary(value) or COLORS.get(value)
+    if color is None:
+        return None
+    if alpha is not None and re.fullmatch(r"#[0-9a-fA-F]{6}", color):
+        r, g, b = (int(color[i:i + 2], 16) for i in (1, 3, 5))
+        return f"rgb({r} {g} {b} / {alpha:g})"
+    return color
+
+
+def resolve(utility):
+    """Return (urutan, deklarasi CSS, akhiran selector) untuk satu utilitas tanpa varian, atau None."""
+    if utility in STATIC:
+        return 0, STATIC[utility], ""
+
+    negative = utility.startswith("-")
+    name = utility[1:] if negative else utility
+
+    # space-y-4 / space-x-2 / divide-y: jarak antar anak
+    match = re.fullmatch(r"space-([xy])-(.+)", name)
+    if match:
+        value = spacing_value(match.group(2))
+        if value is None:
+            return None
+        side = "margin-top" if match.group(1) == "y" else "margin-left"
+        return 1, f"{side}:{'-' if negative else ''}{value}", " > :not([hidden]) ~ :not([hidden])"
+    if name in ("divide-y", "divide-x"):
+        side = "border-top-width" if name == "divide-y" else "border-left-width"
+        return 1, f"{side}:1px", " > :not([hidden]) ~ :not([hidden])"
+    match = re.fullmatch(r"divide-(.+)", name)
+    if match and color_value(match.group(1)):
+        return 1, f"border-color:{color_value(match.group(1))}", " > :not([hidden]) ~ :not([hidden])"
+
+    match = re.fullmatch(r"(p[xytrbl]?|m[xytrbl]?|gap(?:-[xy])?|inset(?:-[xy])?|top|right|bottom|left|w|h|min-[wh]|max-h|size)-(.+)", name)
+    if match and match.group(1) in SPACING_PROPS:
+        order, props = SPACING_PROPS[match.group(1)]
+        value = spacing_value(match.group(2), props[0])
+        if value is None:
+            return None
+        if negative:
+            value = f"calc({value} * -1)" if not value.startswith("calc") else value
+        return order, ";".join(f"{p}:{value}" for p in props), ""
+
+    match = re.fullmatch(r"max-w-(.+)", name)
+    if match:
+        value = arbitrary(match.group(1)) or MAX_WIDTHS.get(match.group(1))
+        return (0, f"max-width:{value}", "") if value else None
+
+    if name.startswith("text-"):
+        value = name[5:]
+        if value in FONT_SIZES:
+            size, line_height = FONT_SIZES[value]
+            return 0, f"font-size:{size};line-height:{line_height}", ""
+        raw = arbitrary(value)
+        if raw is not None:
+            if raw.startswith("#") or raw.startswith("rgb") or raw.startswith("hsl"):
+                return 0, f"color:{raw}", ""
+            return 0, f"font-size:{raw}", ""
+        color = color_value(value)
+        return (0, f"color:{color}", "") if color else None
+
+    if name.startswith("font-"):
+        value = name[5:]
+        if value in FONT_WEIGHTS:
+            return 0, f"font-weight:{FONT_WEIGHTS[value]}", ""
+        if value in FONT_FAMILIES:
+            return 0, f"font-family:{FONT_FAMILIES[value]}", ""
+        return None
+
+    match = re.fullmatch(r"leading-(.+)", name)
+    if match:
+        value = LEADING.get(match.group(1)) or arbitrary(match.group(1)) or spacing_value(match.group(1))
+        return (0, f"line-height:{value}", "") if value else None
+    match = re.fullmatch(r"tracking-(.+)", name)
+    if match:
+        value = TRACKING.get(match.group(1)) or arbitrary(match.group(1))
+        return (0, f"letter-spacing:{value}", "") if value else None
+
+    match = re.fullmatch(r"bg-gradient-to-(t|tr|r|br|b|bl|l|tl)", name)
+    if match:
+        return 0, f"background-image:linear-gradient({GRADIENT_DIRECTIONS[match.group(1)]},var(--tw-gradient-stops))", ""
+    match = re.fullmatch(r"(from|via|to)-(.+)", name)
+    if match:
+        color = color_value(match.group(2))
+        if not color:
+            return None
+        if match.group(1) == "from":
+            return 0, (f"--tw-gradient-from:{color};--tw-gradient-to:rgb(255 255 255 / 0);"
+                       "--tw-gradient-stops:var(--tw-gradient-from),var(--tw-gradient-to)"), ""
+        if match.group(1) == "via":
+            return 1, (f"--tw-gradient-to:rgb(255 255 255 / 0);"
+                       f"--tw-gradient-stops:var(--tw-gradient-from),{color},var(--tw-gradient-to)"), ""
+        return 2, f"--tw-gradient-to:{color}", ""
+    if name.startswith("bg-"):
+        color = color_value(name[3:])
+        if color:
+            return 0, f"background-color:{color}", ""
+        raw = arbitrary(name[3:])
+        return (0, f"background:{raw}", "") if raw else None
+
+    match = re.fullmatch(r"border(?:-([xytrbl]))?(?:-(\d+))?", name)
+    if match:
+        width = f"{match.group(2) or 1}px"
+        sides = {None: ("border-width",), "x": ("border-left-width", "border-right-width"),
+                 "y": ("border-top-width", "border-bottom-width"), "t": ("border-top-width",),
+                 "r": ("border-right-width",), "b": ("border-bottom-width",), "l": ("border-left-width",)}
+        order = 0 if match.group(1) is None else (1 if match.group(1) in "xy" else 2)
+        return order, ";".join(f"{p}:{width}" for p in sides[match.group(1)]), ""
+    match = re.fullmatch(r"border-([tbrl]-)?(.+)", name)
+    if match:
+        color = color_value(match.group(2))
+        if not color:
+            return None
+        side = {"t-": "border-top-color", "b-": "border-bottom-color", "r-": "border-right-color",
+                "l-": "border-left-color"}.get(match.group(1), "border-color")
+        return (0 if side == "border-color" else 2), f"{side}:{color}", ""
+
+    match = re.fullmatch(r"rounded(?:-([trbl]{1,2}))?(?:-(.+))?", name)
+    if match:
+        size = match.group(2) or ""
+        value = RADII.get(size) or arbitrary(size)
+        if value is None:
+            return None
+        corners = {None: ("border-radius",), "t": ("border-top-left-radius", "border-top-right-radius"),
+                   "b": ("border-bottom-left-radius", "border-bottom-right-radius"),
+                   "l": ("border-top-left-radius", "border-bottom-left-radius"),
+                   "r": ("border-top-right-radius", "border-bottom-right-radius"),
+                   "tl": ("border-top-left-radius",), "tr": ("border-top-right-radius",),
+                   "bl": ("border-bottom-left-radius",), "br": ("border-bottom-right-radius",)}
+        if match.group(1) not in corners:
+            return None
+        order = 0 if match.group(1) is None else len(match.group(1))
+        return order, ";".join(f"{p}:{value}" for p in corners[match.group(1)]), ""
+
+    match = re.fullmatch(r"shadow(?:-(.+))?", name)
+    if match:
+        value = SHADOWS.get(match.group(1) or "")
+        return (0, f"box-shadow:{value}", "") if value else None
+
+    match = re.fullmatch(r"grid-cols-(.+)", name)
+    if match:
+        value = match.group(1)
+        if value.isdigit():
+            return 0, f"grid-template-columns:repeat({value},minmax(0,1fr))", ""
+        raw = arbitrary(value)
+        return (0, f"grid-template-columns:{raw}", "") if raw else None
+    match = re.fullmatch(r"col-span-(\d+|full)", name)
+    if match:
+        value = "1 / -1" if match.group(1) == "full" else f"span {match.group(1)} / span {match.group(1)}"
+        return 0, f"grid-column:{value}", ""
+
+    match = re.fullmatch(r"(opacity|z|duration|scale)-(\d+)", name)
+    if match:
+        kind, number = match.groups()
+        if kind == "opacity":
+            return 0, f"opacity:{int(number) / 100:g}", ""
+        if kind == "z":
+            return 0, f"z-index:{'-' if negative else ''}{number}", ""
+        if kind == "duration":
+            return 0, f"transition-duration:{number}ms", ""
+        scale = f"{int(number) / 100:g}"
+        return 0, (f"--tw-scale-x:{scale};--tw-scale-y:{scale};"
+                   "transform:translate(var(--tw-translate-x,0),var(--tw-translate-y,0)) "
+                   "scale(var(--tw-scale-x,1),var(--tw-scale-y,1))"), ""
+    match = re.fullmatch(r"translate-([xy])-(.+)", name)
+    if match:
+        value = spacing_value(match.group(2))
+        if value is None:
+            return None
+        if negative:
+            value = f"calc({value} * -1)"
+        return 0, (f"--tw-translate-{match.group(1)}:{value};"
+                   "transform:translate(var(--tw-translate-x,0),var(--tw-translate-y,0)) "
+                   "scale(var(--tw-scale-x,1),var(--tw-scale-y,1))"), ""
+    return None
+
+
+def looks_like_tailwind(utility):
+    return utility.lstrip("!-").split("-", 1)[0] in TAILWIND_PREFIXES
+
+
+def split_variants(class_name):
+    # "md:hover:bg-[url(a:b)]" -> (["md", "hover"], "bg-[url(a:b)]"); titik dua di dalam [] bukan pemisah
+    parts, depth, current = [], 0, ""
+    for char in class_name:
+        if char == "[":
+            depth += 1
+        elif char == "]":
+            depth -= 1
+        if char == ":" and depth == 0:
+            parts.append(current)
+            current = ""
+        else:
+            current += char
+    return parts, current
+
+
+def css_escape(class_name):
+    return re.sub(r"([^a-zA-Z0-9_-])", r"\\\1", class_name)
+
+
+def build_css(class_names):
+    """CSS untuk class yang dipakai. Return (css, class_Tailwind_yang_tidak_dikenal)."""
+    rules = []
+    unknown = []
+    for index, class_name in enumerate(class_names):
+        variants, utility = split_variants(class_name)
+        important = utility.startswith("!")
+        if important:
+            utility = utility[1:]
+        resolved = resolve(utility)
+        media = 0
+        pseudo = ""
+        valid = resolved is not None
+        for variant in variants:
+            if variant in BREAKPOINTS:
+                media = BREAKPOINTS[variant]
+            elif variant in PSEUDO_VARIANTS:
+                pseudo += PSEUDO_VARIANTS[variant]
+            elif variant == "group-hover":
+                pseudo = "group-hover"
+            else:
+                valid = False
+        if not valid:
+            if variants or looks_like_tailwind(utility):
+                unknown.append(class_name)
+            continue
+        order, declarations, suffix = resolved
+        if important:
+            declarations = ";".join(f"{d}!important" for d in declarations.split(";"))
+        selector = "." + css_escape(class_name)
+        if pseudo == "group-hover":
+            selector = f".group:hover {selector}"
+        else:
+            selector += pseudo
+        rules.append(((media, bool(pseudo), order, index), media, f"{selector}{suffix}{{{declarations}}}"))
+
+    rules.sort(key=lambda rule: rule[0])
+    out = []
+    current_media = 0
+    for _, media, rule in rules:
+        if media != current_media:
+            if current_media:
+                out.append("}")
+            if media:
+                out.append(f"@media (min-width:{media}px){{")
+            current_media = media
+        out.append(rule)
+    if current_media:
+        out.append("}")
+    return "".join(out), unknown
@@ -0,0 +1,9 @@
+import os
+import sys
+
+# Modul app ada langsung di root repo (bukan package). Nilai env dibaca saat modul di-import:
+# test tidak menulis trace_log.jsonl dan tidak ikut dibatasi jatah RPM/TPM default.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["TRACE_LOG"] = ""
+os.environ.setdefault("KEY_RPM", "0")
+os.environ.setdefault("KEY_TPM", "0")
@@ -0,0 +1,116 @@
+import json
+import os
+import threading
+
+import pytest
+
+pytest.importorskip("google.ai.generativelanguage")
+
+import batch_generate
+from batch_generate import MANIFEST_FILE, load_manifest, normalize_row, parse_rows, row_id, run_batch
+
+KEYS = ["AIzaKEY-A", "AIzaKEY-B"]
+
+
+@pytest.fixture
+def fake_generate(monkeypatch):
+    calls = []
+    lock = threading.Lock()
+
+    def generate_one(product, out_dir, keys, force=False, use_templates=False):
+        with lock:
+            calls.append(product["product_name"])
+        if product["product_name"].startswith("Gagal"):
+            raise RuntimeError("kuota habis")
+        file_name = f"{row_id(product)}.html"
+        with open(os.path.join(out_dir, file_name), "w", encoding="utf-8") as f:
+            f.write("<html></html>")
+        return {"id": row_id(product), "product_name": product["product_name"], "status": "ok",
+                "mode": "template" if use_templates else "full", "file": file_name}
+
+    monkeypatch.setattr(batch_generate, "generate_one", generate_one)
+    return calls
+
+
+def test_normalize_row_from_csv():
+    text = ("Nama,Jenis,bonuses,bonus_1,use_boosters,tone\n"
+            " Ebook Diet ,barang fisik,Checklist | Template ; ,Grup VIP,tidak,\n")
+    product = normalize_row(parse_rows(text, "csv")[0])
+    assert product["product_name"] == "Ebook Diet"
+    assert product["product_type"] == "Produk Fisik / Barang"
+    assert product["bonuses"] == ["Checklist", "Template", "Grup VIP"]
+    assert product["use_boosters"] is False
+    assert product["tone"] == batch_generate.DEFAULT_TONE
+
+
+def test_normalize_row_from_jsonl():
+    row = parse_rows('{"name": "Kelas", "bonuses": ["a", "b", "c", "d"], "use_boosters": true}\n\n', "jsonl")[0]
+    row[None] = ["kolom lebih"]          # csv.DictReader: sel lebih dari jumlah header
+    product = normalize_row(row)
+    assert product["bonuses"] == ["a", "b", "c"] and product["use_boosters"] is True
+    assert product["product_type"] == batch_generate.DEFAULT_PRODUCT_TYPE
+    assert None not in product
+
+
+def test_row_id_is_stable():
+    first = normalize_row({"nama": "Produk A", "harga_jual": "99rb"})
+    again = normalize_row({"harga_jual": "99rb ", "Nama": " Produk A"})
+    assert row_id(first) == row_id(again) and len(row_id(first)) == 12
+    assert row_id(first) != row_id(normalize_row({"nama": "Produk A", "harga_jual": "100rb"}))
+
+
+def test_load_manifest_ignores_truncated_line(tmp_path):
+    (tmp_path / MANIFEST_FILE).write_text(
+        '{"id": "a", "status": "error"}\n{"id": "a", "status": "ok"}\n{"id": "b", "sta', encoding="utf-8")
+    assert load_manifest(str(tmp_path)) == {"a": {"id": "a", "status": "ok"}}
+    assert load_manifest(str(tmp_path / "kosong")) == {}
+
+
+def test_resume_skips_rows_already_written(tmp_path, fake_generate):
+    out = str(tmp_path)
+    rows = [{"nama": "Produk A"}, {"nama": "Gagal B"}, {"nama": "Produk C"}, {"nama": ""}]
+    summary = run_batch(rows, out, KEYS, workers=2)
+    assert sorted(fake_generate) == ["Gagal B", "Produk A", "Produk C"]
+    assert summary["skipped"] == 0
+    assert {r["product_name"]: r["status"] for r in summary["results"]} == {
+        "Produk A": "ok", "Gagal B": "error", "Produk C": "ok"}
+
+    # Run berikutnya hanya mengulang yang gagal & yang file-nya hilang
+    fake_generate.clear()
+    os.remove(os.path.join(out, f"{row_id(normalize_row(rows[2]))}.html"))
+    summary = run_batch(rows, out, KEYS)
+    assert sorted(fake_generate) == ["Gagal B", "Produk C"] and summary["skipped"] == 1
+
+    # Mode lain atau --force: semuanya diulang
+    fake_generate.clear()
+    run_batch(rows, out, KEYS, use_templates=True)
+    assert len(fake_generate) == 3
+    fake_generate.clear()
+    run_batch(rows, out, KEYS, use_templates=True, force=True)
+    assert len(fake_generate) == 3
+
+    lines = [json.loads(line) for line in (tmp_path / MANIFEST_FILE).read_text(encoding="utf-8").splitlines()]
+    assert len(lines) == 3 + 2 + 3 + 3 and all("finished_at" in line for line in lines)
+
+
+def test_cancel_leaves_unstarted_rows_unexecuted(tmp_path, fake_generate, monkeypatch):
+    rows = [{"nama": f"Produk {i}"} for i in range(6)]
+    gate = threading.Event()
+    generate_one = batch_generate.generate_one
+
+    def slow_after_first(product, *args):
+        # Produk berikutnya masih jalan saat batch dihentikan
+        if product["product_name"] != "Produk 0":
+            gate.wait(5)
+        return generate_one(product, *args)
+
+    def stop(entry, finished, total):
+        threading.Timer(0.2, gate.set).start()
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(batch_generate, "generate_one", slow_after_first)
+    with pytest.raises(KeyboardInterrupt):
+        run_batch(rows, str(tmp_path), KEYS, workers=1, on_result=stop)
+    # Yang sedang jalan dibiarkan selesai, sisanya tidak pernah dimulai
+    assert fake_generate == ["Produk 0", "Produk 1"]
+    assert list(load_manifest(str(tmp_path))) == [row_id(normalize_row(rows[0]))]
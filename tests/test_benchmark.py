@@ -0,0 +1,68 @@
+import json
+import os
+import subprocess
+import sys
+import urllib.error
+import urllib.request
+
+import pytest
+
+from mock_gemini import MockConfig, start_mock_server
+from response_parser import decode_landing_response
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def mock_server():
+    config = MockConfig(latency=0, jitter=0, leaked_keys=["leaked"], rate_limited_keys=["limited"])
+    server, base_url = start_mock_server(config)
+    yield config, base_url
+    server.shutdown()
+
+
+def post_generate(base_url, key):
+    request = urllib.request.Request(
+        f"{base_url}/v1beta/models/gemini-2.0-flash:generateContent",
+        data=json.dumps({"contents": [{"parts": [{"text": "Buat landing page"}]}]}).encode("utf-8"),
+        headers={"Content-Type": "application/json", "x-goog-api-key": key},
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=10) as response:
+            return response.status, json.load(response)
+    except urllib.error.HTTPError as e:
+        return e.code, json.load(e)
+
+
+def test_mock_answers_like_gemini(mock_server):
+    config, base_url = mock_server
+    status, payload = post_generate(base_url, "ok")
+    assert status == 200
+    text = payload["candidates"][0]["content"]["parts"][0]["text"]
+    html, copy_sections, error, _ = decode_landing_response(text)
+    assert error is None and copy_sections["headline"] and html.startswith("<!DOCTYPE html>")
+    assert payload["usageMetadata"]["promptTokenCount"] > 0
+
+
+def test_mock_simulates_bad_keys(mock_server):
+    config, base_url = mock_server
+    assert post_generate(base_url, "leaked")[0] == 403
+    assert post_generate(base_url, "limited")[0] == 429
+    assert config.calls == {("leaked", 403): 1, ("limited", 429): 1}
+
+
+def test_benchmark_smoke_runs_offline(tmp_path):
+    # Versi kecil benchmark.py untuk CI: semua suite yang paketnya terpasang harus jalan tanpa error
+    out = tmp_path / "bench.json"
+    env = {k: v for k, v in os.environ.items() if k not in ("GEMINI_API_ENDPOINT", "GOOGLE_API_KEY")}
+    result = subprocess.run(
+        [sys.executable, os.path.join(REPO_DIR, "benchmark.py"),
+         "--iterations", "2", "--workers", "2", "--latency", "0.01", "--out", str(out)],
+        cwd=tmp_path, env=env, capture_output=True, text=True, timeout=300,
+    )
+    assert result.returncode == 0, result.stdout[-3000:] + result.stderr[-3000:]
+    results = json.loads(out.read_text(encoding="utf-8"))["results"]
+    assert {"parse_valid", "parse_broken", "optimize_html"} <= set(results)
+    assert all(entry["errors"] == 0 for entry in results.values())
+    if "rotation" in results:
+        assert results["rotation"]["n"] == 2
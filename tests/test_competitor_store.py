@@ -0,0 +1,55 @@
+import json
+import time
+
+import pytest
+
+from competitor_store import CompetitorStore, url_host, prefix_upper_bound
+
+
+@pytest.fixture
+def store(tmp_path):
+    return CompetitorStore(path=str(tmp_path / "competitors.db"), legacy_file=None)
+
+
+def test_url_host_strips_scheme_and_www():
+    assert url_host("https://www.Toko.com/promo") == "toko.com/promo"
+    assert url_host("toko.com") == "toko.com"
+
+
+def test_prefix_upper_bound():
+    assert prefix_upper_bound("abc") == "abd"
+    assert "abcz" < prefix_upper_bound("abc")
+
+
+def test_add_counts_hits_and_orders_by_last_used(store):
+    store.add(["https://a.com", "https://b.com"])
+    time.sleep(0.01)
+    store.add(["https://a.com", "https://a.com", ""])
+    assert store.count() == 2
+    assert store.get("https://a.com")["hit_count"] == 2
+    assert store.search() == ["https://a.com", "https://b.com"]
+
+
+def test_search_by_url_or_domain_prefix(store):
+    store.add(["https://www.tokoku.com/promo", "https://tokomu.id", "https://lain.com"])
+    assert set(store.search("toko")) == {"https://www.tokoku.com/promo", "https://tokomu.id"}
+    assert store.search("https://www.tokoku") == ["https://www.tokoku.com/promo"]
+    assert store.search("tidakada") == []
+
+
+def test_record_scrape(store):
+    store.add(["https://a.com"])
+    store.record_scrape("https://a.com", 1234)
+    entry = store.get("https://a.com")
+    assert entry["text_size"] == 1234 and entry["last_scraped"]
+    assert store.get("https://b.com") is None
+
+
+def test_imports_legacy_json_once(tmp_path):
+    legacy = tmp_path / "competitor_history.json"
+    legacy.write_text(json.dumps(["https://lama-1.com", "https://lama-2.com", 5]))
+    path = str(tmp_path / "competitors.db")
+    store = CompetitorStore(path=path, legacy_file=str(legacy))
+    assert store.search() == ["https://lama-2.com", "https://lama-1.com"]
+    legacy.write_text(json.dumps(["https://baru.com"]))
+    assert CompetitorStore(path=path, legacy_file=str(legacy)).count() == 2
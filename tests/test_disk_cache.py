@@ -0,0 +1,83 @@
+import time
+
+import pytest
+
+from disk_cache import DiskCache, MemoryLRU, content_hash, normalize_prompt
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return DiskCache("test", ttl=60, max_bytes=1000, cache_dir=str(tmp_path))
+
+
+def test_content_hash_separates_parts():
+    assert content_hash("ab", "c") != content_hash("a", "bc")
+    assert content_hash("teks", b"x") == content_hash("teks".encode("utf-8"), "x")
+
+
+def test_normalize_prompt_ignores_indentation():
+    indented = """
+        Buat landing page
+          untuk produk A   
+    """
+    assert normalize_prompt(indented) == "Buat landing page\nuntuk produk A"
+
+
+def test_set_get_delete(cache):
+    assert cache.get("k") is None
+    cache.set("k", "nilai 🚀")
+    assert cache.get("k") == "nilai 🚀"
+    cache.delete("k")
+    assert cache.get("k") is None
+
+
+def test_expired_entry_is_dropped(cache):
+    cache.set("k", "v")
+    cache.ttl = 0.01
+    time.sleep(0.02)
+    assert cache.get("k") is None
+    assert cache.get_stale("k") is None
+
+
+def test_keep_stale_allows_revalidation(tmp_path):
+    cache = DiskCache("stale", ttl=0.01, cache_dir=str(tmp_path), keep_stale=True)
+    cache.set("k", "v")
+    time.sleep(0.02)
+    assert cache.get("k") is None
+    assert cache.get_stale("k") == "v"
+    cache.touch("k")
+    assert cache.get("k") == "v"
+
+
+def test_evicts_least_recently_used_over_budget(cache):
+    cache.set("a", "x" * 400)
+    time.sleep(0.01)
+    cache.set("b", "x" * 400)
+    time.sleep(0.01)
+    cache.get("a")
+    cache.set("c", "x" * 400)
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.stats()["bytes"] <= 1000
+
+
+def test_oversized_value_is_not_stored(cache):
+    cache.set("big", "x" * 2000)
+    assert cache.get("big") is None
+
+
+def test_survives_new_instance(tmp_path):
+    DiskCache("shared", cache_dir=str(tmp_path)).set("k", "v")
+    assert DiskCache("shared", cache_dir=str(tmp_path)).get("k") == "v"
+
+
+def test_memory_lru_limits_items_and_size():
+    lru = MemoryLRU(max_items=2, max_size=10)
+    lru.set("a", 1, size=4)
+    lru.set("b", 2, size=4)
+    lru.get("a")
+    lru.set("c", 3, size=4)
+    assert lru.get("b") is None
+    assert lru.get("a") == 1 and lru.get("c") == 3
+    lru.set("huge", 4, size=11)
+    assert lru.get("huge") is None
@@ -0,0 +1,119 @@
+import io
+import multiprocessing
+import os
+import time
+
+import pytest
+
+import documents
+from disk_cache import DiskCache
+from documents import (
+    MIME_DOCX, MIME_TXT, DocumentTimeout, UnsupportedFormat, WorkerDied, get_parsed, parse_document, run_in_process,
+)
+
+
+@pytest.fixture
+def fresh_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(documents, "upload_cache", DiskCache("uploads", cache_dir=str(tmp_path)))
+    monkeypatch.setattr(documents, "_parsed_memory", documents.MemoryLRU(max_items=8))
+    return tmp_path
+
+
+@pytest.fixture
+def counted_pages(monkeypatch):
+    # Dokumen palsu 50 "halaman" @100 karakter; catat berapa halaman yang benar-benar dibaca
+    read = []
+
+    def fake_iter(data, mime_type):
+        for i in range(50):
+            read.append(i)
+            yield f"{i:02d}" + "x" * 98
+
+    monkeypatch.setattr(documents, "iter_document_text", fake_iter)
+    return read
+
+
+def test_parse_stops_at_budget(counted_pages):
+    entry = parse_document(b"pdf", "application/pdf", budget=250)
+    assert len(counted_pages) == 3
+    assert entry["pages"] == [0, 100, 200] and len(entry["text"]) == 300
+    assert entry["complete"] is False and entry["budget"] == 250
+
+    counted_pages.clear()
+    entry = parse_document(b"pdf", "application/pdf", budget=0)
+    assert len(counted_pages) == 50 and entry["complete"] is True
+
+
+def test_docx_is_read_per_paragraph_up_to_budget():
+    docx = pytest.importorskip("docx")
+    doc = docx.Document()
+    for i in range(20):
+        doc.add_paragraph(f"Paragraf {i:02d} " + "isi " * 20)
+    buffer = io.BytesIO()
+    doc.save(buffer)
+
+    entry = parse_document(buffer.getvalue(), MIME_DOCX, budget=200)
+    assert entry["text"].startswith("Paragraf 00") and "Paragraf 02" in entry["text"]
+    assert "Paragraf 03" not in entry["text"] and len(entry["pages"]) == 3
+    assert documents.read_document(buffer.getvalue(), MIME_DOCX, budget=200) == entry["text"][:200]
+
+
+def test_unsupported_format():
+    with pytest.raises(UnsupportedFormat):
+        parse_document(b"x", "image/png")
+
+
+def test_cache_by_content_hash(fresh_cache, counted_pages, monkeypatch):
+    entry = get_parsed(b"ebook", "application/pdf", budget=250)
+    assert len(counted_pages) == 3
+
+    # Isi sama: dari memori, lalu dari disk (proses baru / memori kosong), tanpa parse ulang
+    assert get_parsed(b"ebook", "application/pdf", budget=250) == entry
+    monkeypatch.setattr(documents, "_parsed_memory", documents.MemoryLRU(max_items=8))
+    assert get_parsed(b"ebook", "application/pdf", budget=100) == entry
+    assert len(counted_pages) == 3
+
+    # Budget lebih besar dari yang pernah diparse -> parse ulang; isi lain -> entry lain
+    assert len(get_parsed(b"ebook", "application/pdf", budget=500)["text"]) == 500
+    assert len(counted_pages) == 3 + 5
+    get_parsed(b"ebook lain", "application/pdf", budget=250)
+    assert len(counted_pages) == 3 + 5 + 3
+
+
+def test_complete_document_covers_any_budget(fresh_cache):
+    entry = get_parsed("teks pendek".encode(), MIME_TXT, budget=5)
+    assert entry["complete"] is False
+    full = get_parsed("teks pendek".encode(), MIME_TXT, budget=0)
+    assert full["complete"] is True
+    assert get_parsed("teks pendek".encode(), MIME_TXT, budget=10_000) == full
+
+
+def test_run_in_process_returns_result_and_errors():
+    entry = run_in_process(parse_document, "halo".encode(), MIME_TXT, 100, timeout=30)
+    assert entry["text"] == "halo"
+    with pytest.raises(UnsupportedFormat):
+        run_in_process(parse_document, b"x", "image/png", 100, timeout=30)
+
+
+def test_run_in_process_terminates_stuck_worker():
+    started = time.time()
+    with pytest.raises(DocumentTimeout):
+        run_in_process(time.sleep, 60, timeout=1)
+    assert time.time() - started < 15
+    assert multiprocessing.active_children() == []
+
+
+def test_run_in_process_reports_dead_worker():
+    with pytest.raises(WorkerDied):
+        run_in_process(os._exit, 3, timeout=30)
+
+
+def test_large_file_timeout_is_not_reparsed(fresh_cache, monkeypatch):
+    def stuck(*args, **kwargs):
+        raise DocumentTimeout("lama")
+
+    monkeypatch.setattr(documents, "PROCESS_THRESHOLD", 0)
+    monkeypatch.setattr(documents, "run_in_process", stuck)
+    monkeypatch.setattr(documents, "parse_document", lambda *a: pytest.fail("diparse ulang di thread"))
+    with pytest.raises(DocumentTimeout):
+        get_parsed(b"besar", MIME_TXT)
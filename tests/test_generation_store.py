@@ -0,0 +1,70 @@
+import gzip
+
+import pytest
+
+from generation_store import GenerationStore, compress, decompress
+
+
+@pytest.fixture
+def store(tmp_path):
+    return GenerationStore(path=str(tmp_path / "generations.db"))
+
+
+def save(store, name="Produk A", html="<html><body>A</body></html>", **kwargs):
+    return store.save({"product_name": name, "tone": "santai"}, html, {"headline": "Halo"}, mode="full", **kwargs)
+
+
+def test_save_and_load_round_trip(store):
+    generation_id = save(store, html="<p>🚀 Halo</p>", parse_ok=False)
+    loaded = store.load(generation_id)
+    assert loaded["html"] == "<p>🚀 Halo</p>"
+    assert loaded["copy_sections"] == {"headline": "Halo"}
+    assert loaded["inputs"]["tone"] == "santai"
+    assert loaded["parse_ok"] is False
+    assert store.load(generation_id + 100) is None
+
+
+def test_load_without_memory_cache(tmp_path):
+    path = str(tmp_path / "generations.db")
+    generation_id = save(GenerationStore(path=path), html="<p>x</p>" * 1000)
+    assert GenerationStore(path=path).load(generation_id)["html"] == "<p>x</p>" * 1000
+
+
+def test_identical_html_is_stored_once(store):
+    html = "<div>" + "sama " * 2000 + "</div>"
+    save(store, html=html)
+    once = store.stats()
+    save(store, html=html)
+    twice = store.stats()
+    assert twice["generations"] == 2
+    assert twice["stored_bytes"] == once["stored_bytes"]
+    assert twice["stored_bytes"] < twice["bytes"]
+
+
+def test_attach_trace(store):
+    generation_id = save(store)
+    store.attach_trace(generation_id, {"total": 1.5, "stages": [{"stage": "gemini", "model": "m", "key": "k1"}]})
+    assert store.load(generation_id)["trace"]["total"] == 1.5
+
+
+def test_page_and_count(store):
+    ids = [save(store, name=f"Produk {i % 2}") for i in range(5)]
+    assert store.count() == 5
+    assert store.count(product_name="Produk 0") == 3
+    assert [row["id"] for row in store.page(0, page_size=2)] == ids[::-1][:2]
+    assert [row["id"] for row in store.page(2, page_size=2)] == ids[:1]
+    assert all(row["product_name"] == "Produk 1" for row in store.page(product_name="Produk 1"))
+
+
+def test_diff_between_versions(store):
+    old_id = save(store, html="<div><h1>Lama</h1><p>sama</p></div>")
+    new_id = save(store, html="<div><h1>Baru</h1><p>sama</p></div>")
+    diff = store.diff(old_id, new_id)
+    assert "-<h1>Lama</h1>" in diff and "+<h1>Baru</h1>" in diff
+    assert store.diff(old_id, 999) == ""
+
+
+def test_gzip_codec_round_trip():
+    data = "teks 🚀".encode("utf-8") * 100
+    assert decompress(compress(data, "gzip"), "gzip") == data
+    assert gzip.decompress(compress(data, "gzip")) == data
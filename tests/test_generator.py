@@ -0,0 +1,172 @@
+import pytest
+
+pytest.importorskip("google.ai.generativelanguage")
+
+import generator
+from generator import LANDING_SYSTEM_INSTRUCTION, build_landing_prompt, build_request, prompt_cache_key
+
+
+def test_build_request_sends_system_instruction_inline():
+    request = build_request("gemini-2.0-flash", "Produk A", LANDING_SYSTEM_INSTRUCTION)
+    assert request.model == "models/gemini-2.0-flash"
+    assert request.system_instruction.parts[0].text == LANDING_SYSTEM_INSTRUCTION
+    assert request.contents[0].parts[0].text == "Produk A"
+    assert not request.cached_content
+
+    plain = build_request("gemini-2.0-flash", "Produk A")
+    assert not plain.system_instruction.parts
+
+
+def test_landing_prefix_is_identical_across_products():
+    # Prefix yang sama persis di setiap generate -> bisa kena implicit caching
+    first = build_request("m", build_landing_prompt("Produk A", "Ebook", "santai"), LANDING_SYSTEM_INSTRUCTION)
+    second = build_request("m", build_landing_prompt("Produk B", "Kelas", "formal"), LANDING_SYSTEM_INSTRUCTION)
+    assert first.system_instruction == second.system_instruction
+    assert "Produk A" not in LANDING_SYSTEM_INSTRUCTION
+    assert LANDING_SYSTEM_INSTRUCTION not in first.contents[0].parts[0].text
+    assert not hasattr(generator, "context_cache")
+
+
+def test_prompt_cache_key_includes_system_instruction():
+    assert prompt_cache_key("p", LANDING_SYSTEM_INSTRUCTION) != prompt_cache_key("p")
+    assert prompt_cache_key("p", "a") != prompt_cache_key("p", "b")
+
+
+# --- ROTATION ---
+class FakeClient:
+    """Pengganti GenerativeServiceClient satu key: behave(model) return teks, raise, atau tidur dulu."""
+
+    def __init__(self, key, behave, calls):
+        self.key = key
+        self.behave = behave
+        self.calls = calls
+
+    def generate_content(self, request, timeout=None):
+        from google.ai import generativelanguage as glm
+
+        model = request.model.split("/", 1)[1]
+        self.calls.append((self.key, model))
+        text = self.behave(model)
+        return glm.GenerateContentResponse({
+            "candidates": [{"content": {"parts": [{"text": text}]}, "finish_reason": 1}],
+            "usage_metadata": {"prompt_token_count": 10, "candidates_token_count": 5},
+        })
+
+
+@pytest.fixture
+def fake_gemini(tmp_path, monkeypatch):
+    from key_pool import KeyPool
+    from router import ModelRouter
+    from scheduler import QuotaScheduler
+
+    pool = KeyPool(state_file=str(tmp_path / "key_pool_state.json"))
+    monkeypatch.setattr(generator, "key_pool", pool)
+    monkeypatch.setattr(generator, "router", ModelRouter([generator.PRIMARY_MODEL, generator.FALLBACK_MODEL]))
+    monkeypatch.setattr(generator, "scheduler", QuotaScheduler(pool, rpm=0, tpm=0))
+    behaviours, calls = {}, []
+    monkeypatch.setattr(generator, "get_client", lambda key: FakeClient(key, behaviours[key], calls))
+    return behaviours, calls
+
+
+def ok(text):
+    return lambda model: text
+
+
+def fail(message):
+    def behave(model):
+        raise RuntimeError(message)
+    return behave
+
+
+def test_rotation_moves_to_next_key_after_429(fake_gemini):
+    behaviours, calls = fake_gemini
+    behaviours.update({"AIzaKEY-A": fail("429 Resource exhausted"), "AIzaKEY-B": ok("dari B")})
+    response = generator.generate_content_with_rotation("prompt", ["AIzaKEY-A", "AIzaKEY-B"])
+    assert response.text == "dari B"
+    # 429 berlaku untuk key-nya: model kedua di key A tidak dicoba
+    assert calls == [("AIzaKEY-A", generator.PRIMARY_MODEL), ("AIzaKEY-B", generator.PRIMARY_MODEL)]
+    assert generator.key_pool.status(["AIzaKEY-A", "AIzaKEY-B"]) == {"healthy": 1, "cooldown": 1, "banned": 0}
+
+
+def test_rotation_tries_second_model_after_other_errors(fake_gemini):
+    behaviours, calls = fake_gemini
+    behaviours["AIzaKEY-A"] = lambda model: "cadangan" if model == generator.FALLBACK_MODEL else 1 / 0
+    assert generator.generate_content_with_rotation("prompt", ["AIzaKEY-A"]).text == "cadangan"
+    assert calls == [("AIzaKEY-A", generator.PRIMARY_MODEL), ("AIzaKEY-A", generator.FALLBACK_MODEL)]
+
+
+def test_rotation_raises_last_error_when_all_routes_fail(fake_gemini):
+    behaviours, _ = fake_gemini
+    behaviours.update({"AIzaKEY-A": fail("500 server A"), "AIzaKEY-B": fail("500 server B")})
+    with pytest.raises(RuntimeError, match="500 server"):
+        generator.generate_content_with_rotation("prompt", ["AIzaKEY-A", "AIzaKEY-B"])
+
+
+def test_rotation_hedges_slow_route(fake_gemini, monkeypatch):
+    import time
+
+    import router as router_module
+    from tracing import end_trace, start_trace
+
+    behaviours, calls = fake_gemini
+    monkeypatch.setattr(router_module, "MIN_HEDGE_DELAY", 0.05)
+    for _ in range(router_module.MIN_SAMPLES):
+        generator.router.record("AIzaKEY-A", generator.PRIMARY_MODEL, 0.1, ok=True)
+    behaviours.update({"AIzaKEY-A": lambda model: time.sleep(1.0) or "lambat", "AIzaKEY-B": ok("cepat")})
+    generator.key_pool.mark_used("AIzaKEY-B")    # key A dipilih duluan
+
+    start_trace("test")
+    try:
+        response = generator.generate_content_with_rotation("prompt", ["AIzaKEY-A", "AIzaKEY-B"])
+    finally:
+        data = end_trace()
+    assert response.text == "cepat"
+    assert [key for key, _ in calls] == ["AIzaKEY-A", "AIzaKEY-B"]
+    assert data["hedged"] is True and data["key"] == generator.key_id("AIzaKEY-B")
+
+
+def test_rotation_without_launchable_route_raises_quota_exhausted(fake_gemini, monkeypatch):
+    from scheduler import QuotaExhausted
+
+    behaviours, calls = fake_gemini
+    behaviours["AIzaKEY-A"] = ok("tidak terpakai")
+    monkeypatch.setattr(generator, "reserve_route", lambda routes, tokens, block=False: None)
+    with pytest.raises(QuotaExhausted):
+        generator.generate_content_with_rotation("prompt", ["AIzaKEY-A"])
+    assert calls == []
+
+
+def test_rotation_fails_fast_when_quota_wait_is_too_long(fake_gemini, monkeypatch):
+    import scheduler
+    from scheduler import PRIORITY_INTERACTIVE, QuotaExhausted, QuotaScheduler
+
+    behaviours, calls = fake_gemini
+    behaviours["AIzaKEY-A"] = ok("pertama")
+    monkeypatch.setattr(generator, "scheduler", QuotaScheduler(generator.key_pool, rpm=1, tpm=0))
+    monkeypatch.setitem(scheduler.MAX_WAIT, PRIORITY_INTERACTIVE, 1)
+    assert generator.generate_content_with_rotation("prompt", ["AIzaKEY-A"]).text == "pertama"
+    with pytest.raises(QuotaExhausted):
+        generator.generate_content_with_rotation("prompt", ["AIzaKEY-A"])
+    assert len(calls) == 1
+
+
+# --- TEMPLATE MODE ---
+def test_render_content_response_flags_mistyped_json():
+    product = {"product_name": "Ebook Diet", "product_type": "Ebook / Produk Digital",
+               "harga_coret": "200rb", "harga_jual": "100rb", "bonuses": []}
+    text = '```json\n{"copywriting": "cuma teks", "sections": {"hero": "Judul", "story": "Cerita."}}\n```'
+    html, copy_sections, error = generator.render_content_response(text, product)
+    assert "Judul" in html and "HEMAT 50%" in html
+    assert copy_sections == {"body_copy": "cuma teks"}
+    assert "copywriting" in str(error) and "sections.hero" in str(error)
+
+    html, copy_sections, error = generator.render_content_response('{"copywriting": {"headline": "Oke"}}', product)
+    assert error is None and "<title>Oke</title>" in html
+
+
+def test_follower_wait_is_bounded_by_leader_priority():
+    from scheduler import MAX_WAIT, PRIORITY_BATCH, PRIORITY_INTERACTIVE, scheduling
+
+    assert generator.flight_timeout() == MAX_WAIT[PRIORITY_INTERACTIVE] + generator.REQUEST_TIMEOUT
+    with scheduling(priority=PRIORITY_BATCH):
+        assert generator.flight_timeout() == MAX_WAIT[PRIORITY_BATCH] + generator.REQUEST_TIMEOUT
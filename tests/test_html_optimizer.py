@@ -0,0 +1,62 @@
+from html_optimizer import optimize_html, merge_styles, minify_html, css_statements, used_classes
+
+CDN = '<script src="https://cdn.tailwindcss.com"></script>'
+WRAP_CSS = "p { word-wrap: break-word; }"
+
+
+def page(body, head=CDN):
+    return (f"<!DOCTYPE html><html><head>{head}<style>{WRAP_CSS}</style></head><body>"
+            f"<!-- HERO_START -->{body}<!-- HERO_END --><style>{WRAP_CSS}</style>"
+            f"<!-- catatan AI --></body></html>")
+
+
+def test_replaces_cdn_when_all_classes_known():
+    html, report = optimize_html(page('<div class="p-4 text-center md:flex hover:bg-red-600">Halo</div>'))
+    assert "cdn.tailwindcss.com" not in html
+    assert report["cdn_removed"] and report["unknown_classes"] == []
+    assert ".p-4{padding:1rem}" in html and "md\\:flex" in html
+    assert report["after_transfer"] < report["before_transfer"]
+
+
+def test_keeps_cdn_for_unknown_class_or_config():
+    html, report = optimize_html(page('<div class="animate-bounce p-4">Halo</div>'))
+    assert "cdn.tailwindcss.com" in html
+    assert report["unknown_classes"] == ["animate-bounce"]
+    html, report = optimize_html(page('<div class="p-4">x</div>', head=CDN + "<script>tailwind.config = {}</script>"))
+    assert not report["cdn_removed"] and "tailwind.config" in report["unknown_classes"]
+
+
+def test_merges_duplicate_style_blocks_and_keeps_markers():
+    html, report = optimize_html(page('<p class="custom">x</p>', head=""))
+    assert report["style_blocks"] == 2
+    assert html.count("<style>") == 1 and html.count("word-wrap:break-word") == 1
+    assert "<!-- HERO_START -->" in html and "<!-- HERO_END -->" in html
+    assert "catatan AI" not in html
+
+
+def test_page_classes_defined_in_page_css_are_not_unknown():
+    head = CDN + "<style>.kartu-promo{color:red}</style>"
+    _, report = optimize_html(page('<div class="kartu-promo p-4">x</div>', head=head))
+    assert report["cdn_removed"]
+
+
+def test_merge_styles_keeps_last_occurrence_order():
+    merged = merge_styles([".a{color:red}", ".b{color:blue}", ".a{color:red}"])
+    assert merged == ".b{color:blue}.a{color:red}"
+
+
+def test_css_statements_keeps_media_blocks_whole():
+    assert css_statements("@import x;.a{b:c}@media (min-width:1px){.d{e:f}}") == [
+        "@import x;", ".a{b:c}", "@media (min-width:1px){.d{e:f}}"]
+
+
+def test_minify_preserves_pre_and_script():
+    html = "<div>\n\n   <p>a    b</p>\n</div><pre>  baris\n    tetap </pre><script>var  x = 1;</script>"
+    result = minify_html(html)
+    assert "<pre>  baris\n    tetap </pre>" in result
+    assert "<script>var  x = 1;</script>" in result
+    assert "<p>a b</p>" in result
+
+
+def test_used_classes_first_occurrence_order():
+    assert used_classes('<a class="x y"></a><b class=\'y z\'></b>') == ["x", "y", "z"]
@@ -0,0 +1,156 @@
+import importlib.util
+import io
+import os
+import subprocess
+import sys
+import zipfile
+
+import pytest
+
+import image_pipeline
+from image_pipeline import optimize_images, package_zip, picture_html, process_image, standalone_html, variant_url
+
+HASH = "0123456789abcdef"
+LINK = "https://cdn.example.com/hero.jpg"
+
+
+def fake_meta():
+    return {
+        "hash": HASH, "width": 1024, "height": 512, "src": f"{HASH}-768.webp",
+        "variants": {
+            "avif": [[480, f"{HASH}-480.avif"], [1024, f"{HASH}-1024.avif"]],
+            "webp": [[480, f"{HASH}-480.webp"], [768, f"{HASH}-768.webp"], [1024, f"{HASH}-1024.webp"]],
+        },
+    }
+
+
+def write_variants(image_dir, meta):
+    for variants in meta["variants"].values():
+        for _, name in variants:
+            (image_dir / name).write_bytes(b"img-" + name.encode())
+
+
+def png_bytes(width, height):
+    Image = pytest.importorskip("PIL.Image")
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), (200, 40, 40)).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def test_picture_html_builds_sources_and_priority():
+    hero = picture_html(fake_meta(), "hero", "w-full", 'Produk "A"', LINK)
+    assert hero.startswith('<picture class="block"><source type="image/avif"')
+    assert f'srcset="{variant_url(HASH + "-480.avif")} 480w, {variant_url(HASH + "-1024.avif")} 1024w"' in hero
+    assert hero.index("image/avif") < hero.index("image/webp") < hero.index("<img")
+    assert f'src="{variant_url(HASH + "-768.webp")}"' in hero and f'data-original-src="{LINK}"' in hero
+    assert 'width="1024" height="512"' in hero and 'alt="Produk &quot;A&quot;"' in hero
+    assert 'fetchpriority="high"' in hero and 'loading="lazy"' not in hero
+
+    product = picture_html(fake_meta(), "product")
+    assert 'loading="lazy"' in product and "fetchpriority" not in product
+    assert "data-original-src" not in product
+
+    plain = picture_html(dict(fake_meta(), variants={}, width=None), "product")
+    assert plain.startswith("<img") and "<picture" not in plain and "width=" not in plain
+
+
+def test_optimize_images_rewrites_only_known_images():
+    html = ('<img src="hero.jpg" class="rounded" alt="Hero">'
+            '<img src="other.jpg" alt="lain">'
+            '<img src="plain-hero.jpg" alt="x"/>'
+            '<img src="plain-product.jpg" alt="y">')
+    images = {
+        "hero.jpg": (fake_meta(), "hero", LINK),
+        "plain-hero.jpg": (None, "hero", "plain-hero.jpg"),
+        "plain-product.jpg": (None, "product", "plain-product.jpg"),
+    }
+    out = optimize_images(html, images)
+    assert out.count("<picture") == 1 and 'class="rounded"' in out and 'alt="Hero"' in out
+    # <img> yang tidak dikenal & produk tanpa varian tidak disentuh
+    assert '<img src="other.jpg" alt="lain">' in out
+    assert '<img src="plain-product.jpg" alt="y">' in out
+    # Hero tanpa varian tetap <img>, tapi dimuat duluan
+    assert '<img src="plain-hero.jpg" alt="x" loading="eager" fetchpriority="high">' in out
+    assert 'loading="lazy"' not in out
+
+
+def test_standalone_html_restores_original_link_or_data_uri(tmp_path):
+    meta = fake_meta()
+    write_variants(tmp_path, meta)
+    linked = picture_html(meta, "hero", original=LINK)
+    uploaded = picture_html(meta, "product")
+    html = f"<body>{linked}{uploaded}<img src=\"https://x.test/a.png\"></body>"
+
+    out = standalone_html(html, image_dir=str(tmp_path))
+    assert "<picture" not in out and "<source" not in out
+    assert f'src="{LINK}"' in out and "data-original-src" not in out
+    assert 'src="data:image/webp;base64,' in out
+    assert '<img src="https://x.test/a.png">' in out
+
+
+def test_package_zip_ships_html_with_referenced_variants(tmp_path):
+    meta = fake_meta()
+    write_variants(tmp_path, meta)
+    (tmp_path / "fedcba9876543210-480.webp").write_bytes(b"tidak dipakai")
+    html = f"<body>{picture_html(meta, 'hero', original=LINK)}</body>"
+
+    with zipfile.ZipFile(io.BytesIO(package_zip(html, "produk.html", image_dir=str(tmp_path)))) as zf:
+        names = set(zf.namelist())
+        page = zf.read("produk.html").decode()
+        assert zf.read(f"images/{HASH}-480.avif") == f"img-{HASH}-480.avif".encode()
+    expected = {f"images/{name}" for variants in meta["variants"].values() for _, name in variants}
+    assert names == expected | {"produk.html"}
+    # Di dalam ZIP varian lokal ada, jadi <picture> tetap dan link aslinya dibuang
+    assert "<picture" in page and "data-original-src" not in page
+
+
+def test_process_image_without_pillow_keeps_original(tmp_path, monkeypatch):
+    monkeypatch.setattr(image_pipeline, "_pillow", False)
+    assert image_pipeline.available_formats() == []
+
+    meta = process_image(b"\xff\xd8jpeg-bytes", "image/jpeg", image_dir=str(tmp_path))
+    assert meta["variants"] == {} and meta["width"] is None
+    assert meta["src"] == f"{meta['hash']}.jpg"
+    assert (tmp_path / meta["src"]).read_bytes() == b"\xff\xd8jpeg-bytes"
+    # Tanpa varian optimize_images tidak membuat <picture>
+    assert "<picture" not in picture_html(meta, "hero")
+
+
+def test_process_image_builds_variants_and_caches_by_hash(tmp_path):
+    data = png_bytes(1200, 600)
+    if not image_pipeline.available_formats():
+        pytest.skip("Pillow tanpa encoder WebP/AVIF")
+    meta = process_image(data, "image/png", image_dir=str(tmp_path))
+    assert (meta["width"], meta["height"]) == (1200, 600)
+    for fmt, variants in meta["variants"].items():
+        assert [w for w, _ in variants] == [480, 768, 1024, 1200]
+        assert all(name.endswith(f".{fmt}") and (tmp_path / name).exists() for _, name in variants)
+    assert meta["src"].endswith("-768.webp") or "webp" not in meta["variants"]
+
+    # Isi sama -> meta dari cache, tidak diolah ulang
+    for _, name in next(iter(meta["variants"].values())):
+        (tmp_path / name).unlink()
+    assert process_image(data, "image/png", image_dir=str(tmp_path)) == meta
+
+
+def test_process_image_does_not_upscale_small_images(tmp_path):
+    data = png_bytes(300, 200)
+    if not image_pipeline.available_formats():
+        pytest.skip("Pillow tanpa encoder WebP/AVIF")
+    meta = process_image(data, "image/png", image_dir=str(tmp_path))
+    assert meta["width"] == 300
+    assert all([w for w, _ in variants] == [300] for variants in meta["variants"].values())
+
+
+def test_import_does_not_load_pillow():
+    # app.py / landing_job.py meng-import modul ini di awal; Pillow baru dimuat saat gambar diolah
+    modules = "image_pipeline"
+    try:
+        if importlib.util.find_spec("google.ai.generativelanguage"):
+            modules += ", landing_job"
+    except ModuleNotFoundError:
+        pass
+    code = f"import sys, {modules}; print(sorted(m for m in ('PIL', 'html_optimizer') if m in sys.modules))"
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True).stdout
+    assert output.strip() == "[]"
@@ -0,0 +1,184 @@
+import threading
+import time
+
+import pytest
+
+from jobs import JobQueue
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return JobQueue(path=str(tmp_path / "jobs.db"), workers=1)
+
+
+def wait_for(queue, job_id, statuses=("done", "error", "cancelled"), timeout=5):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        info = queue.status(job_id)
+        if info and info["status"] in statuses:
+            return info
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} tidak mencapai {statuses}: {queue.status(job_id)}")
+
+
+def blocking_job(started, release):
+    def run(job):
+        started.set()
+        release.wait(5)
+        job.check_cancelled()
+        return "selesai"
+    return run
+
+
+def test_submit_runs_job_and_persists_result(queue, tmp_path):
+    def run(job, a, b=0):
+        job.progress(0.5, "Setengah jalan")
+        job.partial(html="<p>")
+        return {"sum": a + b, "teks": "🚀"}
+
+    job_id = queue.submit("landing", run, 2, b=3, label="Produk A")
+    info = wait_for(queue, job_id)
+    assert info["status"] == "done" and info["progress"] == 1.0
+    assert info["result"] == {"sum": 5, "teks": "🚀"} and info["label"] == "Produk A"
+    assert queue.partial(job_id) == {} and queue.stats() == {"running": 0, "queued": 0}
+    # Sesi lain / proses baru membaca dari SQLite
+    assert JobQueue(path=str(tmp_path / "jobs.db")).status(job_id)["result"] == {"sum": 5, "teks": "🚀"}
+
+
+def test_error_is_recorded(queue):
+    def boom(job):
+        raise ValueError("kuota habis")
+
+    info = wait_for(queue, queue.submit("landing", boom))
+    assert info["status"] == "error" and info["error"] == "kuota habis"
+
+
+def test_cancel_before_start_and_position(queue):
+    started, release = threading.Event(), threading.Event()
+    first = queue.submit("landing", blocking_job(started, release))
+    assert started.wait(5)
+    second = queue.submit("landing", lambda job: "b")
+    third = queue.submit("landing", lambda job: "c")
+    assert queue.position(first) == 0
+    assert (queue.position(second), queue.position(third)) == (0, 1)
+    assert queue.stats() == {"running": 1, "queued": 2}
+
+    assert queue.cancel(second)
+    assert queue.status(second)["status"] == "cancelled"
+    assert queue.position(third) == 0
+    release.set()
+    assert wait_for(queue, first)["status"] == "done"
+    assert wait_for(queue, third)["result"] == "c"
+    assert not queue.cancel(second)
+
+
+def test_cancel_while_running_stops_at_next_check(queue):
+    started, release = threading.Event(), threading.Event()
+    job_id = queue.submit("batch", blocking_job(started, release))
+    assert started.wait(5)
+    assert queue.cancel(job_id)
+    assert queue.status(job_id)["status"] == "running"
+    release.set()
+    info = wait_for(queue, job_id)
+    assert info["status"] == "cancelled" and info["result"] is None
+
+
+def test_unserializable_result_becomes_error(queue):
+    info = wait_for(queue, queue.submit("landing", lambda job: {"obj": object()}))
+    assert info["status"] == "error" and "tidak bisa disimpan" in info["error"]
+    assert queue.stats() == {"running": 0, "queued": 0}
+
+
+def test_finish_cleans_up_even_when_sqlite_fails(queue, monkeypatch):
+    def broken(*args):
+        raise RuntimeError("disk penuh")
+
+    started, release = threading.Event(), threading.Event()
+    job_id = queue.submit("landing", blocking_job(started, release))
+    assert started.wait(5)
+    monkeypatch.setattr(queue, "_store_finish", broken)
+    release.set()
+    deadline = time.time() + 5
+    while job_id in queue.live and time.time() < deadline:
+        time.sleep(0.01)
+    assert job_id not in queue.live and job_id not in queue.futures and job_id not in queue.cancelled
+
+
+def test_restart_marks_unfinished_jobs_as_error(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    queue = JobQueue(path=path, workers=1)
+    started, release = threading.Event(), threading.Event()
+    running = queue.submit("landing", blocking_job(started, release))
+    assert started.wait(5)
+    queued = queue.submit("landing", lambda job: "x")
+
+    restarted = JobQueue(path=path)
+    for job_id in (running, queued):
+        info = restarted.status(job_id)
+        assert info["status"] == "error" and "restart" in info["error"].lower()
+    release.set()
+    wait_for(queue, queued)
+
+
+def test_run_section_job_saves_new_version(tmp_path, monkeypatch):
+    pytest.importorskip("google.ai.generativelanguage")
+    import landing_job
+    from generation_store import GenerationStore
+
+    store = GenerationStore(path=str(tmp_path / "generations.db"))
+    parent = store.save({"product_name": "Produk A"}, "<p>lama</p>", {"headline": "Halo"}, mode="full")
+    calls = []
+
+    def fake_regenerate(html, name, product, keys, instruction="", force=False):
+        calls.append((html, name, product["product_name"], instruction))
+        return "<p>baru</p>"
+
+    monkeypatch.setattr(landing_job, "regenerate_section", fake_regenerate)
+    queue = JobQueue(path=str(tmp_path / "jobs.db"), workers=1)
+    job_id = queue.submit("section", landing_job.run_section_job, parent, "HERO", "lebih singkat", ["k"], store)
+    result = wait_for(queue, job_id)["result"]
+
+    assert calls == [("<p>lama</p>", "HERO", "Produk A", "lebih singkat")]
+    assert result["section"] == "HERO" and result["generation_id"] != parent
+    saved = store.load(result["generation_id"])
+    assert saved["html"] == "<p>baru</p>" and saved["inputs"]["parent_id"] == parent
+    assert saved["inputs"]["regenerated_section"] == "HERO"
+
+    missing = wait_for(queue, queue.submit("section", landing_job.run_section_job, 999, "HERO", "", ["k"], store))
+    assert missing["status"] == "error" and "#999" in missing["error"]
+
+
+def test_run_batch_job_reports_progress_and_cancels(tmp_path, monkeypatch):
+    pytest.importorskip("google.ai.generativelanguage")
+    import batch_generate
+
+    gate = threading.Event()
+    seen = []
+
+    def fake_run_batch(rows, out_dir, keys, workers=None, force=False, on_result=None, use_templates=False):
+        results = []
+        for i, row in enumerate(rows, 1):
+            entry = {"product_name": row["product_name"], "status": "ok" if i != 2 else "error"}
+            results.append(entry)
+            on_result(entry, i, len(rows))
+            seen.append(row["product_name"])
+            gate.wait(5)
+        return {"results": results, "skipped": 1}
+
+    monkeypatch.setattr(batch_generate, "run_batch", fake_run_batch)
+    queue = JobQueue(path=str(tmp_path / "jobs.db"), workers=1)
+    rows = [{"product_name": f"P{i}"} for i in range(1, 4)]
+    gate.set()
+    info = wait_for(queue, queue.submit("batch", batch_generate.run_batch_job, rows, "out", ["k"]))
+    assert info["result"] == {"out_dir": "out", "ok": 2, "failed": 1, "skipped": 1}
+    assert info["message"] == "3/3 selesai"
+
+    gate.clear()
+    seen.clear()
+    job_id = queue.submit("batch", batch_generate.run_batch_job, rows, "out", ["k"])
+    while not seen:
+        time.sleep(0.01)
+    queue.cancel(job_id)
+    gate.set()
+    assert wait_for(queue, job_id)["status"] == "cancelled"
+    assert seen == ["P1"]
@@ -0,0 +1,104 @@
+import json
+import math
+import time
+
+import pytest
+
+from key_pool import (
+    KeyPool, key_id, client_kwargs, parse_retry_delay, is_rate_limit_error, is_leaked_key_error,
+    BASE_COOLDOWN,
+)
+
+
+@pytest.fixture
+def pool(tmp_path):
+    return KeyPool(state_file=str(tmp_path / "key_pool_state.json"))
+
+
+def test_key_id_is_short_hash():
+    kid = key_id("AIza-secret-key")
+    assert len(kid) == 16
+    assert "secret" not in kid
+    assert kid == key_id("AIza-secret-key")
+
+
+@pytest.mark.parametrize("message, expected", [
+    ("429 Quota exceeded. Please retry in 37.5s.", 37.5),
+    ("429 ResourceExhausted retry_delay { seconds: 12 }", 12.0),
+    ("500 Internal error", None),
+])
+def test_parse_retry_delay(message, expected):
+    assert parse_retry_delay(Exception(message)) == expected
+
+
+def test_error_classification():
+    assert is_rate_limit_error(Exception("429 Resource has been exhausted"))
+    assert is_rate_limit_error(Exception("You exceeded your current quota"))
+    assert is_leaked_key_error(Exception("403 Your API key was reported as leaked"))
+    assert not is_leaked_key_error(Exception("403 Permission denied"))
+
+
+def test_client_kwargs_reads_endpoint_at_call_time(monkeypatch):
+    monkeypatch.delenv("GEMINI_API_ENDPOINT", raising=False)
+    assert client_kwargs("k") == {"client_options": {"api_key": "k"}}
+    monkeypatch.setenv("GEMINI_API_ENDPOINT", "http://127.0.0.1:9999")
+    assert client_kwargs("k")["client_options"]["api_endpoint"] == "http://127.0.0.1:9999"
+    assert client_kwargs("k")["transport"] == "rest"
+
+
+def test_candidates_least_recently_used_first(pool):
+    pool.mark_used("a")
+    time.sleep(0.01)
+    pool.mark_used("b")
+    assert pool.candidates(["a", "b", "c"]) == ["c", "a", "b"]
+
+
+def test_reserve_spreads_concurrent_picks(pool):
+    first = pool.candidates(["a", "b"], reserve=True)[0]
+    second = pool.candidates(["a", "b"], reserve=True)[0]
+    assert first != second
+
+
+def test_rate_limited_key_goes_last_and_backs_off(pool):
+    pool.mark_failure("a", Exception("429 quota"))
+    assert pool.candidates(["a", "b"]) == ["b", "a"]
+    first_until = pool.available_at("a")
+    assert first_until == pytest.approx(time.time() + BASE_COOLDOWN, abs=5)
+    pool.mark_failure("a", Exception("429 quota"))
+    assert pool.available_at("a") > first_until
+    assert pool.status(["a", "b"]) == {"healthy": 1, "cooldown": 1, "banned": 0}
+
+
+def test_retry_delay_from_error_wins(pool):
+    pool.mark_failure("a", Exception("429 quota, retry in 3s"))
+    assert pool.available_at("a") == pytest.approx(time.time() + 3, abs=1)
+
+
+def test_leaked_key_is_banned(pool):
+    pool.mark_failure("a", Exception("403 API key was reported as leaked"))
+    assert pool.candidates(["a", "b"]) == ["b"]
+    assert math.isinf(pool.available_at("a"))
+    pool.reset("a")
+    assert pool.available_at("a") == 0
+
+
+def test_success_clears_cooldown(pool):
+    pool.mark_failure("a", Exception("429 quota"))
+    pool.mark_success("a")
+    assert pool.available_at("a") == 0
+    assert pool.status(["a"])["healthy"] == 1
+
+
+def test_state_persists_without_raw_keys(tmp_path):
+    path = str(tmp_path / "state.json")
+    KeyPool(state_file=path).mark_failure("AIza-secret", Exception("403 leaked"))
+    with open(path) as f:
+        stored = json.load(f)
+    assert list(stored) == [key_id("AIza-secret")]
+    assert math.isinf(KeyPool(state_file=path).available_at("AIza-secret"))
+
+
+def test_corrupt_state_file_is_ignored(tmp_path):
+    path = tmp_path / "state.json"
+    path.write_text("{not json")
+    assert KeyPool(state_file=str(path)).candidates(["a"]) == ["a"]
@@ -0,0 +1,90 @@
+import pytest
+
+from page_templates import normalize_content, render_landing_page
+from sections import find_sections
+
+EBOOK = {"product_name": "Ebook Diet", "product_type": "Ebook / Produk Digital", "discount_label": "HEMAT 50%",
+         "bonuses": ["Checklist"], "use_boosters": True}
+PHYSICAL = dict(EBOOK, product_name="Botol Minum", product_type="Produk Fisik / Barang")
+
+
+def test_well_formed_content_is_untouched():
+    content = {
+        "copywriting": {"headline": "Halo", "benefits": ["a", "b"]},
+        "sections": {"hero": {"headline": "H"}, "story": ["x"], "faq": [{"q": "?", "a": "!"}]},
+    }
+    normalized, problems = normalize_content(content)
+    assert problems == [] and normalized == content
+
+
+@pytest.mark.parametrize("content, expected", [
+    (None, {"copywriting": {}, "sections": {}}),
+    ("teks saja", {"copywriting": {}, "sections": {}}),
+    ([{"copywriting": {"headline": "Dari list"}}], {"copywriting": {"headline": "Dari list"}, "sections": {}}),
+])
+def test_top_level_shapes(content, expected):
+    normalized, problems = normalize_content(content)
+    assert {k: normalized.get(k, {}) for k in expected} == expected
+    assert problems == ([] if content is None else ["content"])
+
+
+def test_mistyped_fields_are_coerced_and_reported():
+    content = {
+        "copywriting": "Copy panjang tanpa struktur",
+        "sections": {
+            "hero": "Headline langsung",
+            "agitation": ["Paragraf tanpa object"],
+            "offer": {"label": ["Promo", "Hari Ini"], "text": None},
+            "story": "Satu cerita. Dua kalimat.",
+            "solution": {"isi": "Solusi dalam object"},
+            "what_you_get": 42,
+            "faq": True,
+            "value_line": {"teks": "Murah", "lagi": ["banget"]},
+        },
+    }
+    normalized, problems = normalize_content(content)
+    copy, s = normalized["copywriting"], normalized["sections"]
+    assert copy == {"body_copy": "Copy panjang tanpa struktur"}
+    assert s["hero"] == {"headline": "Headline langsung"}
+    assert s["agitation"] == {}
+    assert s["offer"] == {"label": "Promo Hari Ini", "text": ""}
+    assert s["story"] == ["Satu cerita. Dua kalimat."]
+    assert s["solution"] == [{"isi": "Solusi dalam object"}]
+    # Skalar dibungkus list; renderer FAQ sendiri melewati elemen yang bukan object
+    assert s["what_you_get"] == [42] and s["faq"] == [True]
+    assert s["value_line"] == "Murah banget"
+    assert sorted(problems) == sorted([
+        "copywriting", "sections.hero", "sections.agitation", "sections.offer.label",
+        "sections.solution", "sections.value_line",
+    ])
+
+
+@pytest.mark.parametrize("product", [EBOOK, PHYSICAL], ids=["ebook", "fisik"])
+def test_render_tolerates_mistyped_content(product):
+    content = {
+        "copywriting": ["bukan object"],
+        "sections": {
+            "hero": "Judul <b>tebal</b>",
+            "agitation": "Kenapa susah?",
+            "benefits": "bukan list of object",
+            "testimonials": [{"name": "Ani", "text": "Mantap"}, "Budi: ok"],
+            "offer": "Diskon hari ini",
+            "faq": {"q": "Aman?", "a": "Aman"},
+            "trust_badges": "Garansi",
+            "bonus_descriptions": None,
+            "story": None,
+        },
+    }
+    html = render_landing_page(content, product)
+    assert html.startswith("<!DOCTYPE html>")
+    names = [name for name, _ in find_sections(html)]
+    assert names[0] == "HERO" and "PRICING" in names and "FAQ" in names
+    assert "&lt;b&gt;" in html and "<b>tebal" not in html
+    assert "Aman?" in html and "Garansi" in html
+
+
+def test_render_with_empty_content_uses_defaults():
+    html = render_landing_page({}, EBOOK)
+    assert "<title>Ebook Diet</title>" in html
+    assert "Garansi 30 Hari Uang Kembali" in html and "Rp 99.000" in html
+    assert "Pertanyaan yang Sering" not in html
@@ -0,0 +1,96 @@
+import json
+import random
+
+import pytest
+
+from response_parser import (
+    StreamingFieldParser, decode_json_response, decode_landing_response, repair_json,
+)
+
+FIELDS = ["headline", "cta", "html_code"]
+RESPONSE = {
+    "copywriting": {"headline": 'Judul "keren" 🚀', "cta": "Beli\nsekarang", "benefits": ["a", "b"]},
+    "html_code": '<!DOCTYPE html><html><body><div class="x">' + "isi " * 500 + "</div></body></html>",
+}
+
+
+def feed_in_chunks(text, sizes):
+    parser = StreamingFieldParser(FIELDS)
+    i = 0
+    for size in sizes:
+        parser.feed(text[i:i + size])
+        i += size
+    parser.feed(text[i:])
+    return parser
+
+
+@pytest.mark.parametrize("ensure_ascii", [True, False])
+def test_streaming_matches_full_decode_for_any_chunking(ensure_ascii):
+    text = "```json\n" + json.dumps(RESPONSE, ensure_ascii=ensure_ascii, indent=1) + "\n```"
+    rng = random.Random(0)
+    for _ in range(20):
+        parser = feed_in_chunks(text, [rng.randint(1, 30) for _ in range(len(text) // 10)])
+        assert parser.value("headline") == RESPONSE["copywriting"]["headline"]
+        assert parser.value("cta") == RESPONSE["copywriting"]["cta"]
+        assert parser.value("html_code") == RESPONSE["html_code"]
+        assert all(parser.is_done(field) for field in FIELDS)
+
+
+def test_streaming_reports_progress_before_done():
+    text = json.dumps(RESPONSE)
+    cut = text.index("isi isi") + 7
+    parser = feed_in_chunks(text[:cut], [cut])
+    assert parser.is_done("headline")
+    assert parser.has_started("html_code") and not parser.is_done("html_code")
+    assert parser.value("html_code").startswith("<!DOCTYPE html>")
+
+
+def test_streaming_key_split_across_chunks():
+    parser = StreamingFieldParser(["headline"])
+    for piece in ('{"head', 'line"', "  :", '  "Ha', 'lo"}'):
+        parser.feed(piece)
+    assert parser.is_done("headline") and parser.value("headline") == "Halo"
+
+
+def test_streaming_buffer_does_not_grow_with_response():
+    parser = StreamingFieldParser(["headline", "html_code"])
+    parser.feed('{"html_code": "')
+    for _ in range(2000):
+        parser.feed("<p>x</p>" * 10)
+    assert len(parser.buffer) < 1000
+    assert not parser.has_started("headline")
+
+
+def test_decode_valid_with_fence_and_list():
+    data, error, repaired = decode_json_response("```json\n[" + json.dumps({"a": 1}) + "]\n```")
+    assert data == {"a": 1} and error is None and not repaired
+
+
+@pytest.mark.parametrize("broken", [
+    '{"a": "baris\nbaru", }',
+    '{"a": "<div class="x">"}',
+    '{"a": "Rp 99\\.000"}',
+    '{"a": "terpotong',
+])
+def test_repair_common_llm_mistakes(broken):
+    data, error, repaired = decode_json_response(broken)
+    assert error is None and repaired
+    assert json.loads(repair_json(broken)) == data
+
+
+def test_salvage_fields_from_unrepairable_json():
+    html, copy_sections, error, _ = decode_landing_response('{"copywriting": {"headline": "Halo"] "benefits": ["satu", "dua"]')
+    assert error is not None
+    assert copy_sections["headline"] == "Halo"
+    assert copy_sections["benefits"] == ["satu", "dua"]
+    assert "JSON Parse Error" in html
+
+
+def test_landing_response_falls_back_to_raw_html():
+    html, copy_sections, error, _ = decode_landing_response("Berikut halamannya: <!DOCTYPE html><html><body>ok</body></html>")
+    assert html.startswith("<!DOCTYPE html>") and copy_sections == {}
+
+
+def test_landing_response_closes_truncated_html():
+    html, _, _, _ = decode_landing_response(json.dumps({"html_code": "<html><body><p>setengah"}))
+    assert html.endswith("</body>\n</html>")
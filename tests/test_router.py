@@ -0,0 +1,83 @@
+import router as router_module
+from router import MIN_HEDGE_DELAY, ModelRouter, percentile
+
+MODELS = ["primary", "fallback"]
+
+
+def feed(router, key, model, latency, count=10, ok=True):
+    for _ in range(count):
+        router.record(key, model, latency, ok=ok)
+
+
+def test_percentile():
+    assert percentile([], 50) is None
+    assert percentile([3, 1, 2], 50) == 2
+    assert percentile(range(1, 101), 95) == 95
+
+
+def test_without_stats_keeps_key_order_and_puts_second_model_last():
+    router = ModelRouter(MODELS)
+    assert router.routes(["a", "b", "c"]) == [
+        ("a", "primary"), ("b", "primary"), ("c", "primary"),
+        ("a", "fallback"), ("b", "fallback"), ("c", "fallback"),
+    ]
+
+
+def test_slow_route_goes_behind_faster_keys():
+    router = ModelRouter(MODELS)
+    feed(router, "a", "primary", 9.0)
+    feed(router, "b", "primary", 2.0)
+    feed(router, "c", "primary", 2.5)
+    assert [key for key, _ in router.routes(["a", "b", "c"])[:3]] == ["b", "c", "a"]
+
+
+def test_similar_latency_keeps_pool_order():
+    # Selisih kecil tidak mengubah urutan: beban tetap tersebar sesuai key_pool
+    router = ModelRouter(MODELS)
+    feed(router, "a", "primary", 2.4)
+    feed(router, "b", "primary", 2.0)
+    assert router.routes(["a", "b"])[:2] == [("a", "primary"), ("b", "primary")]
+
+
+def test_unhealthy_route_switches_model_then_goes_last():
+    router = ModelRouter(MODELS)
+    feed(router, "a", "primary", 1.0, count=8, ok=False)
+    # Key a masih punya model kedua yang sehat: itu yang dipakai untuk key a
+    assert router.routes(["a", "b"])[:2] == [("a", "fallback"), ("b", "primary")]
+
+    feed(router, "a", "fallback", 1.0, count=8, ok=False)
+    routes = router.routes(["a", "b"])
+    assert routes[0] == ("b", "primary") and routes[-1][0] == "a"
+    assert router.snapshot("a", "primary")["error_rate"] == 1.0
+
+
+def test_faster_model_preferred_on_same_key():
+    router = ModelRouter(MODELS)
+    feed(router, "a", "primary", 6.0)
+    feed(router, "a", "fallback", 1.0)
+    assert router.routes(["a"]) == [("a", "fallback"), ("a", "primary")]
+
+
+def test_hedge_delay_needs_samples_and_has_floor(monkeypatch):
+    router = ModelRouter(MODELS, window=20)
+    assert router.hedge_delay("a", "primary") is None
+    feed(router, "a", "primary", 1.0, count=router_module.MIN_SAMPLES - 1)
+    assert router.hedge_delay("a", "primary") is None
+    feed(router, "a", "primary", 1.0, count=1)
+    assert router.hedge_delay("a", "primary") == MIN_HEDGE_DELAY
+
+    feed(router, "a", "primary", 12.0, count=19)
+    assert router.hedge_delay("a", "primary") == 12.0
+    # Hanya WINDOW request terakhir yang dihitung
+    feed(router, "a", "primary", 0.5, count=20)
+    assert router.hedge_delay("a", "primary") == MIN_HEDGE_DELAY
+    monkeypatch.setattr(router_module, "MIN_HEDGE_DELAY", 0.1)
+    assert router.hedge_delay("a", "primary") == 0.5
+
+
+def test_failures_do_not_count_as_latency():
+    router = ModelRouter(MODELS)
+    feed(router, "a", "primary", 30.0, count=3, ok=False)
+    feed(router, "a", "primary", 1.0, count=5)
+    stats = router.snapshot("a", "primary")
+    assert stats["samples"] == 8 and stats["p95"] == 1.0
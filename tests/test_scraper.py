@@ -0,0 +1,174 @@
+import threading
+import time
+from collections import defaultdict
+
+import pytest
+
+import scraper
+from disk_cache import DiskCache
+from scraper import scrape_content, scrape_many
+
+PAGE = "<html><body><h1>Promo {n}</h1><p>Teks kompetitor.</p></body></html>"
+
+
+class FakeResponse:
+    def __init__(self, status=200, body=b"", headers=None, chunk=64 * 1024):
+        self.status_code = status
+        self.headers = headers or {}
+        self.encoding = "utf-8"
+        self.body = body
+        self.chunk = chunk
+        self.chunks_read = 0
+        self.closed = False
+        self._content = None
+
+    @property
+    def content(self):
+        # Seperti requests: fetch_html mengisi _content dengan body yang sudah dipotong
+        return self._content
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"{self.status_code} Server Error")
+
+    def iter_content(self, chunk_size):
+        for start in range(0, len(self.body), self.chunk):
+            self.chunks_read += 1
+            yield self.body[start:start + self.chunk]
+
+    def close(self):
+        self.closed = True
+
+
+class FakeSession:
+    """Session palsu: respond(url, headers) -> FakeResponse. Mencatat request & konkurensi per host."""
+
+    def __init__(self, respond, delay=0.0):
+        self.respond = respond
+        self.delay = delay
+        self.requests = []
+        self.lock = threading.Lock()
+        self.active = defaultdict(int)
+        self.peak = defaultdict(int)
+        self.peak_total = 0
+
+    def get(self, url, headers=None, timeout=None, stream=False):
+        host = url.split("/")[2]
+        with self.lock:
+            self.requests.append((url, dict(headers or {})))
+            self.active[host] += 1
+            self.peak[host] = max(self.peak[host], self.active[host])
+            self.peak_total = max(self.peak_total, sum(self.active.values()))
+        try:
+            time.sleep(self.delay)
+            return self.respond(url, headers or {})
+        finally:
+            with self.lock:
+                self.active[host] -= 1
+
+
+@pytest.fixture
+def web(tmp_path, monkeypatch):
+    cache = DiskCache("scrapes", ttl=60, cache_dir=str(tmp_path), keep_stale=True)
+    monkeypatch.setattr(scraper, "_scrape_cache", cache)
+    monkeypatch.setattr(scraper, "_host_limits", defaultdict(lambda: threading.BoundedSemaphore(scraper.PER_HOST_LIMIT)))
+
+    def install(respond, delay=0.0):
+        session = FakeSession(respond, delay)
+        monkeypatch.setattr(scraper, "_session", session)
+        return session
+    return install, cache
+
+
+def page(url, headers):
+    return FakeResponse(body=PAGE.format(n=url.rsplit("/", 1)[-1]).encode())
+
+
+def test_session_is_pooled_and_retries():
+    pytest.importorskip("requests")
+    scraper._session = None
+    try:
+        session = scraper.get_session()
+        assert scraper.get_session() is session
+        adapter = session.get_adapter("https://contoh.com/")
+        assert adapter is session.get_adapter("http://lain.com/")
+        assert adapter._pool_maxsize == 20 and adapter.max_retries.total == 3
+        assert 429 in adapter.max_retries.status_forcelist
+        assert session.headers["Accept-Encoding"].startswith("gzip, deflate")
+    finally:
+        scraper._session = None
+
+
+def test_scrape_many_dedupes_and_limits_per_host(web):
+    install, _ = web
+    session = install(page, delay=0.05)
+    urls = [f"https://a.test/{i}" for i in range(6)] + ["https://b.test/1", "https://b.test/2", "", "https://a.test/0"]
+    texts = scrape_many(urls)
+    assert list(texts) == [u for u in dict.fromkeys(urls) if u]
+    assert texts["https://a.test/3"] == "Promo 3\nTeks kompetitor."
+    assert len(session.requests) == 8
+    assert session.peak["a.test"] == scraper.PER_HOST_LIMIT
+    # Host lain tidak ikut antri di belakang a.test
+    assert session.peak_total > scraper.PER_HOST_LIMIT
+
+
+def test_body_is_capped(web, monkeypatch):
+    install, _ = web
+    monkeypatch.setattr(scraper, "MAX_BODY_BYTES", 1000)
+    big = FakeResponse(body=b"<p>" + b"x" * 100000 + b"</p>", chunk=300)
+    install(lambda url, headers: big)
+    response = scraper.fetch_html("https://a.test/besar")
+    assert len(response._content) == 1000
+    assert big.chunks_read == 4 and big.closed
+
+
+def test_fresh_cache_skips_network(web):
+    install, _ = web
+    session = install(page)
+    assert scrape_content("https://a.test/1") == "Promo 1\nTeks kompetitor."
+    assert scrape_content("https://a.test/1") == "Promo 1\nTeks kompetitor."
+    assert len(session.requests) == 1
+    scrape_content("https://a.test/1", use_cache=False)
+    assert len(session.requests) == 2
+
+
+def test_stale_entry_is_revalidated(web, monkeypatch):
+    install, cache = web
+    cache.ttl = 0.05
+    versions = {"body": PAGE.format(n=1)}
+
+    def respond(url, headers):
+        if headers.get("If-None-Match") == '"v1"':
+            return FakeResponse(status=304)
+        return FakeResponse(body=versions["body"].encode(), headers={"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"})
+
+    session = install(respond)
+    assert scrape_content("https://a.test/x") == "Promo 1\nTeks kompetitor."
+    time.sleep(0.1)
+
+    # 304: teks lama dipakai lagi tanpa parse ulang, umurnya dihitung ulang
+    monkeypatch.setattr(scraper, "html_to_text", lambda *a: pytest.fail("diparse ulang"))
+    assert scrape_content("https://a.test/x") == "Promo 1\nTeks kompetitor."
+    assert session.requests[-1][1] == {"If-None-Match": '"v1"', "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"}
+    assert cache.get("https://a.test/x") is not None
+
+
+def test_changed_page_replaces_stale_entry(web):
+    install, cache = web
+    cache.ttl = 0.05
+    bodies = iter([PAGE.format(n=1), PAGE.format(n=2)])
+    install(lambda url, headers: FakeResponse(body=next(bodies).encode(), headers={"ETag": '"v"'}))
+    assert scrape_content("https://a.test/x") == "Promo 1\nTeks kompetitor."
+    time.sleep(0.1)
+    assert scrape_content("https://a.test/x") == "Promo 2\nTeks kompetitor."
+
+
+def test_server_error_falls_back_to_stale_text(web):
+    install, cache = web
+    cache.ttl = 0.05
+    install(page)
+    assert scrape_content("https://a.test/1") == "Promo 1\nTeks kompetitor."
+    time.sleep(0.1)
+    install(lambda url, headers: FakeResponse(status=503))
+    assert scrape_content("https://a.test/1") == "Promo 1\nTeks kompetitor."
+    assert scrape_content("https://a.test/baru").startswith("Gagal scraping: 503")
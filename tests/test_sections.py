@@ -0,0 +1,44 @@
+from sections import marked, find_sections, get_section, replace_section, clean_section_output
+
+PAGE = "\n".join([
+    "<html><body>",
+    marked("HERO", "<h1>Judul</h1>"),
+    "<!-- CUSTOM_START --><p>bukan section app</p><!-- CUSTOM_END -->",
+    marked("FAQ", "<details><summary>Tanya?</summary>Jawab</details>"),
+    marked("FAQ", "<p>FAQ kedua</p>"),
+    "</body></html>",
+])
+
+
+def test_marked_wraps_and_skips_empty():
+    assert marked("HERO", "<h1>x</h1>") == "<!-- HERO_START -->\n<h1>x</h1>\n<!-- HERO_END -->"
+    assert marked("HERO", "") == ""
+
+
+def test_find_sections_only_known_names_in_order():
+    assert [name for name, _ in find_sections(PAGE)] == ["HERO", "FAQ", "FAQ"]
+    assert find_sections(None) == []
+
+
+def test_get_section_returns_first_match():
+    assert get_section(PAGE, "HERO") == "<h1>Judul</h1>"
+    assert get_section(PAGE, "FAQ").startswith("<details>")
+    assert get_section(PAGE, "PRICING") is None
+
+
+def test_replace_section_keeps_rest_of_page():
+    new_page = replace_section(PAGE, "FAQ", "  <p>FAQ baru</p>  ")
+    assert get_section(new_page, "FAQ") == "<p>FAQ baru</p>"
+    assert "<p>FAQ kedua</p>" in new_page
+    assert new_page.replace("<p>FAQ baru</p>", "") == PAGE.replace("<details><summary>Tanya?</summary>Jawab</details>", "")
+
+
+def test_replace_section_with_backslashes_is_literal():
+    new_page = replace_section(PAGE, "HERO", r"<p>C:\temp \1</p>")
+    assert get_section(new_page, "HERO") == r"<p>C:\temp \1</p>"
+
+
+def test_clean_section_output_strips_fences_and_markers():
+    text = "```html\n<!-- HERO_START -->\n<h1>Baru</h1>\n<!-- HERO_END -->\n```"
+    assert clean_section_output(text) == "<h1>Baru</h1>"
+    assert clean_section_output("  <p>x</p> ") == "<p>x</p>"
@@ -0,0 +1,112 @@
+import threading
+import time
+
+import pytest
+
+from singleflight import SingleFlight, FlightAborted, FlightTimeout
+
+
+def test_first_caller_leads_identical_callers_follow():
+    flights = SingleFlight()
+    flight, leader = flights.join("prompt-a")
+    assert leader
+    assert flights.join("prompt-a") == (flight, False)
+    other, other_leader = flights.join("prompt-b")
+    assert other is not flight and other_leader
+
+
+def test_follower_receives_chunks_from_the_start():
+    flights = SingleFlight()
+    flight, _ = flights.join("k")
+    flight.publish("satu ")
+    received = []
+    follower = threading.Thread(target=lambda: received.extend(flight.follow()))
+    follower.start()
+    time.sleep(0.05)
+    flight.publish("dua")
+    flights.finish("k", flight)
+    follower.join(5)
+    assert received == ["satu ", "dua"]
+    assert flight.result() == "satu dua"
+
+
+def test_finished_flight_is_released():
+    flights = SingleFlight()
+    flight, _ = flights.join("k")
+    flights.finish("k", flight)
+    again, leader = flights.join("k")
+    assert leader and again is not flight
+
+
+def test_leader_error_reaches_followers():
+    flights = SingleFlight()
+    flight, _ = flights.join("k")
+    flight.publish("sebagian")
+    flights.finish("k", flight, ValueError("429 kuota"))
+    with pytest.raises(ValueError, match="429"):
+        flight.result()
+
+
+def test_leader_abort_becomes_regular_error():
+    flights = SingleFlight()
+    flight, _ = flights.join("k")
+    flights.finish("k", flight, GeneratorExit())
+    with pytest.raises(FlightAborted):
+        flight.result()
+
+
+def test_concurrent_identical_requests_run_once():
+    flights = SingleFlight()
+    calls = []
+    results = []
+    barrier = threading.Barrier(8)
+
+    def request():
+        barrier.wait()
+        flight, leader = flights.join("k")
+        if leader:
+            calls.append(1)
+            time.sleep(0.05)
+            flight.publish("jawaban")
+            flights.finish("k", flight)
+            results.append("jawaban")
+        else:
+            results.append(flight.result())
+
+    threads = [threading.Thread(target=request) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    assert len(calls) == 1
+    assert results == ["jawaban"] * 8
+
+
+def test_follower_gives_up_when_leader_never_finishes():
+    flights = SingleFlight()
+    flight, _ = flights.join("k", timeout=0.2)
+    # Follower memakai batas waktu dari leader, bukan miliknya sendiri
+    assert flights.join("k", timeout=60) == (flight, False)
+    flight.publish("sebagian")
+    received = []
+    started = time.time()
+    with pytest.raises(FlightTimeout):
+        for chunk in flight.follow():
+            received.append(chunk)
+    assert received == ["sebagian"] and time.time() - started < 2
+    assert isinstance(FlightTimeout("x"), FlightAborted)
+
+
+def test_timeout_counts_from_last_progress():
+    flights = SingleFlight()
+    flight, _ = flights.join("k", timeout=0.3)
+
+    def slow_leader():
+        for part in ("a", "b", "c"):
+            time.sleep(0.15)
+            flight.publish(part)
+        flights.finish("k", flight)
+
+    threading.Thread(target=slow_leader).start()
+    # Total 0.45 detik > timeout, tapi tiap chunk datang sebelum batasnya
+    assert flight.result() == "abc"
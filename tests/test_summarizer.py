@@ -0,0 +1,146 @@
+import re
+import threading
+
+import pytest
+
+pytest.importorskip("google.ai.generativelanguage")
+
+import summarizer
+from disk_cache import DiskCache
+from scheduler import PRIORITY_BATCH, current_scheduling, scheduling
+from summarizer import FALLBACK_CHARS, digest_document, split_chunks, summarize_chunks
+from tracing import current_trace, end_trace, start_trace
+
+KEYS = ["AIzaKEY-A", "AIzaKEY-B", "AIzaKEY-C"]
+
+
+class FakeGemini:
+    """generate_text palsu: bagian ke-n (mulai 0) gagal sebanyak failures[n] kali sebelum berhasil."""
+
+    def __init__(self, failures=None):
+        self.failures = dict(failures or {})
+        self.lock = threading.Lock()
+        self.calls = []
+        self.contexts = []
+
+    def __call__(self, prompt, keys, force=False, system_instruction=None):
+        with self.lock:
+            self.contexts.append((current_scheduling(), current_trace()))
+            if "POIN KUNCI" in prompt:
+                self.calls.append("reduce")
+                return "DIGEST " + ",".join(re.findall(r"ringkasan (\d+)", prompt))
+            part = int(re.search(r"membaca bagian (\d+) dari", prompt).group(1)) - 1
+            self.calls.append(part)
+            if self.failures.get(part, 0):
+                self.failures[part] -= 1
+                raise RuntimeError(f"429 bagian {part}")
+        return f"  ringkasan {part}  "
+
+
+def chunks(n, size=2000):
+    return [f"BAB {i}\n" + "isi " * (size // 4) for i in range(n)]
+
+
+def long_text(n):
+    # Tiap BAB pas satu potongan CHUNK_CHARS
+    return "\n".join(chunks(n, size=summarizer.CHUNK_CHARS - 100))
+
+
+@pytest.fixture
+def gemini(monkeypatch):
+    def install(failures=None):
+        fake = FakeGemini(failures)
+        monkeypatch.setattr(summarizer, "generate_text", fake)
+        return fake
+    return install
+
+
+@pytest.fixture
+def digest_cache(tmp_path, monkeypatch):
+    cache = DiskCache("digests", cache_dir=str(tmp_path))
+    monkeypatch.setattr(summarizer, "digest_cache", cache)
+    monkeypatch.setattr(summarizer, "read_document_bytes", lambda data, mime, budget: data.decode())
+    return cache
+
+
+def test_split_chunks_cuts_at_paragraphs():
+    text = "\n".join("kalimat " * 30 for _ in range(100))
+    parts = split_chunks(text, size=1000)
+    assert all(len(p) <= 1000 for p in parts)
+    assert all(p.endswith("kalimat") for p in parts)
+    assert "".join(parts).replace(" ", "").replace("\n", "") == text.replace(" ", "").replace("\n", "")
+
+
+def test_failed_chunks_are_retried_serially(gemini):
+    fake = gemini({1: 1, 3: 1})
+    progress = []
+    summaries, fallback = summarize_chunks(chunks(5), KEYS, on_progress=lambda d, t: progress.append((d, t)))
+    assert summaries == [f"ringkasan {i}" for i in range(5)] and fallback == 0
+    # Percobaan ulang berurutan, setelah semua bagian selesai dicoba sekali
+    assert fake.calls[-2:] == [1, 3] and len(fake.calls) == 7
+    assert progress[-1] == (5, 5) and len(progress) == 5
+
+
+def test_chunk_failing_twice_falls_back_to_excerpt(gemini):
+    parts = chunks(3)
+    gemini({2: 2})
+    summaries, fallback = summarize_chunks(parts, KEYS)
+    assert fallback == 1
+    assert summaries[:2] == ["ringkasan 0", "ringkasan 1"]
+    assert summaries[2] == parts[2][:FALLBACK_CHARS]
+
+
+def test_raises_only_when_every_chunk_fails(gemini):
+    gemini({0: 5, 1: 5})
+    with pytest.raises(RuntimeError, match="429"):
+        summarize_chunks(chunks(2), KEYS)
+
+    gemini({0: 5})
+    summaries, fallback = summarize_chunks(chunks(2), KEYS)
+    assert fallback == 1 and summaries[1] == "ringkasan 1"
+
+
+def test_workers_inherit_scheduling_and_trace(gemini):
+    fake = gemini({0: 1})
+    on_wait = lambda wait: None
+    trace = start_trace("test")
+    try:
+        with scheduling(priority=PRIORITY_BATCH, on_wait=on_wait):
+            summarize_chunks(chunks(4), KEYS)
+    finally:
+        data = end_trace()
+    assert fake.contexts and all(ctx == ((PRIORITY_BATCH, on_wait), trace) for ctx in fake.contexts)
+    parts = sorted(s["part"] for s in data["stages"] if s["stage"] == "summarize_chunk")
+    assert parts == [1, 1, 2, 3, 4]
+    assert data["failed_chunks"] == 1 and data["fallback_chunks"] == 0
+
+
+def test_digest_is_cached_per_file(gemini, digest_cache):
+    fake = gemini()
+    text = long_text(4)
+    warnings = []
+    digest = digest_document(text.encode(), "text/plain", KEYS, warnings=warnings)
+    assert digest.startswith("DIGEST ") and warnings == []
+    calls = len(fake.calls)
+    assert digest_document(text.encode(), "text/plain", KEYS) == digest
+    assert len(fake.calls) == calls
+
+
+def test_partial_digest_is_not_cached(gemini, digest_cache):
+    fake = gemini({1: 2})
+    text = long_text(4)
+    warnings = []
+    digest_document(text.encode(), "text/plain", KEYS, warnings=warnings)
+    assert len(warnings) == 1 and "1 dari" in warnings[0]
+
+    # Upload berikutnya mencoba lagi bagian yang gagal, lalu hasil lengkapnya baru disimpan
+    calls = len(fake.calls)
+    complete = digest_document(text.encode(), "text/plain", KEYS)
+    assert len(fake.calls) > calls
+    assert digest_document(text.encode(), "text/plain", KEYS) == complete
+
+
+def test_short_document_is_used_as_is(gemini, digest_cache):
+    fake = gemini()
+    assert digest_document("ebook pendek".encode(), "text/plain", KEYS) == "ebook pendek"
+    assert fake.calls == []
@@ -0,0 +1,88 @@
+import importlib.util
+
+import pytest
+
+import text_extractor
+from text_extractor import EXTRACTORS, decode_html, extract_text
+
+ENGINE_MODULES = {"selectolax": "selectolax.lexbor", "lxml": "lxml.etree", "stream": None}
+
+
+def available(engine):
+    module = ENGINE_MODULES[engine]
+    try:
+        return module is None or importlib.util.find_spec(module) is not None
+    except ImportError:
+        return False
+
+
+ENGINES = [pytest.param(name, marks=pytest.mark.skipif(not available(name), reason=f"{name} tidak terpasang"))
+           for name in EXTRACTORS]
+
+PAGE = """<!DOCTYPE html><html><head><title>Promo</title>
+<style>.x { color: red }</style><script>var harga = "rahasia";</script></head>
+<body>
+<nav><a href="/">Beranda</a><a href="/blog">Blog</a></nav>
+<h1>Ebook Diet Sehat</h1>
+<p>Turun 5 kg dalam 30 hari &amp; tetap kenyang.</p>
+<div>Harga   <b>Rp99.000</b></div>
+<svg><text>ikon</text></svg>
+<ul><li>Bonus resep</li><li>Grup konsultasi</li></ul>
+<noscript>Aktifkan JavaScript</noscript>
+<footer>Hak cipta 2024</footer>
+</body></html>"""
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_extracts_visible_text_only(engine):
+    text = extract_text(PAGE, engine=engine)
+    lines = text.splitlines()
+    assert lines[0] == "Ebook Diet Sehat"
+    assert "Turun 5 kg dalam 30 hari & tetap kenyang." in lines
+    assert "Bonus resep" in lines and "Grup konsultasi" in lines and "Rp99.000" in text
+    for hidden in ("rahasia", "color", "Beranda", "ikon", "JavaScript", "Hak cipta"):
+        assert hidden not in text
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_engines_agree_with_stdlib(engine):
+    expected = extract_text(PAGE, engine="stream")
+    assert extract_text(PAGE, engine=engine) == expected
+    assert extract_text(PAGE.encode("utf-8"), engine=engine) == expected
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_stops_at_budget_on_large_page(engine, monkeypatch):
+    body = "".join(f"<p>Paragraf nomor {i} berisi testimoni pembeli.</p>" for i in range(100000))
+    page = f"<html><body><script>x</script>{body}</body></html>"
+    fed = []
+    if engine == "stream":
+        feed = text_extractor.StreamingTextParser.feed
+        monkeypatch.setattr(text_extractor.StreamingTextParser, "feed",
+                            lambda self, data: fed.append(len(data)) or feed(self, data))
+
+    text = extract_text(page, budget=300, engine=engine)
+    if engine == "stream":
+        # Halaman ~5 MB, yang diumpan ke parser hanya potongan pertama
+        assert fed == [text_extractor.FEED_CHUNK]
+    assert len(text) == 300
+    assert text.startswith("Paragraf nomor 0 berisi testimoni pembeli.\nParagraf nomor 1 ")
+    assert text == extract_text(page, budget=300, engine="stream")
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_respects_declared_charset(engine):
+    page = '<html><head><meta charset="windows-1252"></head><body><p>Caf\xe9 enak</p></body></html>'
+    assert extract_text(page.encode("windows-1252"), engine=engine) == "Café enak"
+
+
+def test_decode_html_falls_back_to_utf8():
+    assert decode_html("tes 🚀".encode("utf-8")) == "tes 🚀"
+    assert decode_html(b'<meta charset="bukan-charset">x') == '<meta charset="bukan-charset">x'
+
+
+def test_forced_engine(monkeypatch):
+    monkeypatch.setenv("SCRAPER_EXTRACTOR", "stream")
+    assert text_extractor.pick_extractor() == "stream"
+    monkeypatch.setenv("SCRAPER_EXTRACTOR", "tidak-ada")
+    assert text_extractor.pick_extractor() in EXTRACTORS
@@ -0,0 +1,152 @@
+import json
+import socket
+import threading
+import urllib.request
+
+import pytest
+
+import tracing
+from tracing import Metrics, annotate, current_trace, end_trace, stage, start_trace, use_trace, usage_fields
+
+
+@pytest.fixture
+def fresh_metrics(monkeypatch):
+    metrics = Metrics(buckets=(0.1, 1))
+    monkeypatch.setattr(tracing, "metrics", metrics)
+    return metrics
+
+
+def test_stages_nest_per_thread(fresh_metrics):
+    trace = start_trace("landing")
+    with stage("scrape", bytes=10) as outer:
+        annotate(cache_hit=True)
+        with stage("parse"):
+            annotate(repaired=False)
+        annotate(after_inner=True)
+    annotate(product="A")
+    data = end_trace()
+
+    assert current_trace() is None and data["trace_id"] == trace.trace_id
+    assert [s["stage"] for s in data["stages"]] == ["parse", "scrape"]
+    assert outer["cache_hit"] is True and outer["after_inner"] is True and outer["bytes"] == 10
+    assert data["stages"][0]["repaired"] is False and "cache_hit" not in data["stages"][0]
+    assert data["product"] == "A" and data["total"] >= 0
+
+
+def test_worker_threads_keep_their_own_stage_stack(fresh_metrics):
+    trace = start_trace("summary")
+    barrier = threading.Barrier(3)
+
+    def worker(part):
+        with use_trace(trace), stage("summarize_chunk", part=part):
+            barrier.wait(5)
+            annotate(worker=part)
+            barrier.wait(5)
+        assert current_trace() is None
+
+    with stage("ebook"):
+        threads = [threading.Thread(target=worker, args=(i,)) for i in (1, 2)]
+        for t in threads:
+            t.start()
+        barrier.wait(5)
+        annotate(main=True)
+        barrier.wait(5)
+        for t in threads:
+            t.join()
+    data = end_trace()
+
+    chunks = {s["part"]: s for s in data["stages"] if s["stage"] == "summarize_chunk"}
+    assert chunks[1]["worker"] == 1 and chunks[2]["worker"] == 2
+    ebook = next(s for s in data["stages"] if s["stage"] == "ebook")
+    assert ebook["main"] is True and "worker" not in ebook
+    assert trace._open == {}
+
+
+def test_error_is_recorded_on_stage(fresh_metrics):
+    start_trace("landing")
+    with pytest.raises(ValueError):
+        with stage("gemini"):
+            raise ValueError("x")
+    data = end_trace()
+    assert data["stages"][0]["error"] == "ValueError"
+    assert 'landing_stage_errors_total{stage="gemini"} 1' in fresh_metrics.render()
+
+
+def test_without_trace_everything_is_noop():
+    assert current_trace() is None
+    with stage("apa saja") as entry:
+        annotate(x=1)
+    assert entry == {} and end_trace() is None
+
+
+def test_trace_is_written_to_jsonl(tmp_path, monkeypatch, fresh_metrics):
+    log = tmp_path / "trace_log.jsonl"
+    monkeypatch.setattr(tracing, "TRACE_LOG", str(log))
+    for name in ("landing", "section"):
+        start_trace(name)
+        with stage("render", bytes=5):
+            pass
+        end_trace()
+    lines = [json.loads(line) for line in log.read_text(encoding="utf-8").splitlines()]
+    assert [line["name"] for line in lines] == ["landing", "section"]
+    assert lines[0]["stages"][0]["stage"] == "render"
+
+
+def test_prometheus_rendering(fresh_metrics):
+    fresh_metrics.observe_trace({"name": "landing", "stages": [
+        {"stage": "gemini", "duration": 0.05, "model": "gemini-2.0-flash", "key": "abc",
+         "prompt_token_count": 100, "candidates_token_count": 40, "cached_content_token_count": 60},
+        {"stage": "gemini", "duration": 3.0, "cache_hit": False},
+        {"stage": "cache", "duration": 0.01, "cache_hit": True, "bytes": 2048},
+    ]})
+    lines = fresh_metrics.render().splitlines()
+    assert lines[0] == "# TYPE landing_stage_seconds histogram"
+    for expected in (
+        'landing_stage_seconds_bucket{le="0.1",stage="gemini"} 1',
+        'landing_stage_seconds_bucket{le="1",stage="gemini"} 1',
+        'landing_stage_seconds_bucket{le="+Inf",stage="gemini"} 2',
+        'landing_stage_seconds_sum{stage="gemini"} 3.05',
+        'landing_stage_seconds_count{stage="gemini"} 2',
+        "# TYPE landing_traces_total counter",
+        'landing_traces_total{trace="landing"} 1',
+        'landing_gemini_calls_total{key="abc",model="gemini-2.0-flash"} 1',
+        'landing_tokens_total{kind="prompt"} 100',
+        'landing_tokens_total{kind="output"} 40',
+        'landing_tokens_total{kind="cached"} 60',
+        'landing_cache_lookups_total{result="hit",stage="cache"} 1',
+        'landing_cache_lookups_total{result="miss",stage="gemini"} 1',
+        'landing_stage_bytes_total{stage="cache"} 2048',
+    ):
+        assert expected in lines
+    assert sum(1 for line in lines if line.startswith("# TYPE landing_tokens_total")) == 1
+
+
+def test_usage_fields_reads_token_counts():
+    class Usage:
+        prompt_token_count = 12
+        candidates_token_count = 0
+        cached_content_token_count = None
+
+    class Response:
+        usage_metadata = Usage()
+
+    assert usage_fields(Response()) == {"prompt_token_count": 12}
+    assert usage_fields(object()) == {}
+
+
+def test_metrics_server_serves_render(fresh_metrics, monkeypatch):
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    monkeypatch.setattr(tracing, "_server", None)
+    assert tracing.start_metrics_server(port=None) is None
+    server = tracing.start_metrics_server(port=port)
+    try:
+        assert tracing.start_metrics_server(port=port) is server
+        url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+        with urllib.request.urlopen(url, timeout=5) as response:
+            assert response.headers["Content-Type"].startswith("text/plain")
+            assert response.read().decode() == fresh_metrics.render()
+    finally:
+        server.shutdown()
+        server.server_close()
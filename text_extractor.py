@@ -0,0 +1,218 @@
+import importlib.util
+import os
+import re
+from html.parser import HTMLParser
+
+# --- TEXT EXTRACTOR ---
+# Ubah HTML landing page kompetitor jadi teks polos, secepat mungkin:
+# - pakai selectolax / lxml kalau terinstall (parser C, jauh lebih cepat)
+# - kalau tidak ada, pakai tokenizer streaming bawaan Python
+# Semua engine berhenti begitu batas karakter tercapai dan melewati elemen
+# non-konten (script, style, nav, footer, svg, ...) tanpa memprosesnya.
+
+TEXT_BUDGET = 5000
+# title ikut dilewati: selectolax hanya menjalani <body>, engine lain harus memberi teks yang sama
+SKIP_TAGS = ("title", "script", "style", "noscript", "svg", "nav", "footer", "template", "iframe", "canvas")
+FEED_CHUNK = 64 * 1024
+
+CHARSET_META = re.compile(rb'<meta[^>]+charset=["\']?([\w-]+)', re.IGNORECASE)
+
+
+class BudgetReached(Exception):
+    pass
+
+
+class TextCollector:
+    # Potong teks per baris & per "dua spasi" (sama seperti cara lama), buang yang kosong
+    def __init__(self, budget):
+        self.budget = budget
+        self.pieces = []
+        self.size = 0
+
+    def add(self, text):
+        for line in text.splitlines():
+            for phrase in line.split("  "):
+                phrase = phrase.strip()
+                if not phrase:
+                    continue
+                self.pieces.append(phrase)
+                self.size += len(phrase) + 1
+                if self.size >= self.budget:
+                    raise BudgetReached()
+
+    def result(self):
+        return "\n".join(self.pieces)[:self.budget]
+
+
+def decode_html(content, encoding=None):
+    if isinstance(content, str):
+        return content
+    if not encoding:
+        match = CHARSET_META.search(content[:4096])
+        encoding = match.group(1).decode("ascii") if match else "utf-8"
+    try:
+        return content.decode(encoding, errors="replace")
+    except LookupError:
+        return content.decode("utf-8", errors="replace")
+
+
+# --- ENGINE: STREAMING (stdlib) ---
+class StreamingTextParser(HTMLParser):
+    def __init__(self, collector):
+        super().__init__(convert_charrefs=True)
+        self.collector = collector
+        self.skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIP_TAGS:
+            self.skip_depth += 1
+
+    def handle_startendtag(self, tag, attrs):
+        # <svg/> dll yang langsung ditutup tidak mengubah kedalaman
+        pass
+
+    def handle_endtag(self, tag):
+        if tag in SKIP_TAGS and self.skip_depth:
+            self.skip_depth -= 1
+
+    def handle_data(self, data):
+        if not self.skip_depth:
+            self.collector.add(data)
+
+
+def extract_streaming(content, budget, encoding=None):
+    html = decode_html(content, encoding)
+    collector = TextCollector(budget)
+    parser = StreamingTextParser(collector)
+    try:
+        for start in range(0, len(html), FEED_CHUNK):
+            parser.feed(html[start:start + FEED_CHUNK])
+        parser.close()
+    except BudgetReached:
+        pass
+    return collector.result()
+
+
+# --- ENGINE: SELECTOLAX ---
+def extract_selectolax(content, budget, encoding=None):
+    from selectolax.lexbor import LexborHTMLParser as LexborParser
+
+    html = decode_html(content, encoding)
+    # selectolax tidak bisa diumpan bertahap, jadi yang di-parse potongan awal halaman
+    # (dipotong tepat sebelum tag, supaya teks terakhirnya utuh) yang membesar dua kali
+    # lipat sampai batas karakter tercapai. Halaman besar jarang perlu di-parse seluruhnya.
+    size = FEED_CHUNK
+    while True:
+        cut = html.rfind("<", 0, size) if size < len(html) else -1
+        complete = cut <= 0
+        text, reached = _walk_lexbor(LexborParser(html if complete else html[:cut]), budget)
+        if reached or complete:
+            return text
+        size *= 2
+
+
+def _walk_lexbor(tree, budget):
+    collector = TextCollector(budget)
+    root = tree.body or tree.root
+    # Jalan manual node per node: subtree SKIP_TAGS dilompati tanpa dikunjungi,
+    # dan berhenti begitu batas karakter tercapai
+    stack = [root.child if root is not None else None]
+    try:
+        while stack:
+            node = stack.pop()
+            if node is None:
+                continue
+            stack.append(node.next)
+            if node.tag == "-text":
+                collector.add(node.text_content or "")
+            elif node.tag not in SKIP_TAGS:
+                stack.append(node.child)
+    except BudgetReached:
+        return collector.result(), True
+    return collector.result(), False
+
+
+# --- ENGINE: LXML ---
+class LxmlTextTarget:
+    # Target parser lxml: menerima event start/end/data langsung, tidak ada tree yang dibangun
+    def __init__(self, collector):
+        self.collector = collector
+        self.skip_depth = 0
+        self.pending = []
+
+    def flush(self):
+        # libxml2 bisa memecah satu node teks jadi beberapa data(); digabung dulu per node
+        if self.pending:
+            text = "".join(self.pending)
+            self.pending = []
+            self.collector.add(text)
+
+    def start(self, tag, attrib):
+        self.flush()
+        if tag in SKIP_TAGS:
+            self.skip_depth += 1
+
+    def end(self, tag):
+        self.flush()
+        if tag in SKIP_TAGS and self.skip_depth:
+            self.skip_depth -= 1
+
+    def data(self, data):
+        if not self.skip_depth:
+            self.pending.append(data)
+
+    def close(self):
+        self.flush()
+
+
+def extract_lxml(content, budget, encoding=None):
+    from lxml import etree
+
+    collector = TextCollector(budget)
+    # Bytes langsung ke lxml supaya deteksi charset-nya sendiri yang dipakai
+    if isinstance(content, bytes) and not encoding:
+        html = content
+    else:
+        html = decode_html(content, encoding)
+    parser = etree.HTMLParser(target=LxmlTextTarget(collector), remove_comments=True)
+    try:
+        # Diumpan per potong: begitu batas tercapai, sisa halaman tidak pernah di-parse
+        for start in range(0, len(html), FEED_CHUNK):
+            parser.feed(html[start:start + FEED_CHUNK])
+        parser.close()
+    except BudgetReached:
+        pass
+    return collector.result()
+
+
+def _available(module_name):
+    # Cukup cek terpasang atau tidak, jangan import lxml/selectolax saat app baru start
+    try:
+        return importlib.util.find_spec(module_name) is not None
+    except ImportError:
+        return False
+
+
+EXTRACTORS = {
+    "selectolax": extract_selectolax,
+    "lxml": extract_lxml,
+    "stream": extract_streaming,
+}
+
+
+def pick_extractor():
+    # Bisa dipaksa lewat env SCRAPER_EXTRACTOR=selectolax|lxml|stream
+    forced = os.environ.get("SCRAPER_EXTRACTOR", "").strip().lower()
+    if forced in EXTRACTORS:
+        return forced
+    for name, module_name in (("selectolax", "selectolax.lexbor"), ("lxml", "lxml.etree")):
+        if _available(module_name):
+            return name
+    return "stream"
+
+
+ACTIVE_EXTRACTOR = pick_extractor()
+
+
+def extract_text(content, budget=TEXT_BUDGET, encoding=None, engine=None):
+    return EXTRACTORS[engine or ACTIVE_EXTRACTOR](content, budget, encoding)
@@ -0,0 +1,247 @@
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+# --- TRACING ---
+# Catat durasi tiap tahap satu kali generate (scrape, baca file, susun prompt, panggil
+# Gemini, parse JSON, render) plus ukuran data, token dari usage_metadata, cache hit, dan
+# key/model yang dipakai. Tiap trace ditulis ke log JSONL; ringkasannya dikumpulkan jadi
+# metrik format teks Prometheus (opsional disajikan lewat HTTP, set METRICS_PORT).
+#
+# Trace aktif disimpan per thread: tiap sesi Streamlit menjalankan script di thread-nya
+# sendiri, jadi kode di generator.py cukup memanggil annotate() tanpa oper objek trace.
+
+TRACE_LOG = os.environ.get("TRACE_LOG", "trace_log.jsonl")
+METRICS_PORT = os.environ.get("METRICS_PORT")
+STAGE_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120)
+TOKEN_FIELDS = {
+    "prompt_token_count": "prompt",
+    "candidates_token_count": "output",
+    "cached_content_token_count": "cached",
+}
+
+_local = threading.local()
+_log_lock = threading.Lock()
+
+
+class Trace:
+    def __init__(self, name):
+        self.name = name
+        self.trace_id = uuid.uuid4().hex[:12]
+        self.started = time.time()
+        self.attrs = {}
+        self.stages = []
+        self._open = {}     # id thread -> tahap yang sedang berjalan di thread itu
+
+    @contextmanager
+    def stage(self, name, **attrs):
+        entry = {"stage": name, **attrs}
+        start = time.perf_counter()
+        stack = self._open.setdefault(threading.get_ident(), [])
+        stack.append(entry)
+        try:
+            yield entry
+        except BaseException as e:
+            # st.stop() / st.rerun() juga lewat sini, yang dicatat cuma error sungguhan
+            if isinstance(e, Exception):
+                entry["error"] = type(e).__name__
+            raise
+        finally:
+            entry["duration"] = round(time.perf_counter() - start, 4)
+            stack.remove(entry)
+            if not stack:
+                self._open.pop(threading.get_ident(), None)
+            self.stages.append(entry)
+
+    def annotate(self, **attrs):
+        # Masuk ke tahap yang sedang berjalan di thread ini, atau ke trace-nya kalau di luar tahap
+        stack = self._open.get(threading.get_ident())
+        target = stack[-1] if stack else self.attrs
+        target.update(attrs)
+
+    def to_dict(self):
+        return {
+            "trace_id": self.trace_id,
+            "name": self.name,
+            "started": self.started,
+            "total": round(time.time() - self.started, 4),
+            **self.attrs,
+            "stages": self.stages,
+        }
+
+
+def start_trace(name):
+    trace = Trace(name)
+    _local.trace = trace
+    return trace
+
+
+def current_trace():
+    return getattr(_local, "trace", None)
+
+
+@contextmanager
+def use_trace(trace):
+    """Pasang trace dari thread lain di thread ini (mis. worker ThreadPoolExecutor)."""
+    previous = current_trace()
+    _local.trace = trace
+    try:
+        yield trace
+    finally:
+        _local.trace = previous
+
+
+def end_trace():
+    """Tutup trace aktif di thread ini: tulis ke log & metrik. Return dict trace atau None."""
+    trace = current_trace()
+    if trace is None:
+        return None
+    _local.trace = None
+    data = trace.to_dict()
+    metrics.observe_trace(data)
+    write_log(data)
+    return data
+
+
+@contextmanager
+def stage(name, **attrs):
+    trace = current_trace()
+    if trace is None:
+        yield {}
+        return
+    with trace.stage(name, **attrs) as entry:
+        yield entry
+
+
+def annotate(**attrs):
+    trace = current_trace()
+    if trace is not None:
+        trace.annotate(**attrs)
+
+
+def usage_fields(response):
+    # usage_metadata ada di respons biasa & di chunk terakhir respons streaming
+    usage = getattr(response, "usage_metadata", None)
+    fields = {}
+    if usage is None:
+        return fields
+    for attr in TOKEN_FIELDS:
+        value = getattr(usage, attr, None)
+        if value:
+            fields[attr] = int(value)
+    return fields
+
+
+def write_log(data):
+    if not TRACE_LOG:
+        return
+    line = json.dumps(data, ensure_ascii=False)
+    with _log_lock:
+        try:
+            with open(TRACE_LOG, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+        except OSError as e:
+            print(f"Gagal menulis trace log: {e}")
+
+
+# --- METRICS ---
+def _labels(**labels):
+    return "{" + ",".join(f'{k}="{v}"' for k, v in sorted(labels.items())) + "}"
+
+
+class Metrics:
+    def __init__(self, buckets=STAGE_BUCKETS):
+        self.buckets = buckets
+        self.lock = threading.Lock()
+        self.stage_hist = {}    # stage -> {"buckets": [...], "sum": detik, "count": n}
+        self.counters = {}      # (nama metrik, label string) -> nilai
+
+    def _inc(self, name, value=1, **labels):
+        key = (name, _labels(**labels))
+        self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe_trace(self, data):
+        with self.lock:
+            self._inc("landing_traces_total", trace=data["name"])
+            for entry in data["stages"]:
+                name = entry["stage"]
+                hist = self.stage_hist.setdefault(
+                    name, {"buckets": [0] * len(self.buckets), "sum": 0.0, "count": 0})
+                for i, bound in enumerate(self.buckets):
+                    if entry["duration"] <= bound:
+                        hist["buckets"][i] += 1
+                hist["sum"] += entry["duration"]
+                hist["count"] += 1
+                if "error" in entry:
+                    self._inc("landing_stage_errors_total", stage=name)
+                if "bytes" in entry:
+                    self._inc("landing_stage_bytes_total", entry["bytes"], stage=name)
+                if "cache_hit" in entry:
+                    self._inc("landing_cache_lookups_total", stage=name,
+                              result="hit" if entry["cache_hit"] else "miss")
+                if "model" in entry:
+                    self._inc("landing_gemini_calls_total", model=entry["model"], key=entry.get("key", ""))
+                for field, kind in TOKEN_FIELDS.items():
+                    if field in entry:
+                        self._inc("landing_tokens_total", entry[field], kind=kind)
+
+    def render(self):
+        """Semua metrik dalam format teks Prometheus (text/plain; version=0.0.4)."""
+        lines = ["# TYPE landing_stage_seconds histogram"]
+        with self.lock:
+            for name, hist in sorted(self.stage_hist.items()):
+                for bound, count in zip(self.buckets, hist["buckets"]):
+                    lines.append(f"landing_stage_seconds_bucket{_labels(stage=name, le=bound)} {count}")
+                lines.append(f"landing_stage_seconds_bucket{_labels(stage=name, le='+Inf')} {hist['count']}")
+                lines.append(f"landing_stage_seconds_sum{_labels(stage=name)} {round(hist['sum'], 4)}")
+                lines.append(f"landing_stage_seconds_count{_labels(stage=name)} {hist['count']}")
+            declared = set()
+            for (name, labels), value in sorted(self.counters.items()):
+                if name not in declared:
+                    lines.append(f"# TYPE {name} counter")
+                    declared.add(name)
+                lines.append(f"{name}{labels} {value}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics()
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(port=METRICS_PORT):
+    """Sajikan GET /metrics di port terpisah (sekali per proses). Tanpa port = tidak jalan."""
+    global _server
+    if not port:
+        return None
+    with _server_lock:
+        if _server is not None:
+            return _server
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        try:
+            _server = ThreadingHTTPServer(("0.0.0.0", int(port)), MetricsHandler)
+        except OSError as e:
+            print(f"Gagal membuka endpoint metrics di port {port}: {e}")
+            return None
+        threading.Thread(target=_server.serve_forever, daemon=True, name="metrics-server").start()
+        return _server